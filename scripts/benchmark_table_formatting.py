@@ -0,0 +1,91 @@
+"""
+Mede o tempo de BaseModel.format_for_table sobre linhas de vários modelos,
+com o plano de formatação memorizado por classe e refazendo o plano a cada
+linha (o que equivale a resolver as colunas listáveis linha a linha, como
+antes da memorização). Os objetos são montados em memória, sem banco.
+
+Uso: python scripts/benchmark_table_formatting.py [linhas]
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, time as time_, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from common.model import base_model  # noqa: E402
+from common.model.column_types.point import Coordinate  # noqa: E402
+from domain.driver.model import Driver  # noqa: E402
+from domain.location.model import Location  # noqa: E402
+from domain.patient.model import Patient  # noqa: E402
+from domain.purpose.model import Purpose  # noqa: E402
+from domain.roadmap.model import Roadmap  # noqa: E402
+from domain.scheduling.model import Scheduling  # noqa: E402
+from domain.user.model import User  # noqa: E402
+from domain.vehicle.model import Vehicle  # noqa: E402
+
+
+def build_rows(count: int) -> list:
+    now = datetime(2026, 1, 1, 8)
+    user = User()
+    user.id, user.name, user.user_name, user.active = 1, "Usuário", "usuario", True
+    location = Location("Hospital", Coordinate(-26.9, -49.0))
+    location.id = 1
+    purpose = Purpose()
+    purpose.id, purpose.description = 1, "Consulta"
+
+    rows = []
+    for i in range(count // 5):
+        driver = Driver()
+        driver.id, driver.name, driver.cpf = i, f"Motorista {i}", "12345678901"
+        driver.registration_number, driver.active = "123", True
+        driver.created_at = driver.updated_at = now
+
+        vehicle = Vehicle()
+        vehicle.id, vehicle.license_plate, vehicle.description = i, "ABC1234", "Van"
+        vehicle.capacity, vehicle.active, vehicle.default_driver = 8, True, driver
+        vehicle.created_at = vehicle.updated_at = now
+
+        patient = Patient()
+        patient.id, patient.name, patient.cpf = i, f"Paciente {i}", "12345678901"
+        patient.created_at = patient.updated_at = now
+
+        roadmap = Roadmap(departure=now, arrival=now + timedelta(hours=3))
+        roadmap.id, roadmap.driver, roadmap.vehicle = i, driver, vehicle
+        roadmap.creation_user = user
+        roadmap.created_at = roadmap.updated_at = now
+
+        scheduling = Scheduling()
+        scheduling.id, scheduling.datetime = i, now + timedelta(hours=1)
+        scheduling.location, scheduling.purpose = location, purpose
+        scheduling.average_duration, scheduling.patient = time_(1), patient
+        scheduling.sensitive_patient, scheduling.companions = False, []
+        scheduling.roadmap = roadmap
+        scheduling.created_at = scheduling.updated_at = now
+
+        rows.extend([driver, vehicle, patient, roadmap, scheduling])
+    return rows
+
+
+def measure(rows: list, memoized: bool) -> float:
+    base_model._TABLE_PLANS.clear()
+    started_at = time.perf_counter()
+    for row in rows:
+        if not memoized:
+            base_model._TABLE_PLANS.clear()
+        row.format_for_table()
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    rows = build_rows(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
+    measure(rows, memoized=True)
+    for memoized in (False, True):
+        best = min(measure(rows, memoized) for _ in range(5))
+        label = "plano memorizado" if memoized else "plano por linha"
+        print(f"{label}: {best:.3f} s para {len(rows)} linhas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import csv
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from common.model.column_types.point import Coordinate
+
+
+class FileTravelTimeProvider:
+    """
+    Lê tempos de viagem (em segundos) de um arquivo CSV com as colunas
+    origin_latitude, origin_longitude, destination_latitude,
+    destination_longitude e travel_time.
+    """
+
+    COORDINATE_PRECISION = 5
+
+    cacheable = False
+
+    def __init__(self, file_path: str) -> None:
+        self.__file_path = file_path
+        self.__travel_times: Optional[Dict[Tuple[float, ...], int]] = None
+
+    def get_travel_time_matrix(
+        self,
+        origins: Sequence[Coordinate],
+        destinations: Sequence[Coordinate],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> np.ndarray:
+        travel_times = self.__load()
+
+        matrix = np.zeros((len(origins), len(destinations)), dtype=np.int64)
+        for i, origin in enumerate(origins):
+            origin_key = self.__key(origin)
+            for j, destination in enumerate(destinations):
+                destination_key = self.__key(destination)
+                if origin_key == destination_key:
+                    continue
+                travel_time = travel_times.get(origin_key + destination_key)
+                if travel_time is None:
+                    raise ValueError(
+                        f"Tempo de viagem entre {origin_key} e {destination_key} "
+                        f"não encontrado em {self.__file_path}"
+                    )
+                matrix[i, j] = travel_time
+
+            if on_progress:
+                on_progress(i + 1, len(origins))
+
+        return matrix
+
+    def __load(self) -> Dict[Tuple[float, ...], int]:
+        if self.__travel_times is None:
+            travel_times = {}
+            with open(self.__file_path, newline="", encoding="utf-8") as file:
+                for row in csv.DictReader(file):
+                    origin = Coordinate(
+                        float(row["origin_latitude"]), float(row["origin_longitude"])
+                    )
+                    destination = Coordinate(
+                        float(row["destination_latitude"]),
+                        float(row["destination_longitude"]),
+                    )
+                    travel_times[self.__key(origin) + self.__key(destination)] = int(
+                        float(row["travel_time"])
+                    )
+            self.__travel_times = travel_times
+
+        return self.__travel_times
+
+    def __key(self, coordinate: Coordinate) -> Tuple[float, float]:
+        return (
+            round(coordinate.latitude, self.COORDINATE_PRECISION),
+            round(coordinate.longitude, self.COORDINATE_PRECISION),
+        )
@@ -1,19 +1,155 @@
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
 from googlemaps import Client
+from googlemaps.exceptions import ApiError, Timeout, TransportError
 
 from common.model.column_types.point import Coordinate
+from common.utils.rate_limiter import RateLimiter
 
 
 class GoogleMapsClient:
-    def __init__(self, client: Client) -> None:
+    MAX_ORIGINS_PER_REQUEST = 25
+    MAX_DESTINATIONS_PER_REQUEST = 25
+    MAX_ELEMENTS_PER_REQUEST = 100
+    RETRIABLE_API_STATUSES = ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+
+    cacheable = True
+
+    def __init__(
+        self,
+        client: Client,
+        max_workers: int = 4,
+        queries_per_second: float = 10,
+        max_retries: int = 5,
+        retry_backoff_seconds: float = 0.5,
+    ) -> None:
         self.__client = client
+        self.__max_workers = max(max_workers, 1)
+        self.__rate_limiter = RateLimiter(queries_per_second)
+        self.__max_retries = max_retries
+        self.__retry_backoff_seconds = retry_backoff_seconds
 
     def get_travel_time_between(
         self, origin: Coordinate, destination: Coordinate
     ) -> int:
+        return int(self.get_travel_time_matrix([origin], [destination])[0, 0])
+
+    def get_travel_time_matrix(
+        self,
+        origins: Sequence[Coordinate],
+        destinations: Sequence[Coordinate],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> np.ndarray:
+        matrix = np.zeros((len(origins), len(destinations)), dtype=np.int64)
+
+        tiles = self.__build_tiles(len(origins), len(destinations))
+        if not tiles:
+            return matrix
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.__max_workers, len(tiles)),
+            thread_name_prefix="google-maps",
+        )
+        try:
+            futures = {
+                executor.submit(
+                    self.__fetch_tile_with_retry, origins[rows], destinations[columns]
+                ): (rows, columns)
+                for rows, columns in tiles
+            }
+            # o progresso é reportado na thread chamadora, à medida que os blocos terminam
+            for count, future in enumerate(as_completed(futures), start=1):
+                rows, columns = futures[future]
+                matrix[rows, columns] = future.result()
+                if on_progress:
+                    on_progress(count, len(tiles))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return matrix
+
+    def __build_tiles(
+        self, origins_count: int, destinations_count: int
+    ) -> List[Tuple[slice, slice]]:
+        if origins_count == 0 or destinations_count == 0:
+            return []
+
+        origins_per_tile = min(
+            origins_count,
+            self.MAX_ORIGINS_PER_REQUEST,
+            self.MAX_ELEMENTS_PER_REQUEST,
+        )
+        destinations_per_tile = min(
+            destinations_count,
+            self.MAX_DESTINATIONS_PER_REQUEST,
+            self.MAX_ELEMENTS_PER_REQUEST // origins_per_tile,
+        )
+        # equilibra os blocos para evitar uma última requisição quase vazia
+        origins_per_tile = math.ceil(
+            origins_count / math.ceil(origins_count / origins_per_tile)
+        )
+        destinations_per_tile = math.ceil(
+            destinations_count / math.ceil(destinations_count / destinations_per_tile)
+        )
+
+        return [
+            (
+                slice(row, min(row + origins_per_tile, origins_count)),
+                slice(column, min(column + destinations_per_tile, destinations_count)),
+            )
+            for row in range(0, origins_count, origins_per_tile)
+            for column in range(0, destinations_count, destinations_per_tile)
+        ]
+
+    def __fetch_tile_with_retry(
+        self, origins: Sequence[Coordinate], destinations: Sequence[Coordinate]
+    ) -> List[List[int]]:
+        attempt = 0
+        while True:
+            self.__rate_limiter.acquire()
+            try:
+                return self.__fetch_tile(origins, destinations)
+            except (ApiError, Timeout, TransportError) as e:
+                attempt += 1
+                if attempt > self.__max_retries or not self.__is_retriable(e):
+                    raise
+                backoff = self.__retry_backoff_seconds * 2 ** (attempt - 1)
+                time.sleep(backoff + random.uniform(0, backoff))
+
+    def __is_retriable(self, error: Exception) -> bool:
+        if isinstance(error, ApiError):
+            return error.status in self.RETRIABLE_API_STATUSES
+        return True
+
+    def __fetch_tile(
+        self, origins: Sequence[Coordinate], destinations: Sequence[Coordinate]
+    ) -> List[List[int]]:
         response = self.__client.distance_matrix(
-            origins=[f"{origin.latitude},{origin.longitude}"],
-            destinations=[f"{destination.latitude},{destination.longitude}"],
+            origins=[self.__format_coordinate(origin) for origin in origins],
+            destinations=[
+                self.__format_coordinate(destination) for destination in destinations
+            ],
             mode="driving",
             language="pt-BR",
         )
-        return response["rows"][0]["elements"][0]["duration"]["value"]
+
+        travel_times = []
+        for row in response["rows"]:
+            row_travel_times = []
+            for element in row["elements"]:
+                if element["status"] != "OK":
+                    raise ValueError(
+                        f"Não foi possível calcular o tempo de viagem ({element['status']})"
+                    )
+                row_travel_times.append(element["duration"]["value"])
+            travel_times.append(row_travel_times)
+
+        return travel_times
+
+    def __format_coordinate(self, coordinate: Coordinate) -> str:
+        return f"{coordinate.latitude},{coordinate.longitude}"
@@ -0,0 +1,53 @@
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from common.model.column_types.point import Coordinate
+
+
+class HaversineTravelTimeEstimator:
+    EARTH_RADIUS_KM = 6371.0088
+
+    cacheable = False
+
+    def __init__(self, road_factor: float = 1.3, average_speed_kmh: float = 40) -> None:
+        if average_speed_kmh <= 0:
+            raise ValueError("A velocidade média deve ser maior que zero")
+        self.__road_factor = road_factor
+        self.__average_speed_kmh = average_speed_kmh
+
+    def get_travel_time_matrix(
+        self,
+        origins: Sequence[Coordinate],
+        destinations: Sequence[Coordinate],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> np.ndarray:
+        origins_radians = np.radians(self.__to_array(origins))
+        destinations_radians = np.radians(self.__to_array(destinations))
+
+        origin_latitudes = origins_radians[:, 0][:, np.newaxis]
+        origin_longitudes = origins_radians[:, 1][:, np.newaxis]
+        destination_latitudes = destinations_radians[:, 0][np.newaxis, :]
+        destination_longitudes = destinations_radians[:, 1][np.newaxis, :]
+
+        a = (
+            np.sin((destination_latitudes - origin_latitudes) / 2) ** 2
+            + np.cos(origin_latitudes)
+            * np.cos(destination_latitudes)
+            * np.sin((destination_longitudes - origin_longitudes) / 2) ** 2
+        )
+        distances_km = 2 * self.EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+        travel_times = (
+            distances_km * self.__road_factor / self.__average_speed_kmh * 3600
+        )
+
+        if on_progress:
+            on_progress(1, 1)
+
+        return np.rint(travel_times).astype(np.int64)
+
+    def __to_array(self, coordinates: Sequence[Coordinate]) -> np.ndarray:
+        return np.array(
+            [(coordinate.latitude, coordinate.longitude) for coordinate in coordinates],
+            dtype=np.float64,
+        ).reshape(-1, 2)
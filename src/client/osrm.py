@@ -0,0 +1,80 @@
+import json
+from typing import Callable, List, Optional, Sequence
+from urllib.error import URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+
+from common.model.column_types.point import Coordinate
+
+
+class OsrmClient:
+    cacheable = False
+
+    def __init__(
+        self, base_url: str, profile: str = "driving", timeout: float = 60
+    ) -> None:
+        self.__base_url = base_url.rstrip("/")
+        self.__profile = profile
+        self.__timeout = timeout
+
+    def get_travel_time_matrix(
+        self,
+        origins: Sequence[Coordinate],
+        destinations: Sequence[Coordinate],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> np.ndarray:
+        if not origins or not destinations:
+            return np.zeros((len(origins), len(destinations)), dtype=np.int64)
+
+        coordinates = list(dict.fromkeys([*origins, *destinations]))
+        indexes = {coordinate: i for i, coordinate in enumerate(coordinates)}
+
+        response = self.__request_table(
+            coordinates,
+            sources=[indexes[origin] for origin in origins],
+            destinations=[indexes[destination] for destination in destinations],
+        )
+
+        durations = response["durations"]
+        if any(duration is None for row in durations for duration in row):
+            raise ValueError("O OSRM não encontrou rota entre alguns dos pontos")
+
+        if on_progress:
+            on_progress(1, 1)
+
+        return np.rint(np.array(durations, dtype=np.float64)).astype(np.int64)
+
+    def __request_table(
+        self,
+        coordinates: List[Coordinate],
+        sources: List[int],
+        destinations: List[int],
+    ) -> dict:
+        path = ";".join(
+            f"{coordinate.longitude},{coordinate.latitude}"
+            for coordinate in coordinates
+        )
+        query = urlencode(
+            {
+                "sources": ";".join(map(str, sources)),
+                "destinations": ";".join(map(str, destinations)),
+                "annotations": "duration",
+            },
+            safe=";",
+        )
+        url = f"{self.__base_url}/table/v1/{self.__profile}/{path}?{query}"
+
+        try:
+            with urlopen(url, timeout=self.__timeout) as response:
+                body = json.loads(response.read().decode("utf-8"))
+        except URLError as e:
+            raise ValueError(f"Não foi possível consultar o OSRM: {e.reason}")
+
+        if body.get("code") != "Ok":
+            raise ValueError(
+                f"O OSRM retornou um erro: {body.get('message') or body.get('code')}"
+            )
+
+        return body
@@ -0,0 +1,177 @@
+"""
+Servidor local que imita o endpoint /table do OSRM, servindo matrizes de
+fixture. Os tempos de pares que não estão na fixture são estimados pela
+distância em linha reta, para que o fluxo de sugestão de roteiros possa ser
+testado de ponta a ponta sem internet.
+
+Uso: python -m client.osrm_stub fixture.json --port 5000
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from client.haversine import HaversineTravelTimeEstimator
+from common.model.column_types.point import Coordinate
+
+CoordinateKey = Tuple[float, float]
+
+
+class OsrmStubServer:
+    COORDINATE_PRECISION = 5
+
+    def __init__(
+        self,
+        fixture_path: Optional[str] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.__travel_times: Dict[Tuple[CoordinateKey, CoordinateKey], float] = {}
+        if fixture_path:
+            self.load_fixture(fixture_path)
+        self.__estimator = HaversineTravelTimeEstimator()
+        self.__server = ThreadingHTTPServer((host, port), self.__build_handler())
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def load_fixture(self, fixture_path: str) -> None:
+        """
+        A fixture é um JSON no formato da resposta do OSRM:
+        {"coordinates": [[longitude, latitude], ...], "durations": [[...], ...]}
+        """
+        with open(fixture_path, encoding="utf-8") as file:
+            fixture = json.load(file)
+
+        keys = [
+            self.__key(Coordinate(latitude=latitude, longitude=longitude))
+            for longitude, latitude in fixture["coordinates"]
+        ]
+        for i, origin in enumerate(keys):
+            for j, destination in enumerate(keys):
+                self.__travel_times[(origin, destination)] = fixture["durations"][i][j]
+
+    def start(self) -> "OsrmStubServer":
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, name="osrm-stub", daemon=True
+        )
+        self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+        if self.__thread:
+            self.__thread.join()
+            self.__thread = None
+
+    def serve_forever(self) -> None:
+        self.__server.serve_forever()
+
+    def __enter__(self) -> "OsrmStubServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def build_table(
+        self,
+        coordinates: List[Coordinate],
+        sources: List[int],
+        destinations: List[int],
+    ) -> List[List[float]]:
+        estimated = self.__estimator.get_travel_time_matrix(coordinates, coordinates)
+        return [
+            [
+                self.__travel_times.get(
+                    (self.__key(coordinates[i]), self.__key(coordinates[j])),
+                    float(estimated[i, j]),
+                )
+                for j in destinations
+            ]
+            for i in sources
+        ]
+
+    def __key(self, coordinate: Coordinate) -> CoordinateKey:
+        return (
+            round(coordinate.latitude, self.COORDINATE_PRECISION),
+            round(coordinate.longitude, self.COORDINATE_PRECISION),
+        )
+
+    def __build_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                url = urlsplit(self.path)
+                parts = url.path.strip("/").split("/")
+                if len(parts) != 4 or parts[:2] != ["table", "v1"]:
+                    self.__reply(400, {"code": "InvalidUrl"})
+                    return
+
+                try:
+                    coordinates = [
+                        Coordinate(latitude=float(lat), longitude=float(lng))
+                        for lng, lat in (
+                            pair.split(",") for pair in parts[3].split(";")
+                        )
+                    ]
+                    query = parse_qs(url.query)
+                    sources = self.__parse_indexes(query, "sources", len(coordinates))
+                    destinations = self.__parse_indexes(
+                        query, "destinations", len(coordinates)
+                    )
+                except (ValueError, IndexError):
+                    self.__reply(400, {"code": "InvalidQuery"})
+                    return
+
+                self.__reply(
+                    200,
+                    {
+                        "code": "Ok",
+                        "durations": stub.build_table(
+                            coordinates, sources, destinations
+                        ),
+                    },
+                )
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def __parse_indexes(self, query: dict, name: str, total: int) -> List[int]:
+                if name not in query or query[name][0] == "all":
+                    return list(range(total))
+                indexes = [int(index) for index in query[name][0].split(";")]
+                if any(index < 0 or index >= total for index in indexes):
+                    raise IndexError(name)
+                return indexes
+
+            def __reply(self, status: int, body: dict) -> None:
+                content = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local compatível com o OSRM")
+    parser.add_argument(
+        "fixture", nargs="?", help="arquivo JSON com a matriz de tempos"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+
+    server = OsrmStubServer(args.fixture, host=args.host, port=args.port)
+    print(f"Servindo matrizes em {server.url}")
+    server.serve_forever()
@@ -0,0 +1,16 @@
+from typing import Callable, Optional, Protocol, Sequence
+
+import numpy as np
+
+from common.model.column_types.point import Coordinate
+
+
+class TravelTimeProvider(Protocol):
+    cacheable: bool
+
+    def get_travel_time_matrix(
+        self,
+        origins: Sequence[Coordinate],
+        destinations: Sequence[Coordinate],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> np.ndarray: ...
@@ -1,9 +1,12 @@
+import json
 import math
 from abc import abstractmethod
-from typing import Any, Generic, List, Optional
+from enum import Enum
+from typing import Any, Generic, List, Optional, Tuple
 
 from PySide6.QtCore import QItemSelection, QModelIndex
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, and_, func, or_, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
 
 from common.controller.base_controller import BaseController
 from common.controller.base_entity_controller import BaseEntityController, ModelType
@@ -12,6 +15,22 @@ from db import Database
 from settings import Settings
 
 
+class PaginationModeEnum(str, Enum):
+    OFFSET = "Deslocamento (LIMIT/OFFSET)"
+    KEYSET = "Chave de ordenação"
+    INFINITE_SCROLL = "Rolagem contínua"
+
+
+class CountModeEnum(str, Enum):
+    EXACT = "Exata a cada atualização"
+    ESTIMATED = "Estimada pelo banco de dados"
+    LAZY = "Exata quando os filtros mudam"
+
+
+# (coluna, decrescente)
+SortKey = Tuple[InstrumentedAttribute, bool]
+
+
 class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
     _widget: BaseListWidget[ModelType]
     _selected_data: List[Any] | None = None
@@ -22,10 +41,27 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
         self,
         rows_per_page: int = 15,
         caller: BaseController | None = None,
+        pagination_mode: PaginationModeEnum = PaginationModeEnum.OFFSET,
+        count_mode: CountModeEnum = CountModeEnum.EXACT,
     ) -> None:
         self._rows_per_page = rows_per_page
         self._model_class = self._get_model_class()
+        self._pagination_mode = pagination_mode
+        self._count_mode = count_mode
+        self._row_count = 0
+        # indica se a contagem foi feita agora, e não estimada ou reaproveitada
+        self._row_count_exact = False
+        self._filters_key: Optional[str] = None
+        # página exibida e chaves da primeira e da última linha dela, usadas
+        # como cursores para avançar e voltar sem OFFSET
+        self._current_page = 0
+        self._first_row_keys: Optional[Tuple] = None
+        self._last_row_keys: Optional[Tuple] = None
         super().__init__(caller)
+        if self._pagination_mode == PaginationModeEnum.INFINITE_SCROLL:
+            self._widget.use_lazy_table_model(self._rows_per_page)
+            self._widget.table_model.load_failed.connect(self._on_load_failed)
+            self._widget.table_model.dataChanged.connect(self._on_table_data_changed)
         self._set_widget_connections()
 
     @abstractmethod
@@ -63,14 +99,33 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
         if indexes:
             self._selected_row = indexes[0].row()
             self._selected_data = indexes[0].data()
-            self._selected_model = self._widget.table_model.get_original_object(
-                self._selected_row
-            )
-            self._widget.enable_row_actions()
         else:
             self._selected_row = -1
             self._selected_data = None
-            self._selected_model = None
+        self._update_selected_model()
+
+    def _on_table_data_changed(
+        self,
+        top_left: QModelIndex,
+        bottom_right: QModelIndex,
+        roles: Optional[List[int]] = None,
+    ) -> None:
+        # o bloco da linha selecionada pode ter sido descartado e buscado de novo
+        if top_left.row() <= self._selected_row <= bottom_right.row():
+            self._selected_data = top_left.siblingAtRow(self._selected_row).data()
+            self._update_selected_model()
+
+    def _update_selected_model(self) -> None:
+        # com a rolagem contínua a linha pode estar sendo carregada; as ações
+        # só são liberadas quando o registro está disponível
+        self._selected_model = (
+            self._widget.table_model.get_original_object(self._selected_row)
+            if self._selected_row >= 0
+            else None
+        )
+        if self._selected_model is not None:
+            self._widget.enable_row_actions()
+        else:
             self._widget.disable_row_actions()
 
     def _on_table_double_clicked(self, index: QModelIndex) -> None:
@@ -128,6 +183,7 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
         super().show()
 
     def callee_finalized(self) -> None:
+        self._filters_key = None
         self.update_table_data()
 
     def update_table_data(self) -> None:
@@ -138,6 +194,14 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
 
         self.close_session_if_exists()
 
+        if self._pagination_mode == PaginationModeEnum.INFINITE_SCROLL:
+            self._update_row_count()
+            filters = self._build_list_filters()
+            self._widget.table_model.set_row_source(
+                lambda cursor, limit: self._fetch_block(filters, cursor, limit)
+            )
+            return
+
         self._update_row_count()
         self._update_page_count()
 
@@ -146,30 +210,144 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
 
     def _list(self) -> List[ModelType]:
         page = int(self._widget.page_field.text())
-        limit = self._rows_per_page
-        offset = (page - 1) * limit
-
         filters = self._build_list_filters()
 
-        self._session = Database.get_session()
+        # a sessão da listagem só lê; sem expirar no commit as linhas e as
+        # relações carregadas junto com a página seguem disponíveis para a
+        # formatação da tabela, sem recarregar linha a linha
+        self._session = Database.get_session(expire_on_commit=False)
         try:
-            query = select(self._model_class).filter(*filters)
-
-            query = self._apply_sorting(query)
-
-            query = query.limit(limit).offset(offset)
+            query = (
+                select(self._model_class)
+                .options(*self._get_load_options())
+                .filter(*filters)
+            )
 
-            results = list(self._session.execute(query).scalars().all())
+            if self._pagination_mode == PaginationModeEnum.KEYSET:
+                results = self._list_by_keyset(query, page)
+            else:
+                query = self._apply_sorting(query)
+                query = query.limit(self._rows_per_page).offset(
+                    (page - 1) * self._rows_per_page
+                )
+                results = list(self._session.execute(query).scalars().all())
 
             self._session.commit()
 
+            self._current_page = page
+            self._first_row_keys = self._get_row_keys(results[0]) if results else None
+            self._last_row_keys = self._get_row_keys(results[-1]) if results else None
+
             return results
         except Exception as e:
             self._session.rollback()
             raise e
 
+    def _list_by_keyset(self, query: Select, page: int) -> List[ModelType]:
+        limit = self._rows_per_page
+        backward = False
+
+        # a primeira página sempre parte do início, para mostrar registros novos
+        if page == 1:
+            pass
+        elif page == self._current_page and self._first_row_keys:
+            query = query.filter(
+                self._build_keyset_filter(self._first_row_keys, inclusive=True)
+            )
+        elif page == self._current_page + 1 and self._last_row_keys:
+            query = query.filter(self._build_keyset_filter(self._last_row_keys))
+        elif page == self._current_page - 1 and self._first_row_keys:
+            query = query.filter(
+                self._build_keyset_filter(self._first_row_keys, backward=True)
+            )
+            backward = True
+        elif page == self._page_count:
+            # só uma contagem atual diz quantas linhas sobram na última página;
+            # estimada ou antiga, a página é lida inteira e pode repetir linhas
+            # da anterior, mas nenhuma linha do fim fica de fora
+            if self._row_count_exact:
+                limit = self._row_count - (page - 1) * limit or limit
+            backward = True
+        else:
+            # saltos para uma página qualquer não têm cursor de partida
+            query = query.offset((page - 1) * limit)
+
+        query = query.order_by(*self._get_order_by(reverse=backward)).limit(limit)
+        results = list(self._session.execute(query).scalars().all())
+        if backward:
+            results.reverse()
+        return results
+
+    def _fetch_block(
+        self, filters: List[Any], cursor: Optional[Tuple], limit: int
+    ) -> Tuple[List[ModelType], Optional[Tuple]]:
+        # chamado na thread de busca do modelo; os objetos saem da sessão já
+        # com as relações exibidas carregadas
+        with Database.session_scope(end_with_commit=False) as session:
+            query = (
+                select(self._model_class)
+                .options(*self._get_load_options())
+                .filter(*filters)
+            )
+            if cursor is not None:
+                query = query.filter(self._build_keyset_filter(cursor))
+            query = query.order_by(*self._get_order_by()).limit(limit)
+            results = list(session.execute(query).scalars().all())
+        return results, self._get_row_keys(results[-1]) if results else None
+
+    def _on_load_failed(self, message: str) -> None:
+        self._widget.show_error_pop_up(
+            "Erro", "Erro ao carregar os registros", f"Detalhes: {message}"
+        )
+
+    def _get_sort_keys(self) -> List[SortKey]:
+        # o id entra por último para desempatar e tornar a ordenação única
+        return [(self._model_class.id, True)]
+
+    def _get_order_by(self, reverse: bool = False) -> List[Any]:
+        return [
+            column.desc() if descending != reverse else column.asc()
+            for column, descending in self._get_sort_keys()
+        ]
+
+    def _get_row_keys(self, row: ModelType) -> Tuple:
+        return tuple(getattr(row, column.key) for column, _ in self._get_sort_keys())
+
+    def _build_keyset_filter(
+        self, keys: Tuple, inclusive: bool = False, backward: bool = False
+    ) -> Any:
+        sort_keys = self._get_sort_keys()
+
+        def after(column: InstrumentedAttribute, descending: bool, value: Any) -> Any:
+            return column < value if descending != backward else column > value
+
+        # com todas as colunas na mesma direção a comparação de tuplas usa o índice
+        if len({descending for _, descending in sort_keys}) == 1:
+            columns = tuple_(*[column for column, _ in sort_keys])
+            values = tuple_(*keys)
+            if sort_keys[0][1] != backward:
+                return columns <= values if inclusive else columns < values
+            return columns >= values if inclusive else columns > values
+
+        conditions = []
+        for i, (column, descending) in enumerate(sort_keys):
+            conditions.append(
+                and_(
+                    *[c == keys[j] for j, (c, _) in enumerate(sort_keys[:i])],
+                    after(column, descending, keys[i]),
+                )
+            )
+        if inclusive:
+            conditions.append(
+                and_(*[c == keys[j] for j, (c, _) in enumerate(sort_keys)])
+            )
+        return or_(*conditions)
+
     def _apply_sorting(self, query: Select) -> Select:
-        return query.order_by(self._model_class.id.desc())
+        return query.order_by(*self._get_order_by())
+
+    def _get_load_options(self) -> List[Any]:
+        return self._model_class.get_list_load_options()
 
     def _build_list_filters(self) -> List:
         return []
@@ -178,8 +356,43 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
         with Database.session_scope() as session:
             filters = self._build_list_filters()
             query = select(func.count()).select_from(self._model_class).filter(*filters)
-            self._row_count = session.execute(query).scalar() or 0
-            self._widget.set_row_count(self._row_count, self._rows_per_page)
+
+            compiled = query.compile(dialect=session.get_bind().dialect)
+            filters_key = f"{compiled}{json.dumps(compiled.params, default=str)}"
+            filters_changed = filters_key != self._filters_key
+            if filters_changed:
+                self._filters_key = filters_key
+                # com outros filtros os cursores da página anterior não valem
+                self._current_page = 0
+
+            self._row_count_exact = False
+            if self._count_mode == CountModeEnum.ESTIMATED:
+                self._row_count = self._estimate_row_count(
+                    session, select(self._model_class.id).filter(*filters)
+                )
+            elif self._count_mode == CountModeEnum.EXACT or filters_changed:
+                self._row_count = session.execute(query).scalar() or 0
+                self._row_count_exact = True
+
+            self._widget.set_row_count(
+                self._row_count,
+                (
+                    self._rows_per_page
+                    if self._pagination_mode != PaginationModeEnum.INFINITE_SCROLL
+                    else 0
+                ),
+                estimated=self._count_mode == CountModeEnum.ESTIMATED,
+            )
+
+    def _estimate_row_count(self, session: Session, query: Select) -> int:
+        # usa a estimativa do planejador em vez de percorrer as linhas
+        compiled = query.compile(dialect=session.get_bind().dialect)
+        plan = (
+            session.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            .scalar()
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     def _update_page_count(self) -> None:
         self._page_count = max(math.ceil(self._row_count / self._rows_per_page), 1)
@@ -187,6 +400,8 @@ class BaseListController(BaseEntityController[ModelType], Generic[ModelType]):
 
     def close(self) -> None:
         self.close_session_if_exists()
+        if self._pagination_mode == PaginationModeEnum.INFINITE_SCROLL:
+            self._widget.table_model.shutdown()
         super().close()
 
     def close_session_if_exists(self):
@@ -0,0 +1,238 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generic, List, Optional, Tuple, Type, Union
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    Signal,
+)
+
+from common.gui.core.table_model_default import ModelType
+
+# recebe o cursor do bloco e o tamanho do bloco; devolve os objetos e o cursor
+# do bloco seguinte
+BlockFetcher = Callable[[Any, int], Tuple[List[ModelType], Any]]
+
+
+class LazyTableModel(QAbstractTableModel, Generic[ModelType]):
+    """
+    Modelo de tabela com rolagem contínua. As linhas são buscadas em blocos
+    numa thread separada conforme a tabela pede mais (canFetchMore/fetchMore),
+    as células são formatadas só quando exibidas e apenas os blocos e linhas
+    formatadas usados mais recentemente ficam em memória. Um bloco descartado
+    é buscado de novo, pelo mesmo cursor, quando volta a ser exibido.
+    """
+
+    LOADING_TEXT = "Carregando..."
+
+    load_failed = Signal(str)
+    _block_loaded = Signal(int, int, object, object)
+    _block_failed = Signal(int, str)
+
+    def __init__(
+        self,
+        model_class: Type[ModelType],
+        block_size: int = 100,
+        max_cached_blocks: int = 10,
+        max_formatted_rows: int = 500,
+    ):
+        super().__init__()
+        self._model_class = model_class
+        self._headers = model_class.get_table_columns()
+        self._block_size = block_size
+        self._max_cached_blocks = max(max_cached_blocks, 2)
+        self._max_formatted_rows = max_formatted_rows
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lazy-table-model"
+        )
+        self._block_loaded.connect(self._on_block_loaded)
+        self._block_failed.connect(self._on_block_failed)
+        self._fetch_block: Optional[BlockFetcher] = None
+        self._generation = 0
+        self._reset_state()
+
+    def _reset_state(self) -> None:
+        # a geração descarta os blocos que chegarem de uma consulta anterior
+        self._generation += 1
+        self._row_count = 0
+        self._block_cursors: List[Any] = [None]
+        self._exhausted = False
+        self._pending_blocks: set = set()
+        self._blocks: OrderedDict[int, List[ModelType]] = OrderedDict()
+        self._formatted_rows: OrderedDict[int, List[Any]] = OrderedDict()
+
+    def set_row_source(self, fetch_block: Optional[BlockFetcher]) -> None:
+        self.beginResetModel()
+        self._fetch_block = fetch_block
+        self._reset_state()
+        self.endResetModel()
+        if fetch_block:
+            self._request_block(0)
+
+    def rowCount(self, parent: Union[QModelIndex, QPersistentModelIndex] = None) -> int:
+        return self._row_count
+
+    def columnCount(
+        self, parent: Union[QModelIndex, QPersistentModelIndex] = None
+    ) -> int:
+        return len(self._headers)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole,
+    ):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and section < len(self._headers)
+        ):
+            return self._headers[section]
+        return None
+
+    def canFetchMore(
+        self, parent: Union[QModelIndex, QPersistentModelIndex] = QModelIndex()
+    ) -> bool:
+        return (
+            self._fetch_block is not None
+            and not self._exhausted
+            and len(self._block_cursors) - 1 not in self._pending_blocks
+        )
+
+    def fetchMore(
+        self, parent: Union[QModelIndex, QPersistentModelIndex] = QModelIndex()
+    ) -> None:
+        if self.canFetchMore(parent):
+            self._request_block(len(self._block_cursors) - 1)
+
+    def data(
+        self, index: QModelIndex, role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole
+    ):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        row = index.row()
+        formatted_row = self._formatted_rows.get(row)
+        if formatted_row is None:
+            obj = self.get_original_object(row)
+            if obj is None:
+                return self.LOADING_TEXT if index.column() == 0 else None
+            formatted_row = obj.format_for_table()
+            self._formatted_rows[row] = formatted_row
+            if len(self._formatted_rows) > self._max_formatted_rows:
+                self._formatted_rows.popitem(last=False)
+        else:
+            self._formatted_rows.move_to_end(row)
+
+        return formatted_row[index.column()]
+
+    def get_original_object(self, row: int) -> Optional[ModelType]:
+        if not 0 <= row < self._row_count:
+            return None
+
+        block_index, offset = divmod(row, self._block_size)
+        block = self._blocks.get(block_index)
+        if block is None:
+            self._request_block(block_index)
+            return None
+
+        self._blocks.move_to_end(block_index)
+        return block[offset] if offset < len(block) else None
+
+    def set_data_from_objects(self, objects: List[ModelType]) -> bool:
+        # permite usar o modelo com uma lista já carregada, sem busca em blocos
+        self.set_row_source(None)
+        self.beginResetModel()
+        for block_index, start in enumerate(range(0, len(objects), self._block_size)):
+            end = start + self._block_size
+            self._blocks[block_index] = objects[start:end]
+        self._row_count = len(objects)
+        self._exhausted = True
+        self._max_cached_blocks = max(self._max_cached_blocks, len(self._blocks))
+        self.endResetModel()
+        return True
+
+    def shutdown(self) -> None:
+        self._generation += 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _request_block(self, block_index: int) -> None:
+        if (
+            self._fetch_block is None
+            or block_index in self._pending_blocks
+            or block_index >= len(self._block_cursors)
+        ):
+            return
+
+        self._pending_blocks.add(block_index)
+        self._executor.submit(
+            self._load_block,
+            self._fetch_block,
+            self._generation,
+            block_index,
+            self._block_cursors[block_index],
+        )
+
+    def _load_block(
+        self, fetch_block: BlockFetcher, generation: int, block_index: int, cursor: Any
+    ) -> None:
+        # roda na thread de busca; o resultado volta pela fila de eventos do Qt
+        try:
+            objects, next_cursor = fetch_block(cursor, self._block_size)
+        except Exception as e:
+            self._block_failed.emit(generation, str(e))
+            return
+        self._block_loaded.emit(generation, block_index, objects, next_cursor)
+
+    def _on_block_loaded(
+        self, generation: int, block_index: int, objects: List[ModelType], next_cursor
+    ) -> None:
+        if generation != self._generation:
+            return
+        self._pending_blocks.discard(block_index)
+
+        first_row = block_index * self._block_size
+        is_new_block = first_row >= self._row_count
+        self._store_block(block_index, objects)
+
+        if not is_new_block:
+            if objects:
+                self.dataChanged.emit(
+                    self.index(first_row, 0),
+                    self.index(first_row + len(objects) - 1, self.columnCount() - 1),
+                )
+            return
+
+        if len(objects) < self._block_size:
+            self._exhausted = True
+        else:
+            self._block_cursors.append(next_cursor)
+
+        if objects:
+            self.beginInsertRows(QModelIndex(), first_row, first_row + len(objects) - 1)
+            self._row_count = first_row + len(objects)
+            self.endInsertRows()
+
+    def _on_block_failed(self, generation: int, message: str) -> None:
+        if generation != self._generation:
+            return
+        self._pending_blocks.clear()
+        self._exhausted = True
+        self.load_failed.emit(message)
+
+    def _store_block(self, block_index: int, objects: List[ModelType]) -> None:
+        self._blocks[block_index] = objects
+        self._blocks.move_to_end(block_index)
+        while len(self._blocks) > self._max_cached_blocks:
+            evicted_index, _ = self._blocks.popitem(last=False)
+            self._evict_formatted_rows(evicted_index)
+
+    def _evict_formatted_rows(self, block_index: int) -> None:
+        first_row = block_index * self._block_size
+        last_row = first_row + self._block_size
+        for row in [row for row in self._formatted_rows if first_row <= row < last_row]:
+            del self._formatted_rows[row]
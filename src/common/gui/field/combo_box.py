@@ -1,13 +1,41 @@
-from typing import Any, Generic, List, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 
 from PySide6.QtGui import QKeyEvent, QMouseEvent, QWheelEvent
 from PySide6.QtWidgets import QComboBox
+from sqlalchemy import Select, Table, inspect
+from sqlalchemy.sql.util import find_tables
 
 from common.model.base_model import BaseModel
+from common.model.reference_cache import ReferenceCache
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
 
+def _list_projection(model_class: Type[ModelType], query: Select) -> List[ModelType]:
+    # projeções compartilhadas entre os campos pela consulta que as gerou,
+    # descartadas quando muda algum registro das tabelas da consulta
+    statement = query.statement
+    try:
+        key = str(statement.compile(compile_kwargs={"literal_binds": True}))
+    except Exception:
+        # parâmetros que não viram literais: consulta sem cache
+        return model_class.list_combo_box_projection(query)
+
+    table_names = {
+        table.name
+        for table in find_tables(statement, check_columns=True, include_joins=True)
+        if isinstance(table, Table)
+    }
+    for relationship_name in model_class.get_combo_box_relationships():
+        mapper = getattr(model_class, relationship_name).property.mapper
+        table_names.add(mapper.local_table.name)
+    return ReferenceCache.get(
+        ("combo_box_projection", key),
+        table_names,
+        lambda: model_class.list_combo_box_projection(query),
+    )
+
+
 class ComboBox(QComboBox, Generic[ModelType]):
     model_class: Type[ModelType]
     _data: List[ModelType]
@@ -18,10 +46,19 @@ class ComboBox(QComboBox, Generic[ModelType]):
         model_class: Type[ModelType] = None,
         default_none: bool = True,
         load: bool = True,
+        projection: bool = False,
         **kwargs: Any,
     ):
+        """
+        Com projection=True os itens são carregados por
+        BaseModel.list_combo_box_projection (só as colunas da descrição, numa
+        consulta, com cache compartilhado) e a entidade completa é buscada
+        apenas quando o item selecionado é lido por get_current_data.
+        """
         self.model_class = model_class
         self._read_only = False
+        self._projection = projection
+        self._hydrated: Dict[int, ModelType] = {}
         super().__init__(parent)
         if load:
             self.fill(default_none, **kwargs)
@@ -30,12 +67,23 @@ class ComboBox(QComboBox, Generic[ModelType]):
         self.clear()
         if default_none:
             self.addItem("", None)
-        for item in self._list_for_fill(**kwargs):
+        if self._projection:
+            items = _list_projection(self.model_class, self._get_fill_query(**kwargs))
+        else:
+            items = self._list_for_fill(**kwargs)
+        for item in items:
             self._data.append(item)
             self.addItem(item.get_combo_box_description(), item)
 
+    def _get_fill_query(self, **kwargs: Any) -> Select:
+        return self.model_class.query_for_combo_box(**kwargs)
+
     def _list_for_fill(self, **kwargs: Any) -> List[ModelType]:
-        return self.model_class.list_for_combo_box(**kwargs)
+        return (
+            self._get_fill_query(**kwargs)
+            .options(*self.model_class.get_combo_box_load_options())
+            .all()
+        )
 
     def get_data(self) -> List[ModelType]:
         return self._data
@@ -44,12 +92,55 @@ class ComboBox(QComboBox, Generic[ModelType]):
         index = next(i for i in range(self.count()) if self.itemData(i) == data_value)
         self.setCurrentIndex(index)
 
-    def get_current_data(self) -> Union[ModelType, None]:
-        return self.itemData(self.currentIndex())
+    def get_current_data(self, hydrate: bool = True) -> Union[ModelType, None]:
+        """
+        Com hydrate=False devolve o item como está, mesmo que seja uma
+        projeção; quem lê vários campos de uma vez pode hidratá-los juntos
+        com ComboBox.hydrate_all.
+        """
+        data = self.itemData(self.currentIndex())
+        if not hydrate or data is None or not inspect(data).transient:
+            return data
+        return self._hydrate(data)
+
+    @staticmethod
+    def hydrate_all(
+        model_class: Type[ModelType], items: List[ModelType]
+    ) -> Tuple[List[ModelType], List[ModelType]]:
+        """
+        Busca numa única consulta as entidades completas de todas as
+        projeções, em vez de uma consulta por campo. Devolve as entidades, na
+        ordem dos itens, e as projeções cujo registro não existe mais.
+        """
+        ids = [item.id for item in items if inspect(item).transient]
+        entities = (
+            {entity.id: entity for entity in model_class.get_by_ids(ids)} if ids else {}
+        )
+        hydrated: List[ModelType] = []
+        missing: List[ModelType] = []
+        for item in items:
+            if not inspect(item).transient:
+                hydrated.append(item)
+            elif item.id in entities:
+                hydrated.append(entities[item.id])
+            else:
+                missing.append(item)
+        return hydrated, missing
+
+    def _hydrate(self, projection: ModelType) -> Optional[ModelType]:
+        # itens de projeção não estão em nenhuma sessão; a entidade completa
+        # é buscada uma vez por preenchimento
+        entity = self._hydrated.get(projection.id)
+        if entity is None:
+            entity = self.model_class.get_by_id(projection.id)
+            if entity is not None:
+                self._hydrated[projection.id] = entity
+        return entity
 
     def clear(self) -> None:
         super().clear()
         self._data = []
+        self._hydrated = {}
 
     def set_read_only(self, read_only: bool) -> None:
         self._read_only = read_only
@@ -1,4 +1,6 @@
-from typing import Generic, List, Optional, Type, TypeVar
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Generic, List, Optional, Type, TypeVar, Union
 
 from PySide6.QtCore import QEvent, QStringListModel, Qt, QTimer, Signal
 from PySide6.QtGui import QKeyEvent
@@ -11,6 +13,7 @@ from PySide6.QtWidgets import (
 )
 
 from common.model.base_model import BaseModel
+from common.model.search_index import SearchIndex
 from db import Database
 
 ModelType = TypeVar("ModelType", bound=BaseModel)
@@ -63,7 +66,11 @@ class ResultsPopup(QListView):
 
 
 class SearchLineEdit(QLineEdit, Generic[ModelType]):
+    # limite de cada consulta de busca no servidor, além do cancelamento
+    SEARCH_STATEMENT_TIMEOUT_MS = 5000
+
     model_changed = Signal(object)
+    _search_finished = Signal(int, object, object)
 
     def __init__(
         self,
@@ -71,6 +78,7 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
         model_class: Type[ModelType] = None,
         min_chars_for_search: int = 1,
         max_results: int = 10,
+        use_search_index: bool = False,
     ):
         try:
             model_class.apply_text_search_filter(None, "")
@@ -85,10 +93,23 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
         self.selected_model: Optional[ModelType] = None
         self.min_chars_for_search = min_chars_for_search
         self.max_results = max_results
-        self._filtered_items = []
+        # modelos buscados no banco ou, com o índice em memória, só os ids
+        self._filtered_items: List[Union[ModelType, int]] = []
         self._item_descriptions = []
         self._popup_visible = False
-        self._db_session = None
+        # cada busca recebe um número; resultados de buscas anteriores à
+        # última são descartados
+        self._search_sequence = 0
+        self._running_search_connection: Optional[Any] = None
+        self._running_search_lock = threading.Lock()
+        self._search_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="search-line-edit"
+        )
+        self._search_finished.connect(self._on_search_finished)
+        self._search_index: Optional[SearchIndex] = None
+        if use_search_index:
+            self._search_index = SearchIndex.for_model(model_class)
+            self._search_index.warm_up()
 
         self.setPlaceholderText(
             f"Pesquisar {self.model_class.get_static_description()}..."
@@ -108,6 +129,9 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
         self.installEventFilter(self)
 
     def _on_text_changed(self, text: str) -> None:
+        self._search_sequence += 1
+        self._cancel_running_search()
+
         if (
             self.selected_model
             and text != self.selected_model.get_combo_box_description()
@@ -131,42 +155,88 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
         if len(search_text) < self.min_chars_for_search:
             return
 
-        if self._db_session:
-            try:
-                self._db_session.close()
-            except:  # noqa: E722
-                pass
-            self._db_session = None
+        self._search_sequence += 1
+        if self._search_index is not None:
+            results = self._search_index.search(search_text, self.max_results)
+            if results is not None:
+                self._show_results(
+                    [id for id, _ in results],
+                    [description for _, description in results],
+                )
+                return
 
-        self._db_session = Database.get_session()
+        self._cancel_running_search()
+        self._search_executor.submit(
+            self._run_search, self._search_sequence, search_text
+        )
+
+    def _run_search(self, sequence: int, search_text: str) -> None:
+        # roda na thread de busca; o resultado volta pela fila de eventos do Qt
+        if sequence != self._search_sequence:
+            return
 
         try:
-            query = self._db_session.query(self.model_class)
-            query = self.model_class.apply_text_search_filter(query, search_text).limit(
-                self.max_results
-            )
-            filtered_items: Optional[List[ModelType]] = query.all()
+            with Database.session_scope(end_with_commit=False) as session:
+                connection = session.connection()
+                if connection.dialect.name == "postgresql":
+                    connection.exec_driver_sql(
+                        "SET LOCAL statement_timeout = "
+                        f"{int(self.SEARCH_STATEMENT_TIMEOUT_MS)}"
+                    )
+                with self._running_search_lock:
+                    self._running_search_connection = (
+                        connection.connection.dbapi_connection
+                    )
+                try:
+                    query = self.model_class.apply_ranked_text_search(
+                        session.query(self.model_class), search_text
+                    ).limit(self.max_results)
+                    filtered_items: List[ModelType] = query.all()
+                    descriptions = [
+                        item.get_combo_box_description() for item in filtered_items
+                    ]
+                finally:
+                    with self._running_search_lock:
+                        self._running_search_connection = None
+
+            self._search_finished.emit(sequence, filtered_items, descriptions)
+        except Exception:
+            # busca cancelada por uma mais nova ou que falhou; a próxima
+            # alteração do texto busca de novo
+            pass
 
-            self._filtered_items = filtered_items
-            self._item_descriptions = []
+    def _cancel_running_search(self) -> None:
+        # interrompe no servidor a consulta em andamento, que já ficou velha
+        with self._running_search_lock:
+            connection = self._running_search_connection
+            if connection is not None and hasattr(connection, "cancel"):
+                try:
+                    connection.cancel()
+                except Exception:
+                    pass
 
-            if not filtered_items:
-                self.popup.hide()
-                self._popup_visible = False
-                return
+    def _on_search_finished(
+        self, sequence: int, items: List[ModelType], descriptions: List[str]
+    ) -> None:
+        if sequence != self._search_sequence or self.selected_model is not None:
+            return
+        self._show_results(items, descriptions)
 
-            for item in filtered_items:
-                desc = item.get_combo_box_description()
-                self._item_descriptions.append(desc)
+    def _show_results(
+        self, items: List[Union[ModelType, int]], descriptions: List[str]
+    ) -> None:
+        self._filtered_items = items
+        self._item_descriptions = descriptions
 
-            model = QStringListModel(self._item_descriptions)
-            self.popup.setModel(model)
+        if not items:
+            self.popup.hide()
+            self._popup_visible = False
+            return
 
-            self._show_popup()
-        except Exception:
-            if self._db_session:
-                self._db_session.close()
-                self._db_session = None
+        model = QStringListModel(self._item_descriptions)
+        self.popup.setModel(model)
+
+        self._show_popup()
 
     def _show_popup(self) -> None:
         width = self.width()
@@ -187,7 +257,16 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
 
     def _on_item_selected(self, index: int) -> None:
         if 0 <= index < len(self._filtered_items):
-            self.set_selected_model(self._filtered_items[index])
+            item = self._filtered_items[index]
+            if isinstance(item, int):
+                # resultado do índice em memória: só o escolhido vem do banco
+                item = self.model_class.get_by_id(item)
+                if item is None:
+                    self._search_index.discard(self._filtered_items[index])
+                    self.popup.hide()
+                    self._popup_visible = False
+                    return
+            self.set_selected_model(item)
             if 0 <= index < len(self._item_descriptions):
                 self.setText(self._item_descriptions[index])
             else:
@@ -234,13 +313,6 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
             self.popup.hide()
             self._popup_visible = False
 
-            if self._db_session:
-                try:
-                    self._db_session.close()
-                except:  # noqa: E722
-                    pass
-                self._db_session = None
-
     def eventFilter(self, obj: object, event: QEvent) -> bool:
         if obj == self and event.type() == QEvent.MouseButtonPress:
             self.selectAll()
@@ -264,8 +336,6 @@ class SearchLineEdit(QLineEdit, Generic[ModelType]):
         return super().eventFilter(obj, event)
 
     def __del__(self):
-        if self._db_session:
-            try:
-                self._db_session.close()
-            except:  # noqa: E722
-                pass
+        self._search_sequence += 1
+        self._cancel_running_search()
+        self._search_executor.shutdown(wait=False, cancel_futures=True)
@@ -14,6 +14,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
+from common.gui.core.lazy_table_model import LazyTableModel
 from common.gui.core.table_model_default import TableModelDefault
 from common.gui.widget.base_entity_widget import BaseEntityWidget, ModelType
 
@@ -156,9 +157,9 @@ class BaseListWidget(BaseEntityWidget[ModelType], Generic[ModelType]):
         self.page_field.setText("1")
         layout.addWidget(self.page_field)
 
-        bar_label = QLabel("/")
-        bar_label.setFixedWidth(5)
-        layout.addWidget(bar_label)
+        self.page_bar_label = QLabel("/")
+        self.page_bar_label.setFixedWidth(5)
+        layout.addWidget(self.page_bar_label)
 
         self.last_page_field = QLineEdit()
         self.last_page_field.setFixedWidth(30)
@@ -188,10 +189,29 @@ class BaseListWidget(BaseEntityWidget[ModelType], Generic[ModelType]):
     def set_page_count(self, page_count: int) -> None:
         self.last_page_field.setText(str(page_count))
 
-    def set_row_count(self, row_count: int, rows_per_page: int) -> None:
+    def set_row_count(
+        self, row_count: int, rows_per_page: int, estimated: bool = False
+    ) -> None:
+        prefix = "aprox. " if estimated else ""
+        per_page = f" ({rows_per_page} por página)" if rows_per_page else ""
         self.row_count_label.setText(
-            f"Total de registros: <b>{row_count}</b> ({rows_per_page} por página)"
+            f"Total de registros: <b>{prefix}{row_count}</b>{per_page}"
         )
 
+    def use_lazy_table_model(self, block_size: int) -> None:
+        # rolagem contínua: a tabela busca mais linhas sozinha e a paginação some
+        self.table_model = LazyTableModel(self.model_class, block_size=block_size)
+        self.table.setModel(self.table_model)
+        for widget in (
+            self.first_page_button,
+            self.before_page_button,
+            self.page_field,
+            self.page_bar_label,
+            self.last_page_field,
+            self.after_page_button,
+            self.last_page_button,
+        ):
+            widget.setVisible(False)
+
     def _get_table_model_instance(self) -> TableModelDefault[ModelType]:
         return TableModelDefault(self.model_class)
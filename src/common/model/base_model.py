@@ -1,11 +1,24 @@
 from abc import abstractmethod
 from contextlib import contextmanager
 from datetime import date, datetime, time
-from typing import Any, Dict, Generator, List, Optional, Type, TypeVar
-
-from sqlalchemy import Column, DateTime, Integer, Select
+from itertools import chain
+from operator import attrgetter, methodcaller
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from sqlalchemy import Column, DateTime, Integer, Select, event
 from sqlalchemy.ext.declarative import declared_attr
-from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.orm import Session, declarative_base, joinedload, selectinload
+from sqlalchemy.orm.interfaces import MANYTOONE
 from sqlalchemy.orm.session import object_session
 
 from common.utils.number import NumberUtils
@@ -71,88 +84,109 @@ class BaseModel(Base):
         )
 
     @classmethod
-    def get_table_columns(cls) -> List[str]:
-        id_column = None
-        date_columns = []
-        normal_columns = []
-
-        for column in cls._get_all_listable_columns():
-            if hasattr(column, "info") and "title" in column.info:
-                title = column.info["title"]
+    def get_list_load_options(cls) -> List[Any]:
+        """
+        Carrega junto com a página as relações exibidas nas colunas listáveis,
+        para que a listagem não faça uma consulta por linha.
+        """
+        relationships = cls.__mapper__.relationships
+        options = []
+        for column in cls._get_model_listable_columns():
+            if column.foreign_keys:
+                relationship_ = next(
+                    (
+                        r
+                        for r in relationships
+                        if r.direction is MANYTOONE
+                        and column.name in {c.name for c in r.local_columns}
+                    ),
+                    None,
+                )
             else:
-                title = column.name.replace("_", " ").title()
+                relationship_ = relationships.get(column.name)
 
-            if column.name == "id":
-                id_column = title
-            elif column.name in ["created_at", "updated_at"]:
-                date_columns.append(title)
+            if relationship_ is None:
+                continue
+            attribute = getattr(cls, relationship_.key)
+            if relationship_.direction is MANYTOONE:
+                options.append(joinedload(attribute))
             else:
-                normal_columns.append(title)
-
-        result = []
-        if id_column:
-            result.append(id_column)
-        result.extend(normal_columns)
-        result.extend(date_columns)
-
-        return result
-
-    def format_for_table(self) -> List[Any]:
-        values_dict = {}
-
-        for column in self._get_all_listable_columns():
-            value = None
+                options.append(selectinload(attribute))
+        return options
 
-            column_name = column.name
-            if len(column.foreign_keys) > 0:
-                column_name = list(column.foreign_keys)[0].target_fullname.split(".")[0]
-
-            if hasattr(self, column_name):
-                value = getattr(self, column_name)
-            elif hasattr(self, f"get_{column_name}") and callable(
-                getattr(self, f"get_{column_name}")
-            ):
-                value = getattr(self, f"get_{column_name}")()
-
-            values_dict[column_name] = self.format_value_for_table(value)
-
-        result = []
+    @classmethod
+    def get_table_columns(cls) -> List[str]:
+        table_columns = _TABLE_COLUMNS.get(cls)
+        if table_columns is None:
+            table_columns = [
+                (
+                    column.info["title"]
+                    if hasattr(column, "info") and "title" in column.info
+                    else column.name.replace("_", " ").title()
+                )
+                for column in cls._get_ordered_listable_columns()
+            ]
+            _TABLE_COLUMNS[cls] = table_columns
+        return list(table_columns)
 
-        if "id" in values_dict:
-            result.append(values_dict["id"])
-            del values_dict["id"]
+    @classmethod
+    def _get_ordered_listable_columns(cls) -> List[Column]:
+        columns = cls._get_all_listable_columns()
+        date_column_names = ["created_at", "updated_at"]
+        return (
+            [column for column in columns if column.name == "id"]
+            + [
+                column
+                for column in columns
+                if column.name != "id" and column.name not in date_column_names
+            ]
+            + [column for column in columns if column.name in date_column_names]
+        )
 
-        for column in self._get_all_listable_columns():
-            column_name = column.name
+    @classmethod
+    def _get_table_plan(cls) -> List[Tuple[Callable[[Any], Any], Callable[[Any], Any]]]:
+        """
+        Monta uma vez por classe a lista de (leitura do valor, formatação) de
+        cada coluna listável, na ordem das colunas da tabela.
+        """
+        table_plan = _TABLE_PLANS.get(cls)
+        if table_plan is not None:
+            return table_plan
+
+        table_plan = []
+        for column in cls._get_ordered_listable_columns():
+            attribute_name = column.name
             if len(column.foreign_keys) > 0:
-                column_name = list(column.foreign_keys)[0].target_fullname.split(".")[0]
+                attribute_name = list(column.foreign_keys)[0].target_fullname.split(
+                    "."
+                )[0]
+
+            if hasattr(cls, attribute_name):
+                getter = attrgetter(attribute_name)
+            elif callable(getattr(cls, f"get_{attribute_name}", None)):
+                getter = methodcaller(f"get_{attribute_name}")
+            else:
+                getter = _get_none
 
-            if column_name not in ["id", "created_at", "updated_at"]:
-                result.append(values_dict[column_name])
+            # a coluna de chave estrangeira exibe o objeto relacionado
+            formatter = _format_value
+            if attribute_name == column.name:
+                formatter = _get_typed_formatter(column)
+            table_plan.append((getter, formatter))
 
-        if "created_at" in values_dict:
-            result.append(values_dict["created_at"])
-        if "updated_at" in values_dict:
-            result.append(values_dict["updated_at"])
+        _TABLE_PLANS[cls] = table_plan
+        return table_plan
 
-        return result
+    def format_for_table(self) -> List[Any]:
+        if type(self).format_value_for_table is not BaseModel.format_value_for_table:
+            return [
+                self.format_value_for_table(getter(self))
+                for getter, _ in self._get_table_plan()
+            ]
+        return [formatter(getter(self)) for getter, formatter in self._get_table_plan()]
 
     def format_value_for_table(self, value: Any) -> Any:
-        if value is None:
-            return ""
-        if isinstance(value, BaseModel):
-            return value.get_description()
-        if isinstance(value, datetime):
-            return value.strftime("%d/%m/%Y %H:%M")
-        if isinstance(value, date):
-            return value.strftime("%d/%m/%Y")
-        if isinstance(value, time):
-            return value.strftime("%H:%M")
-        if isinstance(value, float):
-            return NumberUtils.float_to_str(value)
-        if isinstance(value, bool):
-            return "Sim" if value else "Não"
-        return str(value)
+        return _format_value(value)
 
     def to_dict(self) -> Dict[str, Any]:
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
@@ -163,9 +197,71 @@ class BaseModel(Base):
             **{k: v for k, v in data.items() if k in cls.__table__.columns.keys()}
         )
 
+    @classmethod
+    def query_for_combo_box(cls, **kwargs: Any) -> Select:
+        return cls.query().order_by(cls.id)
+
     @classmethod
     def list_for_combo_box(cls, **kwargs: Any) -> List[T]:
-        return [record for record in cls.query().order_by(cls.id)]
+        return [
+            record
+            for record in cls.query_for_combo_box(**kwargs).options(
+                *cls.get_combo_box_load_options()
+            )
+        ]
+
+    @classmethod
+    def get_combo_box_relationships(cls) -> Dict[str, List[Column]]:
+        """
+        Relações muitos-para-um usadas por get_combo_box_description, com as
+        colunas de cada uma que a descrição precisa.
+        """
+        return {}
+
+    @classmethod
+    def get_combo_box_load_options(cls) -> List[Any]:
+        return [
+            joinedload(getattr(cls, name)) for name in cls.get_combo_box_relationships()
+        ]
+
+    @classmethod
+    def list_combo_box_projection(cls, query: Select) -> List[T]:
+        """
+        Lê numa única consulta só as colunas da tabela e as das relações de
+        get_combo_box_relationships, sem montar as entidades na sessão. Devolve
+        instâncias transitórias que servem apenas para exibição e comparação
+        por id.
+        """
+        relationships = {
+            name: (getattr(cls, name).property.mapper, columns)
+            for name, columns in cls.get_combo_box_relationships().items()
+        }
+        own_columns = list(cls.__table__.columns)
+        entities: List[Any] = list(own_columns)
+        for name, (_, columns) in relationships.items():
+            query = query.outerjoin(getattr(cls, name))
+            entities.extend(column.label(f"{name}__{column.key}") for column in columns)
+
+        own_keys = [cls.__mapper__.get_property_by_column(c).key for c in own_columns]
+        result = []
+        for row in query.with_entities(*entities).all():
+            instance = cls.__mapper__.class_manager.new_instance()
+            for key, value in zip(own_keys, row):
+                setattr(instance, key, value)
+
+            offset = len(own_keys)
+            for name, (mapper, columns) in relationships.items():
+                end = offset + len(columns)
+                values = row[offset:end]
+                offset = end
+                if all(value is None for value in values):
+                    continue
+                related = mapper.class_manager.new_instance()
+                for column, value in zip(columns, values):
+                    setattr(related, column.key, value)
+                setattr(instance, name, related)
+            result.append(instance)
+        return result
 
     @classmethod
     def get_by_id(
@@ -177,10 +273,35 @@ class BaseModel(Base):
         with Database.session_scope(end_with_commit=False) as session:
             return session.query(cls).filter(cls.id == id).first()
 
+    @classmethod
+    def get_by_ids(
+        cls: Type[T], ids: List[int], session: Optional[Session] = None
+    ) -> List[T]:
+        if session:
+            return session.query(cls).filter(cls.id.in_(ids)).all()
+
+        with Database.session_scope(end_with_commit=False) as session:
+            return session.query(cls).filter(cls.id.in_(ids)).all()
+
     @classmethod
     def apply_text_search_filter(cls, query: Select, search_text: str) -> Select:
         raise NotImplementedError()
 
+    @classmethod
+    def apply_ranked_text_search(cls, query: Select, search_text: str) -> Select:
+        return cls.apply_text_search_filter(query, search_text)
+
+    @classmethod
+    def get_search_index_columns(
+        cls,
+    ) -> Optional[Tuple[Column, Optional[Column], List[Column]]]:
+        """
+        Colunas do índice de busca em memória (SearchIndex): o texto
+        normalizado, a coluna comparada com termos numéricos e as colunas
+        necessárias para montar a descrição do combo box.
+        """
+        return None
+
     @classmethod
     def query(cls) -> Select:
         with Database.session_scope() as session:
@@ -243,6 +364,31 @@ class BaseModel(Base):
             with Database.session_scope() as session:
                 yield session
 
+    @classmethod
+    def add_change_listener(cls, listener: Callable[[Type["BaseModel"]], None]) -> None:
+        """
+        Registra uma função chamada com a classe do modelo depois do commit de
+        uma sessão que inseriu, alterou ou removeu registros dela pelo ORM
+        (atualizações em massa via query().update() não passam por aqui).
+        """
+        _CHANGE_LISTENERS.append(listener)
+
+    @classmethod
+    def remove_change_listener(
+        cls, listener: Callable[[Type["BaseModel"]], None]
+    ) -> None:
+        if listener in _CHANGE_LISTENERS:
+            _CHANGE_LISTENERS.remove(listener)
+
+    @classmethod
+    def notify_changed(cls) -> None:
+        """
+        Chama os ouvintes de add_change_listener para esta classe; usado
+        também para mudanças feitas por outros clientes (ChangeNotifier).
+        """
+        for listener in list(_CHANGE_LISTENERS):
+            listener(cls)
+
     @classmethod
     def create_all(cls):
         Base.metadata.create_all(Database.get_engine())
@@ -258,3 +404,85 @@ class BaseModel(Base):
 
     def __hash__(self) -> int:
         return hash(f"{self.__class__.__name__}-{self.id}")
+
+
+_CHANGE_LISTENERS: List[Callable[[Type[BaseModel]], None]] = []
+_CHANGED_MODEL_CLASSES_KEY = "changed_model_classes"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_model_classes(session: Session, flush_context: Any) -> None:
+    changed_model_classes = session.info.setdefault(_CHANGED_MODEL_CLASSES_KEY, set())
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, BaseModel):
+            changed_model_classes.add(type(instance))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_changed_model_classes(session: Session) -> None:
+    for model_class in session.info.pop(_CHANGED_MODEL_CLASSES_KEY, ()):
+        model_class.notify_changed()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_model_classes(session: Session) -> None:
+    session.info.pop(_CHANGED_MODEL_CLASSES_KEY, None)
+
+
+_TABLE_COLUMNS: Dict[Type[BaseModel], List[str]] = {}
+_TABLE_PLANS: Dict[
+    Type[BaseModel], List[Tuple[Callable[[Any], Any], Callable[[Any], Any]]]
+] = {}
+
+
+def _get_none(obj: Any) -> None:
+    return None
+
+
+def _format_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, BaseModel):
+        return value.get_description()
+    if isinstance(value, datetime):
+        return value.strftime("%d/%m/%Y %H:%M")
+    if isinstance(value, date):
+        return value.strftime("%d/%m/%Y")
+    if isinstance(value, time):
+        return value.strftime("%H:%M")
+    if isinstance(value, float):
+        return NumberUtils.float_to_str(value)
+    if isinstance(value, bool):
+        return "Sim" if value else "Não"
+    return str(value)
+
+
+_TYPED_FORMATTERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: lambda value: value.strftime("%d/%m/%Y %H:%M"),
+    date: lambda value: value.strftime("%d/%m/%Y"),
+    time: lambda value: value.strftime("%H:%M"),
+    float: NumberUtils.float_to_str,
+    bool: lambda value: "Sim" if value else "Não",
+    int: str,
+    str: str,
+}
+
+
+def _get_typed_formatter(column: Column) -> Callable[[Any], Any]:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return _format_value
+
+    typed_formatter = _TYPED_FORMATTERS.get(python_type)
+    if typed_formatter is None:
+        return _format_value
+
+    # o tipo do valor pode não bater com o da coluna (colunas virtuais que
+    # devolvem objetos, por exemplo); nesse caso cai na formatação genérica
+    def format_value(value: Any) -> Any:
+        if type(value) is python_type:
+            return typed_formatter(value)
+        return _format_value(value)
+
+    return format_value
@@ -0,0 +1,120 @@
+import select
+import threading
+import uuid
+from itertools import chain
+from typing import Any, Dict, Optional, Type
+
+from sqlalchemy import event, func
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from common.model.base_model import BaseModel
+from db import Database
+
+
+class ChangeNotifier:
+    """
+    Avisa os outros clientes ligados ao mesmo banco quando registros mudam,
+    por LISTEN/NOTIFY do PostgreSQL, para que descartem seus caches. Cada
+    flush envia um NOTIFY por tabela alterada; como o NOTIFY é transacional,
+    o aviso só chega se houver commit. Os avisos recebidos chamam os ouvintes
+    de BaseModel.add_change_listener numa thread própria.
+    """
+
+    CHANNEL = "model_changes"
+    POLL_SECONDS = 1.0
+    RECONNECT_SECONDS = 5.0
+
+    __client_id = uuid.uuid4().hex
+    __thread: Optional[threading.Thread] = None
+    __stop_event = threading.Event()
+
+    @classmethod
+    def start(cls) -> None:
+        if (
+            cls.__thread is not None
+            or Database.get_engine().dialect.name != "postgresql"
+        ):
+            return
+        cls.__stop_event.clear()
+        event.listen(Session, "after_flush", cls.__notify_flushed_changes)
+        cls.__thread = threading.Thread(
+            target=cls.__listen, name="change-notifier", daemon=True
+        )
+        cls.__thread.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls.__thread is None:
+            return
+        event.remove(Session, "after_flush", cls.__notify_flushed_changes)
+        cls.__stop_event.set()
+        cls.__thread.join()
+        cls.__thread = None
+
+    @classmethod
+    def __notify_flushed_changes(cls, session: Session, flush_context: Any) -> None:
+        connection = session.connection()
+        if connection.dialect.name != "postgresql":
+            return
+
+        table_names = {
+            instance.__table__.name
+            for instance in chain(session.new, session.dirty, session.deleted)
+            if isinstance(instance, BaseModel)
+        }
+        for table_name in sorted(table_names):
+            connection.execute(
+                sql_select(
+                    func.pg_notify(cls.CHANNEL, f"{cls.__client_id}:{table_name}")
+                )
+            )
+
+    @classmethod
+    def __listen(cls) -> None:
+        while not cls.__stop_event.is_set():
+            try:
+                cls.__listen_connection()
+            except Exception:
+                # banco fora do ar: tenta de novo depois; enquanto isso os
+                # caches seguem expirando pelo TTL
+                cls.__stop_event.wait(cls.RECONNECT_SECONDS)
+
+    @classmethod
+    def __listen_connection(cls) -> None:
+        connection = Database.get_engine().raw_connection()
+        try:
+            driver_connection = connection.driver_connection
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {cls.CHANNEL}")
+
+            while not cls.__stop_event.is_set():
+                readable, _, _ = select.select(
+                    [driver_connection], [], [], cls.POLL_SECONDS
+                )
+                if not readable:
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    cls.__dispatch(driver_connection.notifies.pop(0).payload)
+        finally:
+            # a conexão ficou em autocommit e escutando o canal: não volta ao pool
+            connection.invalidate()
+            connection.close()
+
+    @classmethod
+    def __dispatch(cls, payload: str) -> None:
+        client_id, _, table_name = payload.partition(":")
+        if client_id == cls.__client_id:
+            return
+        model_class = cls.__get_model_classes_by_table().get(table_name)
+        if model_class is not None:
+            model_class.notify_changed()
+
+    @staticmethod
+    def __get_model_classes_by_table() -> Dict[str, Type[BaseModel]]:
+        return {
+            mapper.local_table.name: mapper.class_
+            for mapper in BaseModel.registry.mappers
+        }
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+from common.model.base_model import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+V = TypeVar("V")
+
+
+class ReferenceCache:
+    """
+    Cache em memória, por processo, de dados de referência: tabelas pequenas
+    lidas o tempo todo, como a configuração, finalidades, veículos e
+    motoristas. Cada entrada guarda as tabelas de que depende e é descartada
+    quando expira (ttl_seconds) ou quando um registro de uma delas muda, seja
+    neste cliente (BaseModel.add_change_listener) ou em outro (ChangeNotifier).
+    As entidades devolvidas ficam fora de sessão e são compartilhadas, então
+    servem só para leitura.
+    """
+
+    ttl_seconds: float = 300
+
+    __lock = threading.Lock()
+    __entries: Dict[Hashable, Tuple[float, FrozenSet[str], Any]] = {}
+    # incrementada a cada invalidação; uma carga que começou antes dela não é
+    # guardada, pois pode ter lido dados já alterados
+    __generation = 0
+
+    @classmethod
+    def configure(cls, ttl_seconds: float) -> None:
+        cls.ttl_seconds = ttl_seconds
+        cls.invalidate()
+
+    @classmethod
+    def get(
+        cls, key: Hashable, table_names: Iterable[str], loader: Callable[[], V]
+    ) -> V:
+        now = time.monotonic()
+        with cls.__lock:
+            entry = cls.__entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[2]
+            generation = cls.__generation
+
+        value = loader()
+
+        with cls.__lock:
+            if generation == cls.__generation and cls.ttl_seconds > 0:
+                cls.__entries[key] = (
+                    now + cls.ttl_seconds,
+                    frozenset(table_names),
+                    value,
+                )
+        return value
+
+    @classmethod
+    def get_by_id(cls, model_class: Type[T], id: int) -> Optional[T]:
+        return cls.get(
+            (model_class, "id", id),
+            [model_class.__table__.name],
+            lambda: model_class.get_by_id(id),
+        )
+
+    @classmethod
+    def list_all(cls, model_class: Type[T]) -> List[T]:
+        return cls.get(
+            (model_class, "all"),
+            [model_class.__table__.name],
+            lambda: model_class.query().order_by(model_class.id).all(),
+        )
+
+    @classmethod
+    def invalidate(cls, model_class: Optional[Type[BaseModel]] = None) -> None:
+        with cls.__lock:
+            cls.__generation += 1
+            if model_class is None:
+                cls.__entries.clear()
+                return
+
+            table_name = model_class.__table__.name
+            for key in [
+                key
+                for key, (_, table_names, _) in cls.__entries.items()
+                if table_name in table_names
+            ]:
+                del cls.__entries[key]
+
+
+BaseModel.add_change_listener(ReferenceCache.invalidate)
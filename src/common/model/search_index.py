@@ -0,0 +1,380 @@
+import bisect
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Column, func, literal
+
+from common.model.base_model import BaseModel
+from common.model.text_search import TextSearch
+from db import Database
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndex:
+    """
+    Índice em memória, compartilhado por classe de modelo, do texto de busca
+    normalizado de cada registro. É carregado numa thread separada na primeira
+    vez em que é usado e depois atualizado só com os registros alterados
+    (updated_at), para que a busca enquanto se digita não vá ao banco. Segue
+    as mesmas regras de TextSearch: termos curtos casam com o início das
+    palavras (lista ordenada de palavras) e os demais com qualquer trecho.
+    """
+
+    REFRESH_INTERVAL_SECONDS = 30
+    # acima disso a lista de palavras é refeita em vez de atualizada registro
+    # a registro
+    MAX_INCREMENTAL_WORD_UPDATES = 1000
+    # updated_at é gravado pelo cliente no flush, não no commit: um registro
+    # confirmado depois da última leitura, ou salvo por uma estação com o
+    # relógio atrasado, pode ter updated_at anterior a ela. Cada atualização
+    # relê também esse intervalo antes da última leitura
+    SYNC_OVERLAP = timedelta(minutes=5)
+
+    __instances: Dict[Type[BaseModel], "SearchIndex"] = {}
+    __instances_lock = threading.Lock()
+
+    @classmethod
+    def for_model(cls, model_class: Type[BaseModel]) -> "SearchIndex":
+        with cls.__instances_lock:
+            instance = cls.__instances.get(model_class)
+            if instance is None:
+                instance = cls(model_class)
+                cls.__instances[model_class] = instance
+            return instance
+
+    def __init__(self, model_class: Type[BaseModel]) -> None:
+        columns = model_class.get_search_index_columns()
+        if columns is None:
+            raise ValueError(
+                f"O modelo {model_class.__name__} não define as colunas do índice de busca"
+            )
+        self.__model_class = model_class
+        self.__search_column: Column = columns[0]
+        self.__digits_column: Optional[Column] = columns[1]
+        self.__description_columns: List[Column] = columns[2]
+
+        self.__lock = threading.Lock()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="search-index"
+        )
+        self.__refresh_future: Optional[Future] = None
+        self.__last_refresh = 0.0
+        self.__last_sync: Optional[datetime] = None
+
+        self.__positions: Dict[int, int] = {}
+        self.__ids: List[int] = []
+        self.__texts: List[Optional[str]] = []
+        self.__digits: List[str] = []
+        self.__description_values: List[Tuple[Any, ...]] = []
+        self.__descriptions: Dict[int, str] = {}
+        self.__words: List[Tuple[str, int]] = []
+        self.__last_search: Optional[Tuple[List[str], List[int]]] = None
+        BaseModel.add_change_listener(self.__on_model_changed)
+
+    def warm_up(self) -> None:
+        self.__schedule_refresh()
+
+    def search(self, search_text: str, limit: int) -> Optional[List[Tuple[int, str]]]:
+        """
+        Devolve (id, descrição) dos registros encontrados, ou None enquanto o
+        índice ainda não foi carregado.
+        """
+        self.__schedule_refresh()
+        terms = [term for term in TextSearch.get_terms(search_text) if term]
+
+        with self.__lock:
+            if self.__last_sync is None:
+                return None
+            if not terms:
+                return []
+
+            candidates, remaining_terms = self.__get_candidates(terms)
+            matches = [
+                position
+                for position in candidates
+                if self.__matches(position, remaining_terms)
+            ]
+            self.__last_search = (terms, matches)
+            return [
+                (self.__ids[position], self.__get_description(position))
+                for position in self.__rank(matches, terms, limit)
+            ]
+
+    def discard(self, id: int) -> None:
+        # registro que sumiu do banco (removido por outra estação, por exemplo)
+        with self.__lock:
+            position = self.__positions.pop(id, None)
+            if position is None:
+                return
+            self.__remove_words(position)
+            self.__texts[position] = None
+            self.__descriptions.pop(position, None)
+            self.__last_search = None
+
+    def __on_model_changed(self, model_class: Type[BaseModel]) -> None:
+        # registro salvo aqui ou em outro cliente: a próxima busca atualiza o
+        # índice sem esperar o intervalo
+        if model_class is self.__model_class:
+            with self.__lock:
+                self.__last_refresh = 0.0
+
+    def __schedule_refresh(self) -> None:
+        with self.__lock:
+            if self.__refresh_future is not None and not self.__refresh_future.done():
+                return
+            if (
+                self.__last_sync is not None
+                and time.monotonic() - self.__last_refresh
+                < self.REFRESH_INTERVAL_SECONDS
+            ):
+                return
+            self.__last_refresh = time.monotonic()
+            self.__refresh_future = self.__executor.submit(self.__refresh)
+
+    def __refresh(self) -> None:
+        try:
+            if self.__last_sync is None or not self.__apply_changes():
+                self.__load_all()
+        except Exception:
+            # enquanto o índice não carrega a busca continua sendo feita no banco
+            logger.exception(
+                "Falha ao atualizar o índice de busca de %s",
+                self.__model_class.__name__,
+            )
+
+    def __query_rows(self, session, updated_since: Optional[datetime]) -> List[Any]:
+        query = session.query(
+            self.__model_class.id,
+            self.__model_class.updated_at,
+            self.__search_column,
+            self.__digits_column if self.__digits_column is not None else literal(""),
+            *self.__description_columns,
+        )
+        if updated_since is not None:
+            query = query.filter(self.__model_class.updated_at >= updated_since)
+        return query.all()
+
+    def __load_all(self) -> None:
+        with Database.session_scope(end_with_commit=False) as session:
+            rows = self.__query_rows(session, None)
+
+        positions: Dict[int, int] = {}
+        ids: List[int] = []
+        texts: List[Optional[str]] = []
+        digits: List[str] = []
+        description_values: List[Tuple[Any, ...]] = []
+        last_sync = datetime.min
+        for row in rows:
+            positions[row[0]] = len(ids)
+            ids.append(row[0])
+            last_sync = max(last_sync, row[1])
+            texts.append(row[2] or "")
+            digits.append(row[3] or "")
+            description_values.append(tuple(row[4:]))
+        words = self.__build_words(texts)
+
+        with self.__lock:
+            self.__positions = positions
+            self.__ids = ids
+            self.__texts = texts
+            self.__digits = digits
+            self.__description_values = description_values
+            self.__descriptions = {}
+            self.__words = words
+            self.__last_search = None
+            self.__last_sync = last_sync
+
+    def __apply_changes(self) -> bool:
+        # registros removidos não aparecem em updated_at; quando a contagem
+        # não bate o índice é recarregado por inteiro
+        with Database.session_scope(end_with_commit=False) as session:
+            rows = self.__query_rows(
+                session,
+                (
+                    self.__last_sync - self.SYNC_OVERLAP
+                    if self.__last_sync > datetime.min + self.SYNC_OVERLAP
+                    else None
+                ),
+            )
+            count = session.query(func.count(self.__model_class.id)).scalar()
+
+        with self.__lock:
+            rebuild_words = len(rows) > self.MAX_INCREMENTAL_WORD_UPDATES
+            changed = False
+            for row in rows:
+                text = row[2] or ""
+                digits = row[3] or ""
+                description_values = tuple(row[4:])
+                position = self.__positions.get(row[0])
+                if position is None:
+                    position = len(self.__ids)
+                    self.__positions[row[0]] = position
+                    self.__ids.append(row[0])
+                    self.__texts.append(text)
+                    self.__digits.append(digits)
+                    self.__description_values.append(description_values)
+                    if not rebuild_words:
+                        self.__add_words(position)
+                    changed = True
+                elif (
+                    self.__texts[position] != text
+                    or self.__digits[position] != digits
+                    or self.__description_values[position] != description_values
+                ):
+                    # linhas do intervalo relido que não mudaram são ignoradas
+                    if self.__texts[position] != text and not rebuild_words:
+                        self.__remove_words(position)
+                        self.__texts[position] = text
+                        self.__add_words(position)
+                    self.__texts[position] = text
+                    self.__digits[position] = digits
+                    self.__description_values[position] = description_values
+                    self.__descriptions.pop(position, None)
+                    changed = True
+                self.__last_sync = max(self.__last_sync, row[1])
+
+            if rebuild_words:
+                self.__words = self.__build_words(self.__texts)
+            if changed:
+                self.__last_search = None
+            return count == len(self.__positions)
+
+    @staticmethod
+    def __build_words(texts: Sequence[Optional[str]]) -> List[Tuple[str, int]]:
+        return sorted(
+            (word, position)
+            for position, text in enumerate(texts)
+            if text
+            for word in set(text.split(" "))
+        )
+
+    def __add_words(self, position: int) -> None:
+        for word in set(self.__texts[position].split(" ")):
+            bisect.insort(self.__words, (word, position))
+
+    def __remove_words(self, position: int) -> None:
+        for word in set((self.__texts[position] or "").split(" ")):
+            index = bisect.bisect_left(self.__words, (word, position))
+            if index < len(self.__words) and self.__words[index] == (word, position):
+                del self.__words[index]
+
+    def __get_candidates(self, terms: List[str]) -> Tuple[Sequence[int], List[str]]:
+        """
+        Devolve as posições candidatas e os termos que ainda precisam ser
+        conferidos nelas.
+        """
+        # ao continuar digitando a mesma busca só os resultados anteriores
+        # podem continuar casando
+        if self.__last_search is not None and self.__is_narrowing(
+            self.__last_search[0], terms
+        ):
+            return self.__last_search[1], terms
+
+        # o termo mais longo costuma ser o mais seletivo
+        term = max(terms, key=len)
+        remaining_terms = list(terms)
+        remaining_terms.remove(term)
+        texts = self.__texts
+
+        if term.isdigit() and self.__digits_column is not None:
+            return [
+                position
+                for position, digits in enumerate(self.__digits)
+                if texts[position] is not None
+                and (
+                    term in digits
+                    if len(term) >= TextSearch.MIN_TRIGRAM_TERM_LENGTH
+                    else digits.startswith(term) or f" {term}" in digits
+                )
+            ], remaining_terms
+
+        if len(term) >= TextSearch.MIN_TRIGRAM_TERM_LENGTH:
+            return [
+                position
+                for position, text in enumerate(texts)
+                if text is not None and term in text
+            ], remaining_terms
+
+        start = bisect.bisect_left(self.__words, (term,))
+        end = bisect.bisect_left(self.__words, (term + "\uffff",))
+        return {position for _, position in self.__words[start:end]}, remaining_terms
+
+    def __is_narrowing(self, previous_terms: List[str], terms: List[str]) -> bool:
+        if len(terms) < len(previous_terms):
+            return False
+        for index, (previous_term, term) in enumerate(zip(previous_terms, terms)):
+            if previous_term == term:
+                continue
+            if (
+                index != len(previous_terms) - 1
+                or not term.startswith(previous_term)
+                or previous_term.isdigit() != term.isdigit()
+            ):
+                return False
+            # um termo curto só casa com o início das palavras; ao crescer ele
+            # passa a casar com qualquer trecho e pode trazer novos resultados
+            if len(previous_term) < TextSearch.MIN_TRIGRAM_TERM_LENGTH <= len(term):
+                return False
+        return True
+
+    def __matches(self, position: int, terms: List[str]) -> bool:
+        text = self.__texts[position]
+        if text is None:
+            return False
+        for term in terms:
+            column_text = text
+            if term.isdigit() and self.__digits_column is not None:
+                column_text = self.__digits[position]
+            if len(term) >= TextSearch.MIN_TRIGRAM_TERM_LENGTH:
+                if term not in column_text:
+                    return False
+            elif not (column_text.startswith(term) or f" {term}" in column_text):
+                return False
+        return True
+
+    def __rank(self, matches: List[int], terms: List[str], limit: int) -> List[int]:
+        # mesma ordem de TextSearch.apply_ranking, com a similaridade de
+        # trigramas aproximada pelo tamanho do texto
+        texts = self.__texts
+        text = " ".join(term for term in terms if not term.isdigit())
+        if not text:
+            return heapq.nsmallest(limit, matches, key=texts.__getitem__)
+
+        word_prefix = f" {text}"
+        ranked = heapq.nsmallest(
+            limit,
+            (
+                (
+                    (
+                        0
+                        if position_text.startswith(text)
+                        else 1 if word_prefix in position_text else 2
+                    ),
+                    len(position_text),
+                    position_text,
+                    position,
+                )
+                for position, position_text in zip(
+                    matches, map(texts.__getitem__, matches)
+                )
+            ),
+        )
+        return [item[-1] for item in ranked]
+
+    def __get_description(self, position: int) -> str:
+        description = self.__descriptions.get(position)
+        if description is None:
+            instance = self.__model_class.__mapper__.class_manager.new_instance()
+            for column, value in zip(
+                self.__description_columns, self.__description_values[position]
+            ):
+                setattr(instance, column.key, value)
+            description = instance.get_combo_box_description()
+            self.__descriptions[position] = description
+        return description
@@ -0,0 +1,82 @@
+from typing import List, Optional
+
+from sqlalchemy import Column, Select, and_, case, func, or_
+
+from common.utils.string import StringUtils
+
+
+class TextSearch:
+    """
+    Busca textual sobre uma coluna normalizada (minúsculas e sem acentos)
+    indexada com pg_trgm. Termos com menos de três caracteres não formam
+    trigramas, então são buscados só no início das palavras.
+    """
+
+    MIN_TRIGRAM_TERM_LENGTH = 3
+    LIKE_ESCAPE = "\\"
+
+    @classmethod
+    def get_terms(cls, search_text: str) -> List[str]:
+        return StringUtils.normalize_for_search(search_text).split(" ")
+
+    @classmethod
+    def apply_filter(
+        cls,
+        query: Select,
+        search_text: str,
+        search_column: Column,
+        digits_column: Optional[Column] = None,
+    ) -> Select:
+        search_conditions = []
+        for term in cls.get_terms(search_text):
+            if not term:
+                continue
+            if term.isdigit() and digits_column is not None:
+                search_conditions.append(cls.__contains(digits_column, term))
+            else:
+                search_conditions.append(cls.__contains(search_column, term))
+        return query.filter(and_(*search_conditions))
+
+    @classmethod
+    def apply_ranking(
+        cls, query: Select, search_text: str, search_column: Column
+    ) -> Select:
+        """
+        Ordena primeiro o que começa com o texto buscado, depois o que tem
+        uma palavra começando com ele e, dentro de cada grupo, pela
+        similaridade de trigramas.
+        """
+        text = " ".join(
+            term for term in cls.get_terms(search_text) if term and not term.isdigit()
+        )
+        if not text:
+            return query.order_by(search_column)
+
+        escaped_text = cls.__escape(text)
+        return query.order_by(
+            case(
+                (search_column.like(f"{escaped_text}%", escape=cls.LIKE_ESCAPE), 0),
+                (search_column.like(f"% {escaped_text}%", escape=cls.LIKE_ESCAPE), 1),
+                else_=2,
+            ),
+            func.similarity(search_column, text).desc(),
+            search_column,
+        )
+
+    @classmethod
+    def __contains(cls, column: Column, term: str):
+        escaped_term = cls.__escape(term)
+        if len(term) >= cls.MIN_TRIGRAM_TERM_LENGTH:
+            return column.like(f"%{escaped_term}%", escape=cls.LIKE_ESCAPE)
+        return or_(
+            column.like(f"{escaped_term}%", escape=cls.LIKE_ESCAPE),
+            column.like(f"% {escaped_term}%", escape=cls.LIKE_ESCAPE),
+        )
+
+    @classmethod
+    def __escape(cls, term: str) -> str:
+        return (
+            term.replace(cls.LIKE_ESCAPE, cls.LIKE_ESCAPE * 2)
+            .replace("%", f"{cls.LIKE_ESCAPE}%")
+            .replace("_", f"{cls.LIKE_ESCAPE}_")
+        )
@@ -0,0 +1,32 @@
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float, burst: int = 1) -> None:
+        self.__rate_per_second = rate_per_second
+        self.__capacity = max(burst, 1)
+        self.__tokens = float(self.__capacity)
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.__rate_per_second <= 0:
+            return
+
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(
+                    self.__capacity,
+                    self.__tokens + (now - self.__updated_at) * self.__rate_per_second,
+                )
+                self.__updated_at = now
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+
+                wait_time = (1 - self.__tokens) / self.__rate_per_second
+
+            time.sleep(wait_time)
@@ -1,7 +1,18 @@
+import unicodedata
 from typing import Optional
 
 
 class StringUtils:
+    @classmethod
+    def normalize_for_search(cls, text: Optional[str]) -> str:
+        # minúsculas, sem acentos e com um único espaço entre as palavras; deve
+        # bater com lower(unaccent(...)) usado na migração das colunas de busca
+        if not text:
+            return ""
+        decomposed = unicodedata.normalize("NFKD", text)
+        without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+        return " ".join(without_accents.lower().split())
+
     @classmethod
     def format_cpf(cls, cpf: str) -> Optional[str]:
         if cls.is_valid_cpf(cpf):
@@ -1,11 +1,15 @@
+import logging
+import time
 from contextlib import contextmanager
-from typing import Generator, Optional, Tuple
+from typing import Any, Dict, Generator, Optional, Tuple, Union
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session, sessionmaker
 
+logger = logging.getLogger(__name__)
+
 
 class Database:
     _instance: Optional["Database"] = None
@@ -14,10 +18,28 @@ class Database:
 
     @classmethod
     def initialize(
-        cls, db_user: str, db_password: str, db_host: str, db_port: str, db_name: str
+        cls,
+        db_user: str,
+        db_password: str,
+        db_host: str,
+        db_port: str,
+        db_name: str,
+        echo: Union[bool, str] = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = -1,
+        executemany_mode: str = "values_plus_batch",
+        statement_timeout_ms: int = 0,
+        slow_query_threshold_ms: int = 0,
     ):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
+
+            connect_args: Dict[str, Any] = {}
+            if statement_timeout_ms:
+                connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+
             cls._engine = create_engine(
                 "postgresql+psycopg2://{}:{}@{}:{}/{}".format(
                     db_user,
@@ -26,10 +48,48 @@ class Database:
                     db_port,
                     db_name,
                 ),
-                echo=True,
+                echo=echo,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_pre_ping=pool_pre_ping,
+                pool_recycle=pool_recycle,
+                executemany_mode=executemany_mode,
+                connect_args=connect_args,
             )
+            if slow_query_threshold_ms:
+                cls._register_slow_query_log(cls._engine, slow_query_threshold_ms)
             cls._session_factory = sessionmaker(bind=cls._engine)
 
+    @staticmethod
+    def _register_slow_query_log(engine: Engine, threshold_ms: int) -> None:
+        # registra só as consultas que passam do limite, em vez de ecoar todas
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(
+            connection, cursor, statement, parameters, context, executemany
+        ):
+            connection.info.setdefault("query_start_times", []).append(
+                time.perf_counter()
+            )
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(
+            connection, cursor, statement, parameters, context, executemany
+        ):
+            start_time = connection.info["query_start_times"].pop()
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            if elapsed_ms >= threshold_ms:
+                logger.warning(
+                    "Consulta lenta (%.0f ms): %s",
+                    elapsed_ms,
+                    " ".join(statement.split()),
+                )
+
+        @event.listens_for(engine, "handle_error")
+        def handle_error(exception_context):
+            connection = exception_context.connection
+            if connection is not None and connection.info.get("query_start_times"):
+                connection.info["query_start_times"].pop()
+
     def __new__(cls):
         if cls._instance is not None:
             return cls._instance
@@ -42,10 +102,14 @@ class Database:
         return cls._engine
 
     @classmethod
-    def get_session(cls, autoflush: bool = True) -> Session:
+    def get_session(
+        cls, autoflush: bool = True, expire_on_commit: bool = True
+    ) -> Session:
         if cls._instance is None:
             cls()
-        return cls._session_factory(autoflush=autoflush)
+        return cls._session_factory(
+            autoflush=autoflush, expire_on_commit=expire_on_commit
+        )
 
     @classmethod
     @contextmanager
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Column, ForeignKey, Integer, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, relationship
 
 from common.model.base_model import BaseModel
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 
 class Companion(BaseModel):
+    __table_args__ = (Index("ix_companion_scheduling_id", "scheduling_id"),)
+
     scheduling_id = Column(
         Integer,
         ForeignKey("scheduling.id", ondelete="CASCADE"),
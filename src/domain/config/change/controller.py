@@ -5,7 +5,11 @@ from common.controller.base_entity_controller import ModelType
 from common.gui.widget.base_change_widget import BaseChangeWidget
 from common.model.column_types.point import Coordinate
 from domain.config.change.widget import ConfigChangeWidget
-from domain.config.model import Config
+from domain.config.model import (
+    Config,
+    OptimizerEngineEnum,
+    TravelTimeProviderEnum,
+)
 
 
 class ConfigChangeController(BaseChangeController[Config]):
@@ -19,6 +23,46 @@ class ConfigChangeController(BaseChangeController[Config]):
         self._widget.distance_matrix_api_key_field.setText(
             entity.distance_matrix_api_key
         )
+        self._widget.vrptw_seconds_per_scheduling_field.setValue(
+            entity.vrptw_seconds_per_scheduling or 0.25
+        )
+        self._widget.vrptw_max_seconds_per_cluster_field.setValue(
+            entity.vrptw_max_seconds_per_cluster or 30
+        )
+        self._widget.vrptw_day_budget_seconds_field.setValue(
+            entity.vrptw_day_budget_seconds or 0
+        )
+        self._widget.vrptw_plateau_seconds_field.setValue(
+            entity.vrptw_plateau_seconds
+            if entity.vrptw_plateau_seconds is not None
+            else 2
+        )
+        self._widget.set_optimizer_engine(
+            entity.optimizer_engine or OptimizerEngineEnum.CLUSTERS.name
+        )
+        self._widget.max_trips_per_vehicle_field.setValue(
+            entity.max_trips_per_vehicle or 3
+        )
+        self._widget.drop_penalty_field.setValue(entity.drop_penalty or 0)
+        self._widget.set_travel_time_provider(
+            entity.travel_time_provider or TravelTimeProviderEnum.GOOGLE_MAPS.name
+        )
+        self._widget.osrm_url_field.setText(entity.osrm_url or "")
+        self._widget.travel_time_road_factor_field.setValue(
+            entity.travel_time_road_factor or 1.3
+        )
+        self._widget.travel_time_average_speed_field.setValue(
+            entity.travel_time_average_speed or 40
+        )
+        self._widget.travel_time_matrix_file_path_field.setText(
+            entity.travel_time_matrix_file_path or ""
+        )
+        self._widget.travel_time_cache_ttl_days_field.setValue(
+            entity.travel_time_cache_ttl_days or 0
+        )
+        self._widget.travel_time_cache_time_bucket_hours_field.setValue(
+            entity.travel_time_cache_time_bucket_hours or 0
+        )
         if entity.departure_coordinates:
             self._widget.departure_coordinates_field.setText(
                 f"{entity.departure_coordinates.latitude}, {entity.departure_coordinates.longitude}"
@@ -49,13 +93,44 @@ class ConfigChangeController(BaseChangeController[Config]):
             self._widget.show_info_pop_up("Atenção", "O minpts é obrigatório")
             return None
 
+        travel_time_provider = self._widget.get_travel_time_provider()
+
         distance_matrix_api_key = self._widget.distance_matrix_api_key_field.text()
-        if not distance_matrix_api_key:
+        if (
+            not distance_matrix_api_key
+            and travel_time_provider == TravelTimeProviderEnum.GOOGLE_MAPS.name
+        ):
             self._widget.show_info_pop_up(
                 "Atenção", "A chave da distance matrix api é obrigatório"
             )
             return None
 
+        travel_time_matrix_file_path = (
+            self._widget.travel_time_matrix_file_path_field.text().strip()
+        )
+        if (
+            not travel_time_matrix_file_path
+            and travel_time_provider == TravelTimeProviderEnum.FILE.name
+        ):
+            self._widget.show_info_pop_up(
+                "Atenção", "O arquivo da matriz de tempos é obrigatório"
+            )
+            return None
+
+        osrm_url = self._widget.osrm_url_field.text().strip()
+        if not osrm_url and travel_time_provider == TravelTimeProviderEnum.OSRM.name:
+            self._widget.show_info_pop_up(
+                "Atenção", "O endereço do servidor OSRM é obrigatório"
+            )
+            return None
+
+        travel_time_cache_ttl_days = (
+            self._widget.travel_time_cache_ttl_days_field.value()
+        )
+        travel_time_cache_time_bucket_hours = (
+            self._widget.travel_time_cache_time_bucket_hours_field.value()
+        )
+
         if self._widget.departure_coordinates_field.text():
             coordinates = Coordinate(
                 latitude=self._widget.latitude,
@@ -72,8 +147,30 @@ class ConfigChangeController(BaseChangeController[Config]):
             "body_name": body_name.strip(),
             "eplison": eplison,
             "minpts": minpts,
+            "vrptw_seconds_per_scheduling": (
+                self._widget.vrptw_seconds_per_scheduling_field.value()
+            ),
+            "vrptw_max_seconds_per_cluster": (
+                self._widget.vrptw_max_seconds_per_cluster_field.value()
+            ),
+            "vrptw_day_budget_seconds": (
+                self._widget.vrptw_day_budget_seconds_field.value()
+            ),
+            "vrptw_plateau_seconds": self._widget.vrptw_plateau_seconds_field.value(),
+            "optimizer_engine": self._widget.get_optimizer_engine(),
+            "max_trips_per_vehicle": self._widget.max_trips_per_vehicle_field.value(),
+            "drop_penalty": self._widget.drop_penalty_field.value(),
             "distance_matrix_api_key": distance_matrix_api_key.strip(),
             "departure_coordinates": coordinates,
+            "travel_time_provider": travel_time_provider,
+            "travel_time_road_factor": self._widget.travel_time_road_factor_field.value(),
+            "travel_time_average_speed": (
+                self._widget.travel_time_average_speed_field.value()
+            ),
+            "travel_time_matrix_file_path": travel_time_matrix_file_path or None,
+            "osrm_url": osrm_url or None,
+            "travel_time_cache_ttl_days": travel_time_cache_ttl_days,
+            "travel_time_cache_time_bucket_hours": travel_time_cache_time_bucket_hours,
         }
 
     def _get_widget_instance(self) -> BaseChangeWidget:
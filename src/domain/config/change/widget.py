@@ -4,7 +4,9 @@ from PySide6.QtCore import QUrl
 from PySide6.QtGui import QDesktopServices
 from PySide6.QtWidgets import (
     QApplication,
+    QComboBox,
     QDoubleSpinBox,
+    QFileDialog,
     QFormLayout,
     QGroupBox,
     QHBoxLayout,
@@ -20,7 +22,11 @@ from PySide6.QtWidgets import (
 )
 
 from common.gui.widget.base_change_widget import BaseChangeWidget
-from domain.config.model import Config
+from domain.config.model import (
+    Config,
+    OptimizerEngineEnum,
+    TravelTimeProviderEnum,
+)
 
 
 class ConfigChangeWidget(BaseChangeWidget):
@@ -31,7 +37,7 @@ class ConfigChangeWidget(BaseChangeWidget):
         super().__init__(
             model_class=Config,
             width=600,
-            height=550,
+            height=1040,
             parent=parent,
         )
         self.latitude: Optional[float] = None
@@ -42,6 +48,7 @@ class ConfigChangeWidget(BaseChangeWidget):
 
         layout.addWidget(self._create_report_box())
         layout.addWidget(self._create_roadmap_box())
+        layout.addWidget(self._create_travel_time_box())
 
         return layout
 
@@ -74,6 +81,71 @@ class ConfigChangeWidget(BaseChangeWidget):
         self.minpts_field = QSpinBox()
         roadmap_table_layout.addRow(QLabel("Minpts:"), self.minpts_field)
 
+        self.vrptw_seconds_per_scheduling_field = QDoubleSpinBox()
+        self.vrptw_seconds_per_scheduling_field.setRange(0.01, 60)
+        self.vrptw_seconds_per_scheduling_field.setSingleStep(0.05)
+        self.vrptw_seconds_per_scheduling_field.setDecimals(2)
+        self.vrptw_seconds_per_scheduling_field.setSuffix(" s")
+        roadmap_table_layout.addRow(
+            QLabel("Tempo de busca por agendamento:"),
+            self.vrptw_seconds_per_scheduling_field,
+        )
+
+        self.vrptw_max_seconds_per_cluster_field = QSpinBox()
+        self.vrptw_max_seconds_per_cluster_field.setRange(1, 3600)
+        self.vrptw_max_seconds_per_cluster_field.setSuffix(" s")
+        roadmap_table_layout.addRow(
+            QLabel("Tempo máximo por agrupamento:"),
+            self.vrptw_max_seconds_per_cluster_field,
+        )
+
+        self.vrptw_day_budget_seconds_field = QSpinBox()
+        self.vrptw_day_budget_seconds_field.setRange(0, 86400)
+        self.vrptw_day_budget_seconds_field.setSuffix(" s")
+        self.vrptw_day_budget_seconds_field.setSpecialValueText("Sem limite")
+        roadmap_table_layout.addRow(
+            QLabel("Tempo total de otimização do dia:"),
+            self.vrptw_day_budget_seconds_field,
+        )
+
+        self.vrptw_plateau_seconds_field = QDoubleSpinBox()
+        self.vrptw_plateau_seconds_field.setRange(0, 600)
+        self.vrptw_plateau_seconds_field.setSingleStep(0.5)
+        self.vrptw_plateau_seconds_field.setDecimals(1)
+        self.vrptw_plateau_seconds_field.setSuffix(" s")
+        self.vrptw_plateau_seconds_field.setSpecialValueText("Desativado")
+        roadmap_table_layout.addRow(
+            QLabel("Parar busca sem melhora após:"),
+            self.vrptw_plateau_seconds_field,
+        )
+
+        self.optimizer_engine_field = QComboBox()
+        for engine in OptimizerEngineEnum:
+            self.optimizer_engine_field.addItem(engine.value, engine.name)
+        roadmap_table_layout.addRow(
+            QLabel("Modelo de otimização:"), self.optimizer_engine_field
+        )
+
+        self.max_trips_per_vehicle_field = QSpinBox()
+        self.max_trips_per_vehicle_field.setRange(1, 20)
+        roadmap_table_layout.addRow(
+            QLabel("Viagens por veículo no dia:"), self.max_trips_per_vehicle_field
+        )
+
+        self.drop_penalty_field = QSpinBox()
+        self.drop_penalty_field.setRange(0, 86400)
+        self.drop_penalty_field.setSuffix(" s")
+        self.drop_penalty_field.setSpecialValueText("Atender todos")
+        roadmap_table_layout.addRow(
+            QLabel("Penalidade por agendamento não atendido:"),
+            self.drop_penalty_field,
+        )
+
+        self.optimizer_engine_field.currentIndexChanged.connect(
+            self._on_optimizer_engine_changed
+        )
+        self._on_optimizer_engine_changed()
+
         self.distance_matrix_api_key_field = QLineEdit()
         roadmap_table_layout.addRow(
             QLabel("Chave da Distance Matrix API:"),
@@ -130,6 +202,127 @@ class ConfigChangeWidget(BaseChangeWidget):
 
         return roadmap_box
 
+    def _create_travel_time_box(self):
+        travel_time_table_layout = QFormLayout()
+
+        self.travel_time_provider_field = QComboBox()
+        for provider in TravelTimeProviderEnum:
+            self.travel_time_provider_field.addItem(provider.value, provider.name)
+        travel_time_table_layout.addRow(
+            QLabel("Fonte dos tempos de viagem:"), self.travel_time_provider_field
+        )
+
+        self.osrm_url_field = QLineEdit()
+        self.osrm_url_field.setPlaceholderText("http://localhost:5000")
+        travel_time_table_layout.addRow(
+            QLabel("Endereço do servidor OSRM:"), self.osrm_url_field
+        )
+
+        self.travel_time_road_factor_field = QDoubleSpinBox()
+        self.travel_time_road_factor_field.setRange(1, 5)
+        self.travel_time_road_factor_field.setSingleStep(0.05)
+        self.travel_time_road_factor_field.setDecimals(2)
+        travel_time_table_layout.addRow(
+            QLabel("Fator de correção da estrada:"),
+            self.travel_time_road_factor_field,
+        )
+
+        self.travel_time_average_speed_field = QDoubleSpinBox()
+        self.travel_time_average_speed_field.setRange(1, 200)
+        self.travel_time_average_speed_field.setDecimals(1)
+        self.travel_time_average_speed_field.setSuffix(" km/h")
+        travel_time_table_layout.addRow(
+            QLabel("Velocidade média:"), self.travel_time_average_speed_field
+        )
+
+        file_container = QWidget()
+        file_layout = QHBoxLayout(file_container)
+        file_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.travel_time_matrix_file_path_field = QLineEdit()
+        self.travel_time_matrix_file_path_field.setPlaceholderText("arquivo .csv")
+        file_layout.addWidget(self.travel_time_matrix_file_path_field, 1)
+
+        self.travel_time_matrix_file_button = QPushButton("Selecionar")
+        self.travel_time_matrix_file_button.clicked.connect(
+            self._select_travel_time_matrix_file
+        )
+        file_layout.addWidget(self.travel_time_matrix_file_button)
+
+        travel_time_table_layout.addRow(
+            QLabel("Arquivo da matriz de tempos:"), file_container
+        )
+
+        self.travel_time_cache_ttl_days_field = QSpinBox()
+        self.travel_time_cache_ttl_days_field.setRange(0, 3650)
+        self.travel_time_cache_ttl_days_field.setSuffix(" dias")
+        self.travel_time_cache_ttl_days_field.setSpecialValueText("Sem expiração")
+        travel_time_table_layout.addRow(
+            QLabel("Validade do cache de tempos de viagem:"),
+            self.travel_time_cache_ttl_days_field,
+        )
+
+        self.travel_time_cache_time_bucket_hours_field = QSpinBox()
+        self.travel_time_cache_time_bucket_hours_field.setRange(0, 24)
+        self.travel_time_cache_time_bucket_hours_field.setSuffix(" horas")
+        self.travel_time_cache_time_bucket_hours_field.setSpecialValueText(
+            "Desativadas"
+        )
+        travel_time_table_layout.addRow(
+            QLabel("Faixas de horário do cache:"),
+            self.travel_time_cache_time_bucket_hours_field,
+        )
+
+        travel_time_box = QGroupBox("Configurações dos Tempos de Viagem")
+        travel_time_box.setLayout(travel_time_table_layout)
+
+        self.travel_time_provider_field.currentIndexChanged.connect(
+            self._on_travel_time_provider_changed
+        )
+        self._on_travel_time_provider_changed()
+
+        return travel_time_box
+
+    def get_optimizer_engine(self) -> str:
+        return self.optimizer_engine_field.currentData()
+
+    def set_optimizer_engine(self, engine: str) -> None:
+        index = self.optimizer_engine_field.findData(engine)
+        self.optimizer_engine_field.setCurrentIndex(max(index, 0))
+
+    def _on_optimizer_engine_changed(self) -> None:
+        is_global = self.get_optimizer_engine() == OptimizerEngineEnum.GLOBAL.name
+        self.max_trips_per_vehicle_field.setEnabled(is_global)
+        self.drop_penalty_field.setEnabled(is_global)
+
+    def get_travel_time_provider(self) -> str:
+        return self.travel_time_provider_field.currentData()
+
+    def set_travel_time_provider(self, provider: str) -> None:
+        index = self.travel_time_provider_field.findData(provider)
+        self.travel_time_provider_field.setCurrentIndex(max(index, 0))
+
+    def _on_travel_time_provider_changed(self) -> None:
+        provider = self.get_travel_time_provider()
+        is_osrm = provider == TravelTimeProviderEnum.OSRM.name
+        is_haversine = provider == TravelTimeProviderEnum.HAVERSINE.name
+        is_file = provider == TravelTimeProviderEnum.FILE.name
+        self.osrm_url_field.setEnabled(is_osrm)
+        self.travel_time_road_factor_field.setEnabled(is_haversine)
+        self.travel_time_average_speed_field.setEnabled(is_haversine)
+        self.travel_time_matrix_file_path_field.setEnabled(is_file)
+        self.travel_time_matrix_file_button.setEnabled(is_file)
+
+    def _select_travel_time_matrix_file(self) -> None:
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Selecionar matriz de tempos",
+            self.travel_time_matrix_file_path_field.text(),
+            "Arquivos CSV (*.csv)",
+        )
+        if file_path:
+            self.travel_time_matrix_file_path_field.setText(file_path)
+
     def _paste_coordinates(self) -> None:
         clipboard = QApplication.clipboard()
         mime_data = clipboard.mimeData()
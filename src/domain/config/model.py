@@ -1,7 +1,22 @@
+from enum import Enum
+
 from sqlalchemy import Column, Float, Integer, String
 
 from common.model.base_model import BaseModel
 from common.model.column_types.point import Coordinate, Point
+from common.model.reference_cache import ReferenceCache
+
+
+class TravelTimeProviderEnum(str, Enum):
+    GOOGLE_MAPS = "Google Distance Matrix API"
+    OSRM = "Servidor OSRM próprio"
+    HAVERSINE = "Estimativa offline (distância em linha reta)"
+    FILE = "Matriz de tempos em arquivo CSV"
+
+
+class OptimizerEngineEnum(str, Enum):
+    CLUSTERS = "Um modelo por agrupamento"
+    GLOBAL = "Modelo único para o dia todo"
 
 
 class Config(BaseModel):
@@ -11,6 +26,20 @@ class Config(BaseModel):
     minpts = Column(Integer, nullable=True)
     distance_matrix_api_key = Column(String(), nullable=True)
     departure_coordinates = Column(Point, nullable=True)
+    travel_time_cache_ttl_days = Column(Integer, nullable=True)
+    travel_time_cache_time_bucket_hours = Column(Integer, nullable=True)
+    travel_time_provider = Column(String(), nullable=True)
+    travel_time_road_factor = Column(Float, nullable=True)
+    travel_time_average_speed = Column(Float, nullable=True)
+    travel_time_matrix_file_path = Column(String(), nullable=True)
+    osrm_url = Column(String(), nullable=True)
+    vrptw_seconds_per_scheduling = Column(Float, nullable=True)
+    vrptw_max_seconds_per_cluster = Column(Integer, nullable=True)
+    vrptw_day_budget_seconds = Column(Integer, nullable=True)
+    vrptw_plateau_seconds = Column(Float, nullable=True)
+    optimizer_engine = Column(String(), nullable=True)
+    max_trips_per_vehicle = Column(Integer, nullable=True)
+    drop_penalty = Column(Integer, nullable=True)
 
     def __init__(
         self,
@@ -20,6 +49,20 @@ class Config(BaseModel):
         minpts: int = None,
         distance_matrix_api_key: str = None,
         departure_coordinates: Coordinate = None,
+        travel_time_cache_ttl_days: int = None,
+        travel_time_cache_time_bucket_hours: int = None,
+        travel_time_provider: str = TravelTimeProviderEnum.GOOGLE_MAPS.name,
+        travel_time_road_factor: float = None,
+        travel_time_average_speed: float = None,
+        travel_time_matrix_file_path: str = None,
+        osrm_url: str = None,
+        vrptw_seconds_per_scheduling: float = None,
+        vrptw_max_seconds_per_cluster: int = None,
+        vrptw_day_budget_seconds: int = None,
+        vrptw_plateau_seconds: float = None,
+        optimizer_engine: str = OptimizerEngineEnum.CLUSTERS.name,
+        max_trips_per_vehicle: int = None,
+        drop_penalty: int = None,
     ):
         super().__init__()
         self.department_name = department_name
@@ -28,6 +71,20 @@ class Config(BaseModel):
         self.minpts = minpts
         self.distance_matrix_api_key = distance_matrix_api_key
         self.departure_coordinates = departure_coordinates
+        self.travel_time_cache_ttl_days = travel_time_cache_ttl_days
+        self.travel_time_cache_time_bucket_hours = travel_time_cache_time_bucket_hours
+        self.travel_time_provider = travel_time_provider
+        self.travel_time_road_factor = travel_time_road_factor
+        self.travel_time_average_speed = travel_time_average_speed
+        self.travel_time_matrix_file_path = travel_time_matrix_file_path
+        self.osrm_url = osrm_url
+        self.vrptw_seconds_per_scheduling = vrptw_seconds_per_scheduling
+        self.vrptw_max_seconds_per_cluster = vrptw_max_seconds_per_cluster
+        self.vrptw_day_budget_seconds = vrptw_day_budget_seconds
+        self.vrptw_plateau_seconds = vrptw_plateau_seconds
+        self.optimizer_engine = optimizer_engine
+        self.max_trips_per_vehicle = max_trips_per_vehicle
+        self.drop_penalty = drop_penalty
 
     def get_description(self) -> str:
         return self.get_static_description()
@@ -38,4 +95,6 @@ class Config(BaseModel):
 
     @classmethod
     def get_config(cls) -> "Config":
-        return Config.get_by_id(1)
+        # lida a cada formulário e relatório; vem do cache de referência e
+        # não deve ser alterada diretamente
+        return ReferenceCache.get_by_id(Config, 1)
@@ -1,4 +1,4 @@
-from typing import List
+from sqlalchemy import Select
 
 from common.gui.field.combo_box import ComboBox
 from domain.driver.model import Driver
@@ -6,7 +6,9 @@ from domain.driver.model import Driver
 
 class ActiveDriversComboBox(ComboBox[Driver]):
     def __init__(self, default_none: bool = True, parent=None):
-        super().__init__(parent, model_class=Driver, default_none=default_none)
+        super().__init__(
+            parent, model_class=Driver, default_none=default_none, projection=True
+        )
 
-    def _list_for_fill(self) -> List[Driver]:
-        return Driver.query().filter(Driver.active == True).all()  # noqa: E712
+    def _get_fill_query(self) -> Select:
+        return Driver.query().filter(Driver.active == True)  # noqa: E712
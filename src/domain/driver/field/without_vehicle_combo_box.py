@@ -1,4 +1,4 @@
-from typing import List
+from sqlalchemy import Select
 
 from common.gui.field.combo_box import ComboBox
 from domain.driver.model import Driver
@@ -7,19 +7,17 @@ from domain.vehicle.model import Vehicle
 
 class DriversWithoutVehicleComboBox(ComboBox[Driver]):
     def __init__(self, default_none: bool = True, parent=None):
-        super().__init__(parent, model_class=Driver, default_none=default_none)
+        super().__init__(
+            parent, model_class=Driver, default_none=default_none, projection=True
+        )
 
-    def _list_for_fill(self) -> List[Driver]:
-        return (
-            Driver.query()
-            .filter(
-                Driver.active == True,  # noqa: E712
-                ~Driver.id.in_(
-                    Vehicle.query()
-                    .filter(Vehicle.active == True)  # noqa: E712
-                    .with_entities(Vehicle.default_driver_id)
-                    .filter(Vehicle.default_driver_id != None)  # noqa: E711
-                ),
-            )
-            .all()
+    def _get_fill_query(self) -> Select:
+        return Driver.query().filter(
+            Driver.active == True,  # noqa: E712
+            ~Driver.id.in_(
+                Vehicle.query()
+                .filter(Vehicle.active == True)  # noqa: E712
+                .with_entities(Vehicle.default_driver_id)
+                .filter(Vehicle.default_driver_id != None)  # noqa: E711
+            ),
         )
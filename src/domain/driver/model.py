@@ -5,18 +5,32 @@ from typing import TYPE_CHECKING, Any, List, Optional
 if TYPE_CHECKING:
     from domain.vehicle.model import Vehicle
 
-from sqlalchemy import Boolean, Column, Select, String
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import Boolean, Column, Index, Select, String
+from sqlalchemy.orm import Mapped, relationship, validates
 
 from common.model.base_model import BaseModel
+from common.model.text_search import TextSearch
 from common.utils.string import StringUtils
 
 
 class Driver(BaseModel):
+    __table_args__ = (
+        Index(
+            "ix_driver_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
     name = Column(String(), nullable=False, info={"title": "Nome"})
     cpf = Column(String(11), nullable=False, info={"title": "CPF"})
     registration_number = Column(String, nullable=False, info={"title": "Registro"})
     active = Column(Boolean, nullable=False, default=True, info={"title": "Ativo?"})
+    # nome normalizado (minúsculas e sem acentos) usado na busca textual
+    search_text = Column(
+        String(), nullable=False, server_default="", info={"list": False}
+    )
 
     default_from_vehicle: Mapped[Optional["Vehicle"]] = relationship(
         "Vehicle",
@@ -39,6 +53,11 @@ class Driver(BaseModel):
         self.registration_number = registration_number
         self.active = active
 
+    @validates("name")
+    def _validate_name(self, key: str, name: Optional[str]) -> Optional[str]:
+        self.search_text = StringUtils.normalize_for_search(name)
+        return name
+
     def format_cpf(self) -> Optional[str]:
         return StringUtils.format_cpf(self.cpf)
 
@@ -71,7 +90,12 @@ class Driver(BaseModel):
 
     @classmethod
     def apply_text_search_filter(cls, query: Select, search_text: str) -> Select:
-        text_parts = search_text.split(" ")
-        for text_part in text_parts:
-            query = query.filter(cls.name.ilike(f"%{text_part}%"))
-        return query
+        return TextSearch.apply_filter(query, search_text, cls.search_text)
+
+    @classmethod
+    def apply_ranked_text_search(cls, query: Select, search_text: str) -> Select:
+        return TextSearch.apply_ranking(
+            cls.apply_text_search_filter(query, search_text),
+            search_text,
+            cls.search_text,
+        )
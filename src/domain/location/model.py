@@ -1,18 +1,43 @@
-from sqlalchemy import Column, Select, String, and_
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Column, Index, Select, String
+from sqlalchemy.orm import validates
 
 from common.model.base_model import BaseModel
 from common.model.column_types.point import Coordinate, Point
+from common.model.text_search import TextSearch
+from common.utils.string import StringUtils
 
 
 class Location(BaseModel):
+    __table_args__ = (
+        Index(
+            "ix_location_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
     description = Column(String(), nullable=False, info={"title": "Descrição"})
     coordinates = Column(Point, nullable=False, info={"list": False})
+    # descrição normalizada (minúsculas e sem acentos) usada na busca textual
+    search_text = Column(
+        String(), nullable=False, server_default="", info={"list": False}
+    )
 
     def __init__(self, description: str = None, coordinates: Coordinate = None):
         super().__init__()
         self.description = description
         self.coordinates = coordinates
 
+    @validates("description")
+    def _validate_description(
+        self, key: str, description: Optional[str]
+    ) -> Optional[str]:
+        self.search_text = StringUtils.normalize_for_search(description)
+        return description
+
     def get_description(self) -> str:
         return self.description
 
@@ -22,11 +47,18 @@ class Location(BaseModel):
 
     @classmethod
     def apply_text_search_filter(cls, query: Select, search_text: str) -> Select:
-        text_parts = search_text.split(" ")
-        search_conditions = []
-        for text_part in text_parts:
-            text_part = text_part.strip()
-            if not text_part:
-                continue
-            search_conditions.append(cls.description.ilike(f"%{text_part}%"))
-        return query.filter(and_(*search_conditions))
+        return TextSearch.apply_filter(query, search_text, cls.search_text)
+
+    @classmethod
+    def get_search_index_columns(
+        cls,
+    ) -> Optional[Tuple[Column, Optional[Column], List[Column]]]:
+        return cls.search_text, None, [cls.description]
+
+    @classmethod
+    def apply_ranked_text_search(cls, query: Select, search_text: str) -> Select:
+        return TextSearch.apply_ranking(
+            cls.apply_text_search_filter(query, search_text),
+            search_text,
+            cls.search_text,
+        )
@@ -1,15 +1,36 @@
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
-from sqlalchemy import Column, Select, String, and_
+from sqlalchemy import Column, Index, Select, String
+from sqlalchemy.orm import validates
 
 from common.model.base_model import BaseModel
+from common.model.text_search import TextSearch
 from common.utils.string import StringUtils
 
 
 class Patient(BaseModel):
+    __table_args__ = (
+        Index(
+            "ix_patient_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_patient_cpf_trgm",
+            "cpf",
+            postgresql_using="gin",
+            postgresql_ops={"cpf": "gin_trgm_ops"},
+        ),
+    )
+
     name = Column(String(), nullable=False, info={"title": "Nome"})
     cpf = Column(String(11), nullable=False, info={"title": "CPF"})
     phone = Column(String(11), nullable=True, info={"title": "Telefone"})
+    # nome normalizado (minúsculas e sem acentos) usado na busca textual
+    search_text = Column(
+        String(), nullable=False, server_default="", info={"list": False}
+    )
 
     def __init__(self, name: str = None, cpf: str = None, phone: str = None):
         super().__init__()
@@ -17,6 +38,11 @@ class Patient(BaseModel):
         self.cpf = cpf
         self.phone = phone
 
+    @validates("name")
+    def _validate_name(self, key: str, name: Optional[str]) -> Optional[str]:
+        self.search_text = StringUtils.normalize_for_search(name)
+        return name
+
     def format_cpf(self) -> Optional[str]:
         return StringUtils.format_cpf(self.cpf)
 
@@ -40,14 +66,20 @@ class Patient(BaseModel):
 
     @classmethod
     def apply_text_search_filter(cls, query: Select, search_text: str) -> Select:
-        text_parts = search_text.split(" ")
-        search_conditions = []
-        for text_part in text_parts:
-            text_part = text_part.strip()
-            if not text_part:
-                continue
-            if text_part.isdigit():
-                search_conditions.append(cls.cpf.ilike(f"%{text_part}%"))
-            else:
-                search_conditions.append(cls.name.ilike(f"%{text_part}%"))
-        return query.filter(and_(*search_conditions))
+        return TextSearch.apply_filter(
+            query, search_text, cls.search_text, digits_column=cls.cpf
+        )
+
+    @classmethod
+    def get_search_index_columns(
+        cls,
+    ) -> Optional[Tuple[Column, Optional[Column], List[Column]]]:
+        return cls.search_text, cls.cpf, [cls.name, cls.cpf]
+
+    @classmethod
+    def apply_ranked_text_search(cls, query: Select, search_text: str) -> Select:
+        return TextSearch.apply_ranking(
+            cls.apply_text_search_filter(query, search_text),
+            search_text,
+            cls.search_text,
+        )
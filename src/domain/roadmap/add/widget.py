@@ -87,7 +87,7 @@ class RoadmapAddWidget(BaseAddWidget):
         self.driver_combo_box.currentIndexChanged.connect(self._on_driver_changed)
         layout.addRow(QLabel("Motorista:"), self.driver_combo_box)
 
-        self.vehicle_combo_box = ComboBox(model_class=Vehicle)
+        self.vehicle_combo_box = ComboBox(model_class=Vehicle, projection=True)
         layout.addRow(QLabel("Veículo:"), self.vehicle_combo_box)
 
         return layout
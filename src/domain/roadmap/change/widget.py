@@ -78,11 +78,11 @@ class RoadmapChangeWidget(BaseChangeWidget):
         self.date_field.setDisabled(True)
         layout.addRow(QLabel("Data:"), self.date_field)
 
-        self.driver_combo_box = ComboBox(model_class=Driver)
+        self.driver_combo_box = ComboBox(model_class=Driver, projection=True)
         self.driver_combo_box.currentIndexChanged.connect(self._on_driver_changed)
         layout.addRow(QLabel("Motorista:"), self.driver_combo_box)
 
-        self.vehicle_combo_box = ComboBox(model_class=Vehicle)
+        self.vehicle_combo_box = ComboBox(model_class=Vehicle, projection=True)
         layout.addRow(QLabel("Veículo:"), self.vehicle_combo_box)
 
         return layout
@@ -3,11 +3,15 @@ from typing import Any, List, Tuple, Type
 
 from dateutil.relativedelta import relativedelta
 from PySide6.QtCore import QDate, QItemSelection
-from sqlalchemy import Select
 
 from common.controller.base_controller import BaseController
 from common.controller.base_entity_controller import ModelType
-from common.controller.base_list_controller import BaseListController
+from common.controller.base_list_controller import (
+    BaseListController,
+    CountModeEnum,
+    PaginationModeEnum,
+    SortKey,
+)
 from domain.roadmap.add.controller import RoadmapAddController
 from domain.roadmap.change.controller import RoadmapChangeController
 from domain.roadmap.list.widget import RoadmapDateTypeFilterEnum, RoadmapListWidget
@@ -27,7 +31,12 @@ class RoadmapListController(BaseListController[Roadmap]):
     _widget: RoadmapListWidget
 
     def __init__(self, caller: BaseController | None = None):
-        super().__init__(rows_per_page=25, caller=caller)
+        super().__init__(
+            rows_per_page=25,
+            caller=caller,
+            pagination_mode=PaginationModeEnum.KEYSET,
+            count_mode=CountModeEnum.LAZY,
+        )
 
     def _get_widget_instance(self) -> RoadmapListWidget:
         return RoadmapListWidget()
@@ -35,8 +44,8 @@ class RoadmapListController(BaseListController[Roadmap]):
     def _get_model_class(self) -> Type[ModelType]:
         return Roadmap
 
-    def _apply_sorting(self, query: Select) -> Select:
-        return query.order_by(Roadmap.departure.asc())
+    def _get_sort_keys(self) -> List[SortKey]:
+        return [(Roadmap.departure, False), (Roadmap.id, False)]
 
     def _build_list_filters(self) -> List[Any]:
         filters = []
@@ -47,7 +56,8 @@ class RoadmapListController(BaseListController[Roadmap]):
         start_date, end_date = self._build_start_end_date_filters(
             type_filter, year, month, day
         )
-        filters.append(Roadmap.departure.between(start_date, end_date))
+        filters.append(Roadmap.departure >= start_date)
+        filters.append(Roadmap.departure < end_date)
         print(start_date.strftime("%Y-%m-%d %H:%M:%S"))
         print(end_date.strftime("%Y-%m-%d %H:%M:%S"))
         return filters
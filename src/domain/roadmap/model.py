@@ -3,8 +3,8 @@ from __future__ import annotations
 from datetime import date, datetime, time
 from typing import TYPE_CHECKING, Any, List
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Time
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, Time
+from sqlalchemy.orm import Mapped, relationship, selectinload
 
 from common.model.base_model import BaseModel
 from domain.driver.model import Driver
@@ -16,6 +16,8 @@ if TYPE_CHECKING:
 
 
 class Roadmap(BaseModel):
+    __table_args__ = (Index("ix_roadmap_departure", "departure"),)
+
     driver_id = Column(
         Integer,
         ForeignKey("driver.id", ondelete="RESTRICT"),
@@ -74,6 +76,16 @@ class Roadmap(BaseModel):
 
         return result
 
+    @classmethod
+    def get_list_load_options(cls) -> List[Any]:
+        from domain.scheduling.model import Scheduling
+
+        # a quantidade de passageiros percorre agendamentos, pacientes e acompanhantes
+        return super().get_list_load_options() + [
+            selectinload(cls.schedulings).joinedload(Scheduling.patient),
+            selectinload(cls.schedulings).selectinload(Scheduling.companions),
+        ]
+
     @classmethod
     def _get_model_listable_columns(cls) -> List[Column]:
         return super()._get_model_listable_columns() + [
@@ -0,0 +1,261 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import Qt, Signal, QObject
+import numpy as np
+from sqlalchemy.orm import joinedload
+
+from client.travel_time_provider import TravelTimeProvider
+from common.model.column_types.point import Coordinate
+from db import Database
+from domain.driver.model import Driver
+from domain.roadmap.model import Roadmap
+from domain.roadmap.suggest.optimizer import (
+    OptimizationCancelledError,
+    RoadmapOptimizer,
+)
+from domain.roadmap.suggest.travel_time_matrix import TravelTimeMatrixLoader
+from domain.scheduling.model import Scheduling
+from domain.vehicle.model import Vehicle
+from factory.client.travel_time_provider import TravelTimeProviderFactory
+
+
+class RoadmapBatchOptimizer(QObject):
+    """
+    Gera os roteiros de um intervalo de dias. Os agendamentos são carregados
+    em uma única consulta e a matriz de tempos é montada uma vez sobre a união
+    dos locais, e cada dia é resolvido por um RoadmapOptimizer próprio. Como a
+    frota fica livre de um dia para o outro, os dias são independentes.
+
+    Os dias rodam em threads, e a busca do OR-Tools e os seus callbacks
+    precisam do GIL. Por isso os dias só se sobrepõem de fato com
+    parallel_clusters, quando os agrupamentos são resolvidos em processos;
+    sem ele os dias são resolvidos um de cada vez.
+    """
+
+    status_updated = Signal(str)
+
+    def __init__(
+        self,
+        start_date: date,
+        end_date: date,
+        vehicles_relation: List[Vehicle],
+        drivers_relation: List[Driver],
+        on_call_driver_ids: List[int],
+        departure_coordinates: Coordinate,
+        travel_time_cache_ttl_days: int = 0,
+        travel_time_cache_time_bucket_hours: int = 0,
+        travel_time_provider: Optional[TravelTimeProvider] = None,
+        max_parallel_days: int = 0,
+        **optimizer_kwargs: Any,
+    ) -> None:
+        super().__init__()
+        self.__start_date = start_date
+        self.__end_date = end_date
+        self.__vehicles_relation = vehicles_relation
+        self.__drivers_relation = drivers_relation
+        self.__on_call_driver_ids = on_call_driver_ids
+        self.__departure_coordinates = departure_coordinates
+        self.__travel_time_cache_time_bucket_hours = travel_time_cache_time_bucket_hours
+        self.__travel_time_provider = (
+            travel_time_provider or TravelTimeProviderFactory.create()
+        )
+        self.__travel_time_matrix_loader = TravelTimeMatrixLoader(
+            self.__travel_time_provider,
+            (
+                timedelta(days=travel_time_cache_ttl_days)
+                if travel_time_cache_ttl_days
+                else None
+            ),
+            self.__log,
+        )
+        self.__max_parallel_days = max_parallel_days or os.cpu_count() or 1
+        self.__optimizer_kwargs = optimizer_kwargs
+        self.__optimizers: List[RoadmapOptimizer] = []
+        self.__optimizers_lock = threading.Lock()
+        self.__cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self.__cancel_event.set()
+        with self.__optimizers_lock:
+            for optimizer in self.__optimizers:
+                optimizer.cancel()
+
+    def is_cancelled(self) -> bool:
+        return self.__cancel_event.is_set()
+
+    def __check_cancelled(self) -> None:
+        if self.__cancel_event.is_set():
+            raise OptimizationCancelledError("Geração de roteiros cancelada.")
+
+    def __log(self, message: str) -> None:
+        self.__check_cancelled()
+        self.status_updated.emit(message)
+
+    def generate_roadmaps(self) -> List[Roadmap]:
+        roadmaps_by_day = self.generate_roadmaps_by_day()
+        return [
+            roadmap for roadmaps in roadmaps_by_day.values() for roadmap in roadmaps
+        ]
+
+    def generate_roadmaps_by_day(self) -> Dict[date, List[Roadmap]]:
+        self.__log("Iniciando otimização de roteiros do período...")
+        schedulings_by_day = self.__load_schedulings_for_period()
+        matrices_by_day = self.__load_travel_time_matrices(schedulings_by_day)
+        return self.__solve_days(schedulings_by_day, matrices_by_day)
+
+    def __load_schedulings_for_period(self) -> Dict[date, List[Scheduling]]:
+        self.__log("Carregando agendamentos do período...")
+        with Database.session_scope(end_with_commit=False) as session:
+            schedulings = (
+                session.query(Scheduling)
+                .filter(
+                    Scheduling.datetime
+                    >= datetime.combine(self.__start_date, datetime.min.time())
+                )
+                .filter(
+                    Scheduling.datetime
+                    < datetime.combine(
+                        self.__end_date + timedelta(days=1), datetime.min.time()
+                    )
+                )
+                .filter(Scheduling.roadmap_id.is_(None))
+                .options(joinedload(Scheduling.location))
+                .options(joinedload(Scheduling.patient))
+                .options(joinedload(Scheduling.companions))
+                .order_by(Scheduling.datetime)
+                .all()
+            )
+        if not schedulings:
+            raise ValueError(
+                "Nenhum agendamento encontrado para o período selecionado."
+            )
+
+        schedulings_by_day: Dict[date, List[Scheduling]] = {}
+        for scheduling in schedulings:
+            day = scheduling.datetime.date()
+            if day not in schedulings_by_day:
+                schedulings_by_day[day] = []
+            schedulings_by_day[day].append(scheduling)
+        return schedulings_by_day
+
+    def __load_travel_time_matrices(
+        self, schedulings_by_day: Dict[date, List[Scheduling]]
+    ) -> Dict[date, np.ndarray]:
+        # uma matriz por faixa horária do cache (normalmente uma só), montada
+        # sobre os locais distintos de todos os dias da faixa
+        days_by_time_bucket: Dict[int, List[date]] = {}
+        for day, schedulings in schedulings_by_day.items():
+            time_bucket = TravelTimeMatrixLoader.get_time_bucket(
+                schedulings[0].datetime, self.__travel_time_cache_time_bucket_hours
+            )
+            if time_bucket not in days_by_time_bucket:
+                days_by_time_bucket[time_bucket] = []
+            days_by_time_bucket[time_bucket].append(day)
+
+        matrices_by_day: Dict[date, np.ndarray] = {}
+        for time_bucket, days in days_by_time_bucket.items():
+            location_indexes: Dict[Coordinate, int] = {self.__departure_coordinates: 0}
+            for day in days:
+                for scheduling in schedulings_by_day[day]:
+                    location_indexes.setdefault(
+                        scheduling.location.coordinates, len(location_indexes)
+                    )
+
+            matrix = self.__travel_time_matrix_loader.load(
+                list(location_indexes), time_bucket
+            )
+            for day in days:
+                nodes = [0] + [
+                    location_indexes[scheduling.location.coordinates]
+                    for scheduling in schedulings_by_day[day]
+                ]
+                matrices_by_day[day] = matrix[np.ix_(nodes, nodes)]
+
+        return matrices_by_day
+
+    def __solve_days(
+        self,
+        schedulings_by_day: Dict[date, List[Scheduling]],
+        matrices_by_day: Dict[date, np.ndarray],
+    ) -> Dict[date, List[Roadmap]]:
+        days = sorted(schedulings_by_day)
+        roadmaps_by_day: Dict[date, List[Roadmap]] = {}
+        self.__log(f"Gerando roteiros dos dias (0 de {len(days)})...")
+
+        # cada dia abre o próprio pool de processos para os agrupamentos; os
+        # processos são divididos entre os dias simultâneos para não passar de
+        # um por núcleo, e cada dia fica com pelo menos dois
+        cpu_count = os.cpu_count() or 1
+        max_workers = (
+            min(self.__max_parallel_days, len(days), max(cpu_count // 2, 1))
+            if self.__optimizer_kwargs.get("parallel_clusters")
+            else 1
+        )
+        cluster_workers = max(cpu_count // max_workers, 1)
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="roadmap-batch",
+        )
+        try:
+            futures = {
+                executor.submit(
+                    self.__solve_day,
+                    day,
+                    schedulings_by_day[day],
+                    matrices_by_day[day],
+                    cluster_workers,
+                ): day
+                for day in days
+            }
+            for count, future in enumerate(as_completed(futures), start=1):
+                day, roadmaps = future.result()
+                roadmaps_by_day[day] = roadmaps
+                self.__log(f"Gerando roteiros dos dias ({count} de {len(days)})...")
+        except Exception:
+            self.cancel()
+            raise
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return {day: roadmaps_by_day[day] for day in days}
+
+    def __solve_day(
+        self,
+        day: date,
+        schedulings: List[Scheduling],
+        travel_times_matrix: np.ndarray,
+        cluster_workers: int,
+    ) -> Tuple[date, List[Roadmap]]:
+        self.__check_cancelled()
+        optimizer_kwargs = dict(self.__optimizer_kwargs)
+        if cluster_workers == 1:
+            optimizer_kwargs["parallel_clusters"] = False
+        else:
+            optimizer_kwargs["max_parallel_clusters"] = cluster_workers
+        optimizer = RoadmapOptimizer(
+            date=day,
+            vehicles_relation=list(self.__vehicles_relation),
+            drivers_relation=list(self.__drivers_relation),
+            on_call_driver_ids=list(self.__on_call_driver_ids),
+            departure_coordinates=self.__departure_coordinates,
+            travel_time_provider=self.__travel_time_provider,
+            schedulings=schedulings,
+            travel_times_matrix=travel_times_matrix,
+            **optimizer_kwargs,
+        )
+        day_label = day.strftime("%d/%m/%Y")
+        optimizer.status_updated.connect(
+            lambda message: self.status_updated.emit(f"{day_label}: {message}"),
+            Qt.ConnectionType.DirectConnection,
+        )
+        with self.__optimizers_lock:
+            self.__optimizers.append(optimizer)
+        # o cancelamento pode ter chegado antes do otimizador ser registrado
+        if self.__cancel_event.is_set():
+            optimizer.cancel()
+
+        return day, optimizer.generate_roadmaps()
@@ -1,17 +1,19 @@
-from typing import Type
+from typing import List, Optional, Type
 
 from common.controller.base_crud_controller import BaseCRUDController
 from common.controller.base_entity_controller import ModelType
 from common.controller.base_list_controller import BaseListController
 from common.gui.widget.base_crud_widget import BaseCRUDWidget
 from db import Database
-from domain.config.model import Config
+from domain.config.model import Config, OptimizerEngineEnum
 from domain.driver.model import Driver
 from domain.roadmap.model import Roadmap
 from domain.roadmap.suggest.widget import (
     SuggestRoadmapsWidget,
 )
+from domain.roadmap.suggest.batch_optimizer import RoadmapBatchOptimizer
 from domain.roadmap.suggest.optimizer import RoadmapOptimizer
+from domain.roadmap.suggest.worker import RoadmapOptimizerWorker
 from domain.vehicle.model import Vehicle
 from settings import Settings
 
@@ -21,9 +23,37 @@ class SuggestRoadmapsController(BaseCRUDController[Roadmap]):
 
     def __init__(self, caller: BaseListController | None = None) -> None:
         super().__init__(caller)
+        self._worker: Optional[RoadmapOptimizerWorker] = None
+        self._optimizer: Optional[RoadmapOptimizer | RoadmapBatchOptimizer] = None
+        self._widget.cancel_requested.connect(self._on_cancel_requested)
+        self._widget.optimization_finished.connect(self._on_optimization_finished)
+        self._widget.optimization_failed.connect(self._on_optimization_failed)
+        self._widget.optimization_cancelled.connect(self._on_optimization_cancelled)
 
     def execute_action(self) -> None:
-        vehicles_relation = self._widget.vehicles_relation_group_widget.get_relations()
+        vehicles_relation, removed_vehicles = (
+            self._widget.vehicles_relation_group_widget.get_relations()
+        )
+        drivers_relation, removed_drivers = (
+            self._widget.drivers_relation_group_widget.get_relations()
+        )
+        # registros removidos por outra estação depois que a tela foi montada
+        if removed_vehicles or removed_drivers:
+            self._widget.show_warning_pop_up(
+                "Atenção",
+                "Alguns registros foram removidos do cadastro e serão ignorados",
+                "\n".join(
+                    [
+                        f"Veículo: {v.get_combo_box_description()}"
+                        for v in removed_vehicles
+                    ]
+                    + [
+                        f"Motorista: {d.get_combo_box_description()}"
+                        for d in removed_drivers
+                    ]
+                ),
+            )
+
         if len(vehicles_relation) == 0:
             self._widget.show_warning_pop_up(
                 "Atenção",
@@ -31,7 +61,6 @@ class SuggestRoadmapsController(BaseCRUDController[Roadmap]):
             )
             return
 
-        drivers_relation = self._widget.drivers_relation_group_widget.get_relations()
         if len(drivers_relation) == 0:
             self._widget.show_warning_pop_up(
                 "Atenção",
@@ -45,44 +74,122 @@ class SuggestRoadmapsController(BaseCRUDController[Roadmap]):
             if on_call:
                 on_call_driver_ids.append(driver.id)
 
+        start_date = self._widget.date_field.date().toPython()
+        end_date = self._widget.end_date_field.date().toPython()
+        if end_date < start_date:
+            self._widget.show_warning_pop_up(
+                "Atenção",
+                "A data final deve ser igual ou posterior à data inicial",
+            )
+            return
+
+        incremental = self._widget.incremental_field.isChecked()
+        if incremental and end_date > start_date:
+            self._widget.show_warning_pop_up(
+                "Atenção",
+                "O encaixe nos roteiros existentes só pode ser feito para um dia",
+            )
+            return
+
         try:
             config = Config.get_config()
-            optimizer = RoadmapOptimizer(
-                date=self._widget.date_field.date().toPython(),
+            optimizer_kwargs = dict(
                 vehicles_relation=vehicles_relation,
                 drivers_relation=drivers_relation,
                 on_call_driver_ids=on_call_driver_ids,
                 departure_coordinates=config.departure_coordinates,
                 dbscan_epsilon=config.eplison,
                 dbscan_min_samples=config.minpts,
+                travel_time_cache_ttl_days=config.travel_time_cache_ttl_days or 0,
+                travel_time_cache_time_bucket_hours=(
+                    config.travel_time_cache_time_bucket_hours or 0
+                ),
+                parallel_clusters=Settings.OPTIMIZER_PARALLEL_CLUSTERS,
+                vrptw_seconds_per_scheduling=config.vrptw_seconds_per_scheduling
+                or 0.25,
+                vrptw_max_seconds_per_cluster=config.vrptw_max_seconds_per_cluster
+                or 30,
+                vrptw_day_budget_seconds=config.vrptw_day_budget_seconds or 0,
+                vrptw_plateau_seconds=(
+                    config.vrptw_plateau_seconds
+                    if config.vrptw_plateau_seconds is not None
+                    else 2
+                ),
+                engine=config.optimizer_engine or OptimizerEngineEnum.CLUSTERS.name,
+                max_trips_per_vehicle=config.max_trips_per_vehicle or 3,
+                drop_penalty=config.drop_penalty or 0,
             )
+            if end_date > start_date:
+                optimizer = RoadmapBatchOptimizer(
+                    start_date=start_date, end_date=end_date, **optimizer_kwargs
+                )
+            else:
+                optimizer = RoadmapOptimizer(
+                    date=start_date, incremental=incremental, **optimizer_kwargs
+                )
+        except Exception as e:
+            self._widget.show_error_pop_up(
+                "Erro", "Erro ao gerar os roteiros", f"Detalhes: {str(e)}"
+            )
+            return
+
+        optimizer.status_updated.connect(self._widget.update_loading_message)
 
-            optimizer.status_updated.connect(self._on_optimizer_status_updated)
+        self._optimizer = optimizer
+        self._worker = RoadmapOptimizerWorker(optimizer)
+        self._worker.finished.connect(self._widget.optimization_finished)
+        self._worker.failed.connect(self._widget.optimization_failed)
+        self._worker.cancelled.connect(self._widget.optimization_cancelled)
 
-            self._widget.show_loading("Iniciando geração de roteiros...")
+        self._widget.show_loading("Iniciando geração de roteiros...", cancellable=True)
+        self._worker.start()
 
-            optimized_roadmaps = optimizer.generate_roadmaps()
+    def _on_cancel_requested(self) -> None:
+        if self._worker and self._worker.is_running():
+            self._worker.cancel()
 
+    def _on_optimization_finished(self, optimized_roadmaps: List[Roadmap]) -> None:
+        removed_roadmaps = (
+            self._optimizer.get_removed_roadmaps()
+            if isinstance(self._optimizer, RoadmapOptimizer)
+            else []
+        )
+        self._release_worker()
+        try:
             with Database.session_scope() as session:
+                for roadmap in removed_roadmaps:
+                    roadmap.delete(session)
                 for roadmap in optimized_roadmaps:
-                    roadmap.creation_user_id = Settings.get_logged_user().id
+                    if not roadmap.creation_user_id:
+                        roadmap.creation_user_id = Settings.get_logged_user().id
                     roadmap.save(session)
-
-            self._widget.hide_loading()
-            self._widget.show_info_pop_up("Sucesso", "Roteiros gerados com sucesso")
-            if self._caller and hasattr(self._caller, "roadmaps_suggested_for"):
-                self._caller.roadmaps_suggested_for(self._widget.date_field.date())
-            self._widget.close()
-
         except Exception as e:
-            self._widget.hide_loading()
-            self._widget.show_error_pop_up(
-                "Erro", "Erro ao gerar os roteiros", f"Detalhes: {str(e)}"
-            )
+            self._on_optimization_failed(str(e))
             return
 
-    def _on_optimizer_status_updated(self, message: str):
-        self._widget.update_loading_message(message)
+        self._widget.hide_loading()
+        self._widget.show_info_pop_up("Sucesso", "Roteiros gerados com sucesso")
+        if self._caller and hasattr(self._caller, "roadmaps_suggested_for"):
+            self._caller.roadmaps_suggested_for(self._widget.date_field.date())
+        self._widget.close()
+
+    def _on_optimization_failed(self, message: str) -> None:
+        self._release_worker()
+        self._widget.hide_loading()
+        self._widget.show_error_pop_up(
+            "Erro", "Erro ao gerar os roteiros", f"Detalhes: {message}"
+        )
+
+    def _on_optimization_cancelled(self) -> None:
+        self._release_worker()
+        self._widget.hide_loading()
+        self._widget.show_info_pop_up("Atenção", "A geração de roteiros foi cancelada")
+
+    def _release_worker(self) -> None:
+        if self._worker:
+            self._worker.wait()
+            self._worker = None
+        self._optimizer = None
 
     def show(self) -> None:
         self._suggest_relations()
@@ -12,6 +12,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from common.gui.field.combo_box import ComboBox
 from domain.driver.model import Driver
 from domain.roadmap.suggest.drivers_vehicles_relation.drivers_row_widget import (
     DriversRelationRowWidget,
@@ -82,13 +83,22 @@ class DriversRelationGroupWidget(QWidget):
         self.relation_rows.append(new_row)
         new_row.set_data(driver)
 
-    def get_relations(self) -> List[Tuple[Driver, bool]]:
+    def get_relations(self) -> Tuple[List[Tuple[Driver, bool]], List[Driver]]:
+        """
+        Devolve os motoristas marcados, com a indicação de plantão, e os que
+        foram removidos do cadastro depois que a lista foi montada.
+        """
         relations = []
         for row in self.relation_rows:
             relation = row.get_data()
-            if relation:
+            if relation and relation[0] is not None:
                 relations.append(relation)
-        return relations
+        # as linhas devolvem projeções; os motoristas são buscados juntos
+        drivers, missing = ComboBox.hydrate_all(
+            Driver, [driver for driver, _ in relations]
+        )
+        on_call_by_id = {driver.id: on_call for driver, on_call in relations}
+        return [(driver, on_call_by_id[driver.id]) for driver in drivers], missing
 
     def set_relations(self, relations: List[Driver]) -> None:
         for row in self.relation_rows[:]:
@@ -50,7 +50,7 @@ class DriversRelationRowWidget(QWidget):
     def get_data(self) -> Optional[Tuple[Driver, bool]]:
         if self.use_field.isChecked():
             return (
-                self.driver_field.get_current_data(),
+                self.driver_field.get_current_data(hydrate=False),
                 self.on_call_driver_field.isChecked(),
             )
         return None
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
@@ -12,6 +12,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from common.gui.field.combo_box import ComboBox
 from domain.roadmap.suggest.drivers_vehicles_relation.vehicles_row_widget import (
     VehiclesRelationRowWidget,
 )
@@ -79,13 +80,18 @@ class VehiclesRelationGroupWidget(QWidget):
         self.relation_rows.append(new_row)
         new_row.set_data(vehicle)
 
-    def get_relations(self) -> List[Vehicle]:
+    def get_relations(self) -> Tuple[List[Vehicle], List[Vehicle]]:
+        """
+        Devolve os veículos marcados e os que foram removidos do cadastro
+        depois que a lista foi montada.
+        """
         relations = []
         for row in self.relation_rows:
             relation = row.get_data()
             if relation:
                 relations.append(relation)
-        return relations
+        # as linhas devolvem projeções; os veículos são buscados juntos
+        return ComboBox.hydrate_all(Vehicle, relations)
 
     def set_relations(self, relations: List[Vehicle]) -> None:
         for row in self.relation_rows[:]:
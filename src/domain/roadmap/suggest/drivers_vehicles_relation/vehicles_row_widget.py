@@ -39,7 +39,7 @@ class VehiclesRelationRowWidget(QWidget):
 
     def get_data(self) -> Optional[Vehicle]:
         if self.use_field.isChecked():
-            return self.vehicle_field.get_current_data()
+            return self.vehicle_field.get_current_data(hydrate=False)
         return None
 
     def set_data(self, vehicle: Vehicle) -> None:
@@ -1,59 +1,113 @@
-from datetime import date, datetime
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+import logging
+import multiprocessing
+import os
 import random
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
 
 from PySide6.QtCore import Signal, QObject
 import numpy as np
 from dateutil.relativedelta import relativedelta
-from ortools.constraint_solver import pywrapcp
-from ortools.constraint_solver.routing_enums_pb2 import (
-    FirstSolutionStrategy,
-    LocalSearchMetaheuristic,
-)
 from sklearn.cluster import DBSCAN
-from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
+from client.travel_time_provider import TravelTimeProvider
 from common.model.column_types.point import Coordinate
 from common.utils.number import NumberUtils
 from db import Database
+from domain.config.model import OptimizerEngineEnum
 from domain.driver.model import Driver
 from domain.roadmap.model import Roadmap
+from domain.roadmap.suggest.travel_time_matrix import TravelTimeMatrixLoader
+from domain.roadmap.suggest.vrptw import (
+    ClusterProblem,
+    DayProblem,
+    initialize_worker,
+    solve_cluster,
+    solve_cluster_in_worker,
+    solve_day,
+)
 from domain.scheduling.model import Scheduling
 from domain.vehicle.model import Vehicle
-from factory.client.google_maps import GoogleMapsClientFactory
+from factory.client.travel_time_provider import TravelTimeProviderFactory
+
+logger = logging.getLogger(__name__)
 
 
 class DatetimeLocker:
-    class Item:
-        id: int
-        start: datetime
-        end: datetime
-
-        def __init__(
-            self, id: int, start: datetime, end: datetime
-        ) -> None:
-            self.id = id
-            self.start = start
-            self.end = end
+    class Schedule:
+        # períodos de um recurso ordenados pelo início; max_ends[i] é o maior fim
+        # entre os períodos 0..i, o que permite consultar sobreposições com bisect
+        def __init__(self) -> None:
+            self.starts: List[datetime] = []
+            self.ends: List[datetime] = []
+            self.max_ends: List[datetime] = []
+
+        def add(self, start: datetime, end: datetime) -> None:
+            index = bisect_right(self.starts, start)
+            self.starts.insert(index, start)
+            self.ends.insert(index, end)
+            self.max_ends.insert(
+                index, max(self.max_ends[index - 1], end) if index else end
+            )
+            for i in range(index + 1, len(self.max_ends)):
+                max_end = max(self.max_ends[i - 1], self.ends[i])
+                if max_end == self.max_ends[i]:
+                    break
+                self.max_ends[i] = max_end
+
+        def remove(self, start: datetime, end: datetime) -> bool:
+            index = bisect_left(self.starts, start)
+            while index < len(self.starts) and self.starts[index] == start:
+                if self.ends[index] == end:
+                    del self.starts[index]
+                    del self.ends[index]
+                    del self.max_ends[index]
+                    latest_end = self.max_ends[index - 1] if index else None
+                    for i in range(index, len(self.ends)):
+                        if latest_end is None or self.ends[i] > latest_end:
+                            latest_end = self.ends[i]
+                        self.max_ends[i] = latest_end
+                    return True
+                index += 1
+            return False
+
+        def latest_end_starting_before(self, moment: datetime) -> Optional[datetime]:
+            index = bisect_left(self.starts, moment)
+            return self.max_ends[index - 1] if index else None
 
     def __init__(self) -> None:
-        self.__items: List[self.Item] = []
+        self.__schedules: Dict[int, DatetimeLocker.Schedule] = {}
 
     def lock(self, id: int, start: datetime, end: datetime) -> None:
-        self.__items.append(self.Item(id=id, start=start, end=end))
+        if id not in self.__schedules:
+            self.__schedules[id] = self.Schedule()
+        self.__schedules[id].add(start, end)
 
     def unlock(self, id: int) -> None:
-        self.__items = [item for item in self.__items if item.id != id]
+        self.__schedules.pop(id, None)
+
+    def unlock_period(self, id: int, start: datetime, end: datetime) -> None:
+        schedule = self.__schedules.get(id)
+        if schedule:
+            schedule.remove(start, end)
+
+    def count(self, id: int) -> int:
+        schedule = self.__schedules.get(id)
+        return len(schedule.starts) if schedule else 0
 
     def is_locked_for_period(
         self, id: int, start: datetime, end: datetime
     ) -> bool:
-        return any(
-            start < item.end and end > item.start
-            for item in self.__items
-            if item.id == id
-        )
+        schedule = self.__schedules.get(id)
+        if not schedule:
+            return False
+        latest_end = schedule.latest_end_starting_before(end)
+        return latest_end is not None and latest_end > start
 
     def is_free_for_period(
         self, id: int, start: datetime, end: datetime
@@ -61,7 +115,18 @@ class DatetimeLocker:
         return not self.is_locked_for_period(id, start, end)
 
 
+class OptimizationCancelledError(Exception):
+    pass
+
+
 class RoadmapOptimizer(QObject):
+    MIN_CLUSTER_TIME_LIMIT_MS = 100
+    GLOBAL_VEHICLE_FIXED_COST = 3600
+    GLOBAL_NO_DEFAULT_DRIVER_COST = 600
+    GLOBAL_TRAJECTORY_KEY = -1
+    INCREMENTAL_TIME_LIMIT_MS = 1000
+    INCREMENTAL_CANDIDATE_TRIPS = 3
+
     status_updated = Signal(str)
 
     def __init__(
@@ -73,6 +138,21 @@ class RoadmapOptimizer(QObject):
         departure_coordinates: Coordinate,
         dbscan_epsilon: float = 0.5,
         dbscan_min_samples: int = 2,
+        travel_time_cache_ttl_days: int = 0,
+        travel_time_cache_time_bucket_hours: int = 0,
+        travel_time_provider: Optional[TravelTimeProvider] = None,
+        parallel_clusters: bool = False,
+        max_parallel_clusters: int = 0,
+        vrptw_seconds_per_scheduling: float = 0.25,
+        vrptw_max_seconds_per_cluster: int = 30,
+        vrptw_day_budget_seconds: int = 0,
+        vrptw_plateau_seconds: float = 2,
+        engine: str = OptimizerEngineEnum.CLUSTERS.name,
+        max_trips_per_vehicle: int = 3,
+        drop_penalty: int = 0,
+        incremental: bool = False,
+        schedulings: Optional[List[Scheduling]] = None,
+        travel_times_matrix: Optional[np.ndarray] = None,
     ) -> None:
         super().__init__()
         self.__date = date
@@ -85,31 +165,93 @@ class RoadmapOptimizer(QObject):
         self.__departure_coordinates = departure_coordinates
         self.__dbscan_epsilon = dbscan_epsilon
         self.__dbscan_min_samples = dbscan_min_samples
-
-        self.__google_maps_client = GoogleMapsClientFactory.create()
+        self.__travel_time_cache_time_bucket_hours = travel_time_cache_time_bucket_hours
+        self.__travel_time_matrix_loader = TravelTimeMatrixLoader(
+            travel_time_provider or TravelTimeProviderFactory.create(),
+            (
+                timedelta(days=travel_time_cache_ttl_days)
+                if travel_time_cache_ttl_days
+                else None
+            ),
+            self.__log,
+        )
+        # agendamentos e matriz já carregados, quando o dia faz parte de um lote
+        self.__preloaded_schedulings = schedulings
+        self.__preloaded_travel_times_matrix = travel_times_matrix
         self.__schedulings: List[Scheduling] = []
-        self.__driver_schedules: Dict[int, List[Dict[str, datetime]]] = {}
         self.__vehicle_locker = DatetimeLocker()
+        self.__driver_locker = DatetimeLocker()
+        self.__parallel_clusters = parallel_clusters
+        self.__max_parallel_clusters = max_parallel_clusters or os.cpu_count() or 1
+        self.__vrptw_seconds_per_scheduling = vrptw_seconds_per_scheduling
+        self.__vrptw_max_seconds_per_cluster = vrptw_max_seconds_per_cluster
+        self.__vrptw_day_budget_seconds = vrptw_day_budget_seconds
+        self.__vrptw_plateau_seconds = vrptw_plateau_seconds
+        self.__vrptw_started_at = 0.0
+        self.__engine = engine
+        self.__max_trips_per_vehicle = max_trips_per_vehicle
+        self.__drop_penalty = drop_penalty
+        self.__incremental = incremental
+        self.__roadmaps: List[Roadmap] = []
+        self.__removed_roadmaps: List[Roadmap] = []
+        self.__objective_trajectories: Dict[int, List[Tuple[float, int]]] = {}
+        self.__cancel_event = threading.Event()
+        self.__process_cancel_event = None
+
+    def cancel(self) -> None:
+        self.__cancel_event.set()
+        process_cancel_event = self.__process_cancel_event
+        if process_cancel_event is not None:
+            process_cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self.__cancel_event.is_set()
+
+    def get_objective_trajectories(self) -> Dict[int, List[Tuple[float, int]]]:
+        return self.__objective_trajectories
+
+    def get_removed_roadmaps(self) -> List[Roadmap]:
+        return self.__removed_roadmaps
+
+    def __check_cancelled(self) -> None:
+        if self.__cancel_event.is_set():
+            raise OptimizationCancelledError("Geração de roteiros cancelada.")
 
     def __log(self, message: str) -> None:
+        self.__check_cancelled()
         self.status_updated.emit(message)
 
     def generate_roadmaps(self) -> List[Roadmap]:
         """Método principal que gera os roadmaps usando DBSCAN + VRPTW."""
         self.__log("Iniciando otimização de roteiros...")
-        self.__load_schedulings_for_date()
-        self.__load_travel_time_matrix()
-        clusters = self.__perform_dbscan_clustering()
-        roadmaps = self.__process_clusters_with_vrptw(clusters)
+        if self.__incremental:
+            self.__load_roadmaps_for_date()
+        elif self.__preloaded_schedulings is not None:
+            self.__schedulings = self.__preloaded_schedulings
+        else:
+            self.__load_schedulings_for_date()
+        if self.__preloaded_travel_times_matrix is not None:
+            self.__travel_times_matrix = self.__preloaded_travel_times_matrix
+        else:
+            self.__load_travel_time_matrix()
+        if self.__incremental:
+            roadmaps = self.__reoptimize_roadmaps()
+        else:
+            clusters = self.__perform_dbscan_clustering()
+            roadmaps = self.__process_clusters_with_vrptw(clusters)
+            if self.__engine == OptimizerEngineEnum.GLOBAL.name:
+                roadmaps = self.__solve_global_model(roadmaps)
         roadmaps = self.__assign_drivers_to_roadmaps(roadmaps)
         self.__log("Roteiros gerados com sucesso!")
         return roadmaps
 
     def __load_schedulings_for_date(self) -> None:
+        day_start, day_end = self.__get_day_period()
         with Database.session_scope(end_with_commit=False) as session:
             self.__schedulings = (
                 session.query(Scheduling)
-                .filter(func.date(Scheduling.datetime) == self.__date)
+                .filter(Scheduling.datetime >= day_start)
+                .filter(Scheduling.datetime < day_end)
                 .filter(Scheduling.roadmap_id.is_(None))
                 .options(joinedload(Scheduling.location))
                 .options(joinedload(Scheduling.patient))
@@ -119,34 +261,62 @@ class RoadmapOptimizer(QObject):
         if not self.__schedulings:
             raise ValueError("Nenhum agendamento encontrado para o dia selecionado.")
 
-    def __load_travel_time_matrix(self) -> None:
-        total_locations = len(self.__schedulings) + 1
-        self.__travel_times_matrix = np.zeros((total_locations, total_locations))
+    def __load_roadmaps_for_date(self) -> None:
+        day_start, day_end = self.__get_day_period()
+        with Database.session_scope(end_with_commit=False) as session:
+            self.__roadmaps = (
+                session.query(Roadmap)
+                .filter(Roadmap.departure >= day_start)
+                .filter(Roadmap.departure < day_end)
+                .options(
+                    joinedload(Roadmap.schedulings).joinedload(Scheduling.location)
+                )
+                .options(joinedload(Roadmap.schedulings).joinedload(Scheduling.patient))
+                .options(
+                    joinedload(Roadmap.schedulings).joinedload(Scheduling.companions)
+                )
+                .all()
+            )
+            unassigned_schedulings = (
+                session.query(Scheduling)
+                .filter(Scheduling.datetime >= day_start)
+                .filter(Scheduling.datetime < day_end)
+                .filter(Scheduling.roadmap_id.is_(None))
+                .options(joinedload(Scheduling.location))
+                .options(joinedload(Scheduling.patient))
+                .options(joinedload(Scheduling.companions))
+                .all()
+            )
+        self.__schedulings = [
+            scheduling
+            for roadmap in self.__roadmaps
+            for scheduling in roadmap.schedulings
+        ] + unassigned_schedulings
+        if not self.__schedulings:
+            raise ValueError("Nenhum agendamento encontrado para o dia selecionado.")
 
+    def __get_day_period(self) -> Tuple[datetime, datetime]:
+        # intervalo semiaberto sobre a coluna, para que a consulta use os índices
+        day_start = datetime.combine(self.__date, datetime.min.time())
+        return day_start, day_start + timedelta(days=1)
+
+    def __load_travel_time_matrix(self) -> None:
         locations = [self.__departure_coordinates] + [
             scheduling.location.coordinates for scheduling in self.__schedulings
         ]
+        first_scheduling = min(self.__schedulings, key=lambda s: s.datetime)
+        self.__travel_times_matrix = self.__travel_time_matrix_loader.load(
+            locations,
+            TravelTimeMatrixLoader.get_time_bucket(
+                first_scheduling.datetime, self.__travel_time_cache_time_bucket_hours
+            ),
+        )
 
-        count = 0
-        total = total_locations**2
-
-        for i, location in enumerate(locations):
-            for j, other_location in enumerate(locations):
-                if i < j:
-                    travel_time = self.__google_maps_client.get_travel_time_between(
-                        location, other_location
-                    )
-                    self.__travel_times_matrix[i, j] = travel_time
-                elif i > j:
-                    self.__travel_times_matrix[i, j] = self.__travel_times_matrix[j, i]
-
-                count += 1
-                progress = NumberUtils.float_to_str(int(count / total * 10000) / 100)
-                self.__log(f"Calculando matriz de distâncias ({progress}%)...")
-
-    def __perform_dbscan_clustering(self) -> Dict[int, List[Scheduling]]:
+    def __perform_dbscan_clustering(self) -> Dict[int, List[int]]:
+        # os agrupamentos guardam os nós (linhas da matriz de tempos) dos
+        # agendamentos; o nó 0 é o ponto de partida
         if len(self.__schedulings) <= 1:
-            return {0: self.__schedulings}
+            return {0: list(range(1, len(self.__schedulings) + 1))}
 
         self.__log("Agrupando agendamentos por similaridade de espaço e tempo...")
 
@@ -172,72 +342,223 @@ class RoadmapOptimizer(QObject):
         )
         cluster_labels = dbscan.fit_predict(clustering_data)
 
-        clusters: Dict[int, List[Scheduling]] = {}
-        for i, label in enumerate(cluster_labels):
+        clusters: Dict[int, List[int]] = {}
+        for node, label in enumerate(cluster_labels, start=1):
             if label not in clusters:
                 clusters[label] = []
-            clusters[label].append(self.__schedulings[i])
+            clusters[label].append(node)
 
         final_clusters = {}
         cluster_id = 0
 
         count = 0
         total = len(clusters)
-        for label, schedulings in clusters.items():
+        for label, nodes in clusters.items():
             count += 1
             progress = NumberUtils.float_to_str(int(count / total * 10000) / 100)
             self.__log(f"Processando agrupamentos ({progress}%)...")
             if label == -1:
-                for scheduling in schedulings:
-                    final_clusters[cluster_id] = [scheduling]
+                for node in nodes:
+                    final_clusters[cluster_id] = [node]
                     cluster_id += 1
             else:
-                sensitive_schedulings = [s for s in schedulings if s.sensitive_patient]
-                normal_schedulings = [s for s in schedulings if not s.sensitive_patient]
+                sensitive_nodes = [
+                    n for n in nodes if self.__get_scheduling(n).sensitive_patient
+                ]
+                normal_nodes = [
+                    n for n in nodes if not self.__get_scheduling(n).sensitive_patient
+                ]
 
-                for scheduling in sensitive_schedulings:
-                    final_clusters[cluster_id] = [scheduling]
+                for node in sensitive_nodes:
+                    final_clusters[cluster_id] = [node]
                     cluster_id += 1
 
-                if normal_schedulings:
-                    final_clusters[cluster_id] = normal_schedulings
+                if normal_nodes:
+                    final_clusters[cluster_id] = normal_nodes
                     cluster_id += 1
 
         return final_clusters
 
     def __process_clusters_with_vrptw(
-        self, clusters: Dict[int, List[Scheduling]]
+        self, clusters: Dict[int, List[int]]
     ) -> List[Roadmap]:
+        self.__vrptw_started_at = time.monotonic()
+        self.__objective_trajectories = {}
+
+        multi_scheduling_clusters = [s for s in clusters.values() if len(s) > 1]
+        if self.__parallel_clusters and len(multi_scheduling_clusters) > 1:
+            return self.__process_clusters_in_parallel(clusters)
+
         all_roadmaps = []
+        remaining_size = sum(len(s) for s in multi_scheduling_clusters)
 
         count = 0
         total = len(clusters)
-        for _, schedulings in clusters.items():
+        for cluster_id, nodes in clusters.items():
             count += 1
             progress = NumberUtils.float_to_str(int(count / total * 10000) / 100)
             self.__log(f"Executando otimização dos agrupamentos ({progress}%)...")
 
-            if len(schedulings) == 1:
-                roadmap = self.__create_single_scheduling_roadmap(schedulings[0])
+            if len(nodes) == 1:
+                roadmap = self.__create_single_scheduling_roadmap(nodes[0])
                 all_roadmaps.append(roadmap)
             else:
-                cluster_roadmaps = self.__solve_vrptw_for_cluster(schedulings)
+                time_limit_ms = self.__get_cluster_time_limit_ms(
+                    len(nodes), remaining_size
+                )
+                remaining_size -= len(nodes)
+                cluster_roadmaps = self.__solve_vrptw_for_cluster(
+                    cluster_id, nodes, time_limit_ms
+                )
                 if len(cluster_roadmaps) > 0:
                     all_roadmaps.extend(cluster_roadmaps)
 
         return all_roadmaps
 
-    def __create_single_scheduling_roadmap(self, scheduling: Scheduling) -> Roadmap:
-        vehicles = self.__get_available_vehicles_for_cluster([scheduling])
+    def __process_clusters_in_parallel(
+        self, clusters: Dict[int, List[int]]
+    ) -> List[Roadmap]:
+        # os agrupamentos são resolvidos com os veículos livres no início e os
+        # veículos são confirmados no locker depois, na ordem original
+        context = multiprocessing.get_context("spawn")
+        self.__process_cancel_event = context.Event()
+        if self.__cancel_event.is_set():
+            self.__process_cancel_event.set()
+
+        max_workers = min(self.__max_parallel_clusters, len(clusters))
+        remaining_size = sum(len(s) for s in clusters.values() if len(s) > 1)
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=initialize_worker,
+            initargs=(self.__process_cancel_event,),
+        )
+        try:
+            pending: Dict[int, Tuple[List[Vehicle], Future]] = {}
+            for cluster_id, nodes in clusters.items():
+                if len(nodes) == 1:
+                    continue
+                available_vehicles = self.__get_available_vehicles_for_cluster(nodes)
+                if not available_vehicles:
+                    raise ValueError(
+                        f"AVISO: Nenhum veículo disponível para cluster com {len(nodes)} agendamentos"
+                    )
+                time_limit_ms = self.__get_cluster_time_limit_ms(
+                    len(nodes), remaining_size, max_workers
+                )
+                problem = self.__build_cluster_problem(
+                    nodes, available_vehicles, time_limit_ms
+                )
+                pending[cluster_id] = (
+                    available_vehicles,
+                    executor.submit(solve_cluster_in_worker, problem),
+                )
+
+            all_roadmaps = []
+
+            count = 0
+            total = len(clusters)
+            for cluster_id, nodes in clusters.items():
+                count += 1
+                progress = NumberUtils.float_to_str(int(count / total * 10000) / 100)
+                self.__log(f"Executando otimização dos agrupamentos ({progress}%)...")
+
+                if len(nodes) == 1:
+                    roadmap = self.__create_single_scheduling_roadmap(nodes[0])
+                    all_roadmaps.append(roadmap)
+                    continue
+
+                available_vehicles, future = pending[cluster_id]
+                solution = future.result()
+                self.__check_cancelled()
+                if solution is None:
+                    raise ValueError(
+                        f"AVISO: Não foi possível resolver VRPTW para cluster com {len(nodes)} agendamentos"
+                    )
+                self.__record_objective_trajectory(
+                    cluster_id, solution.objective_trajectory
+                )
+
+                cluster_roadmaps = self.__assign_vehicles_to_routes(
+                    [
+                        ([nodes[node - 1] for node in route], available_vehicles[i])
+                        for i, route in enumerate(solution.routes)
+                        if route
+                    ]
+                )
+                if cluster_roadmaps is None:
+                    # algum veículo foi ocupado por outro agrupamento e não há
+                    # substituto: resolve novamente com os veículos ainda livres
+                    cluster_roadmaps = self.__solve_vrptw_for_cluster(
+                        cluster_id,
+                        nodes,
+                        self.__get_cluster_time_limit_ms(len(nodes), remaining_size),
+                    )
+                remaining_size -= len(nodes)
+                all_roadmaps.extend(cluster_roadmaps)
+
+            return all_roadmaps
+        finally:
+            self.__process_cancel_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.__process_cancel_event = None
+
+    def __assign_vehicles_to_routes(
+        self, routes: List[Tuple[List[int], Vehicle]]
+    ) -> Optional[List[Roadmap]]:
+        # confirma o veículo escolhido para cada rota ou, se ele já foi ocupado,
+        # troca por outro livre com capacidade suficiente
+        pending_locker = DatetimeLocker()
+        assignments: List[Tuple[List[int], Vehicle]] = []
+        for nodes, preferred_vehicle in routes:
+            route_nodes = self.__sort_nodes_by_datetime(nodes)
+            departure_time, arrival_time = self.__calculate_departure_and_arrival(
+                route_nodes
+            )
+            passenger_count = sum(
+                self.__get_scheduling(n).get_passenger_count() for n in route_nodes
+            )
+
+            candidates = [preferred_vehicle] + [
+                v
+                for v in self.__get_available_vehicles_for_cluster(route_nodes)
+                if v.capacity >= passenger_count
+            ]
+            vehicle = next(
+                (
+                    v
+                    for v in candidates
+                    if self.__vehicle_locker.is_free_for_period(
+                        v.id, departure_time, arrival_time
+                    )
+                    and pending_locker.is_free_for_period(
+                        v.id, departure_time, arrival_time
+                    )
+                ),
+                None,
+            )
+            if vehicle is None:
+                return None
+
+            pending_locker.lock(vehicle.id, departure_time, arrival_time)
+            assignments.append((route_nodes, vehicle))
+
+        return [
+            self.__create_roadmap_from_route(route_nodes, vehicle)
+            for route_nodes, vehicle in assignments
+        ]
+
+    def __create_single_scheduling_roadmap(self, node: int) -> Roadmap:
+        scheduling = self.__get_scheduling(node)
+        vehicles = self.__get_available_vehicles_for_cluster([node])
         if len(vehicles) == 0:
             raise ValueError(
                 f"AVISO: Nenhum veículo disponível para agendamento {scheduling.datetime}"
             )
         vehicle = vehicles[0]
 
-        scheduling_idx = self.__schedulings.index(scheduling)
-        travel_time_to = self.__travel_times_matrix[0, scheduling_idx + 1]
-        travel_time_from = self.__travel_times_matrix[scheduling_idx + 1, 0]
+        travel_time_to = self.__travel_times_matrix[0, node]
+        travel_time_from = self.__travel_times_matrix[node, 0]
 
         arrival_at_scheduling = scheduling.datetime - relativedelta(minutes=15)
         departure_time = arrival_at_scheduling - relativedelta(
@@ -262,126 +583,374 @@ class RoadmapOptimizer(QObject):
 
         return roadmap
 
-    def __solve_vrptw_for_cluster(self, schedulings: List[Scheduling]) -> List[Roadmap]:
-        if not schedulings:
+    def __solve_vrptw_for_cluster(
+        self, cluster_id: int, nodes: List[int], time_limit_ms: int
+    ) -> List[Roadmap]:
+        if not nodes:
             return []
 
-        scheduling_indices = [self.__schedulings.index(s) + 1 for s in schedulings]
-        num_locations = len(scheduling_indices) + 1
-
-        available_vehicles = self.__get_available_vehicles_for_cluster(schedulings)
+        available_vehicles = self.__get_available_vehicles_for_cluster(nodes)
         if not available_vehicles:
             raise ValueError(
-                f"AVISO: Nenhum veículo disponível para cluster com {len(schedulings)} agendamentos"
+                f"AVISO: Nenhum veículo disponível para cluster com {len(nodes)} agendamentos"
             )
 
-        num_vehicles = min(len(schedulings), len(available_vehicles))
+        problem = self.__build_cluster_problem(nodes, available_vehicles, time_limit_ms)
+        solution = solve_cluster(problem, should_stop=self.__cancel_event.is_set)
+        self.__check_cancelled()
+        if solution is None:
+            raise ValueError(
+                f"AVISO: Não foi possível resolver VRPTW para cluster com {len(nodes)} agendamentos"
+            )
+        self.__record_objective_trajectory(cluster_id, solution.objective_trajectory)
 
-        location_indices = [0] + scheduling_indices
-        travel_matrix = np.zeros((num_locations, num_locations))
-        for i in range(num_locations):
-            for j in range(num_locations):
-                travel_matrix[i, j] = self.__travel_times_matrix[
-                    location_indices[i], location_indices[j]
-                ]
+        roadmaps = []
+        for vehicle_idx, route in enumerate(solution.routes):
+            if route:
+                route_nodes = [nodes[node - 1] for node in route]
+                vehicle = available_vehicles[vehicle_idx]
+                roadmap = self.__create_roadmap_from_route(route_nodes, vehicle)
+                roadmaps.append(roadmap)
+
+        return roadmaps
 
-        manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, 0)
-        routing = pywrapcp.RoutingModel(manager)
-
-        def time_callback(from_index, to_index):
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return int(travel_matrix[from_node, to_node])
-
-        transit_callback_index = routing.RegisterTransitCallback(time_callback)
-        routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
-
-        def demand_callback(from_index):
-            from_node = manager.IndexToNode(from_index)
-            if from_node == 0:
-                return 0
-            scheduling_idx = scheduling_indices[from_node - 1] - 1
-            scheduling: Scheduling = self.__schedulings[scheduling_idx]
-            return scheduling.get_passenger_count()
-
-        demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
-
-        vehicle_capacities = [v.capacity for v in available_vehicles[:num_vehicles]]
-        routing.AddDimensionWithVehicleCapacity(
-            demand_callback_index,
-            0,
-            vehicle_capacities,
-            True,
-            "Capacity",
+    def __record_objective_trajectory(
+        self, key: int, trajectory: List[Tuple[float, int]]
+    ) -> None:
+        # resume a convergência da busca, para calibrar os limites de tempo
+        self.__objective_trajectories[key] = trajectory
+        if not trajectory:
+            return
+        label = (
+            "Modelo do dia"
+            if key == self.GLOBAL_TRAJECTORY_KEY
+            else f"Agrupamento {key}"
+        )
+        seconds = NumberUtils.float_to_str(round(trajectory[-1][0], 2))
+        message = (
+            f"{label}: custo {trajectory[0][1]} -> {trajectory[-1][1]} "
+            f"em {len(trajectory) - 1} melhoras (última aos {seconds} s)"
+        )
+        logger.info(message)
+        self.__log(message)
+
+    def __get_cluster_time_limit_ms(
+        self, cluster_size: int, remaining_size: int, workers: int = 1
+    ) -> int:
+        time_limit = min(
+            cluster_size * self.__vrptw_seconds_per_scheduling,
+            self.__vrptw_max_seconds_per_cluster,
         )
 
-        routing.AddDimension(
-            transit_callback_index,
-            3600,
-            86400,
-            False,
-            "Time",
+        if self.__vrptw_day_budget_seconds:
+            # o que resta do orçamento do dia é dividido entre os agrupamentos
+            # ainda não resolvidos, proporcionalmente ao número de agendamentos
+            elapsed = time.monotonic() - self.__vrptw_started_at
+            remaining_budget = max(self.__vrptw_day_budget_seconds - elapsed, 0)
+            time_limit = min(
+                time_limit,
+                remaining_budget * cluster_size / max(remaining_size, 1) * workers,
+            )
+
+        return max(int(time_limit * 1000), self.MIN_CLUSTER_TIME_LIMIT_MS)
+
+    def __build_cluster_problem(
+        self,
+        nodes: List[int],
+        available_vehicles: List[Vehicle],
+        time_limit_ms: int,
+        initial_routes: Optional[List[List[int]]] = None,
+    ) -> ClusterProblem:
+        num_vehicles = min(len(nodes), len(available_vehicles))
+
+        location_indices = np.array([0] + nodes)
+        travel_matrix = np.ascontiguousarray(
+            self.__travel_times_matrix[np.ix_(location_indices, location_indices)],
+            dtype=np.int64,
         )
-        time_dimension = routing.GetDimensionOrDie("Time")
 
-        for i, scheduling_idx in enumerate(scheduling_indices):
-            index = manager.NodeToIndex(i + 1)
-            scheduling = self.__schedulings[scheduling_idx - 1]
+        return ClusterProblem(
+            travel_matrix=travel_matrix,
+            time_windows=[self.__get_time_window(node) for node in nodes],
+            demands=[0]
+            + [self.__get_scheduling(n).get_passenger_count() for n in nodes],
+            vehicle_capacities=[v.capacity for v in available_vehicles[:num_vehicles]],
+            time_limit_ms=time_limit_ms,
+            plateau_ms=int(self.__vrptw_plateau_seconds * 1000),
+            initial_routes=initial_routes,
+        )
 
-            scheduling_time_seconds = (
-                scheduling.datetime.hour * 3600
-                + scheduling.datetime.minute * 60
-                + scheduling.datetime.second
-            )
+    def __get_time_window(self, node: int) -> Tuple[int, int]:
+        scheduling = self.__get_scheduling(node)
 
-            earliest_arrival = max(0, scheduling_time_seconds - 90 * 60)  # 1h30 antes
-            latest_arrival = scheduling_time_seconds - 15 * 60  # 15 min antes
+        scheduling_time_seconds = (
+            scheduling.datetime.hour * 3600
+            + scheduling.datetime.minute * 60
+            + scheduling.datetime.second
+        )
+
+        earliest_arrival = max(0, scheduling_time_seconds - 90 * 60)  # 1h30 antes
+        latest_arrival = scheduling_time_seconds - 15 * 60  # 15 min antes
+
+        min_travel_time = int(self.__travel_times_matrix[0, node])
+        earliest_arrival = max(earliest_arrival, min_travel_time)
 
-            min_travel_time = int(self.__travel_times_matrix[0, scheduling_idx])
-            earliest_arrival = max(earliest_arrival, min_travel_time)
+        return (earliest_arrival, latest_arrival)
 
-            time_dimension.CumulVar(index).SetRange(earliest_arrival, latest_arrival)
+    def __solve_global_model(self, cluster_roadmaps: List[Roadmap]) -> List[Roadmap]:
+        self.__log("Otimizando todos os roteiros do dia em um único modelo...")
 
-        search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        search_parameters.first_solution_strategy = (
-            FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        vehicles = list(self.__vehicles_relation)
+        node_by_scheduling_id = {
+            scheduling.id: node
+            for node, scheduling in enumerate(self.__schedulings, start=1)
+        }
+
+        trips_by_vehicle_id: Dict[int, List[Roadmap]] = {}
+        for roadmap in sorted(cluster_roadmaps, key=lambda r: r.departure):
+            trips_by_vehicle_id.setdefault(roadmap.vehicle_id, []).append(roadmap)
+        trips_per_vehicle = max(
+            [self.__max_trips_per_vehicle]
+            + [len(trips) for trips in trips_by_vehicle_id.values()]
         )
-        search_parameters.local_search_metaheuristic = (
-            LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+
+        # a solução por agrupamentos é o ponto de partida do modelo global
+        initial_routes: List[List[int]] = [
+            [] for _ in range(len(vehicles) * trips_per_vehicle)
+        ]
+        for vehicle_idx, vehicle in enumerate(vehicles):
+            for trip, roadmap in enumerate(trips_by_vehicle_id.get(vehicle.id, [])):
+                initial_routes[vehicle_idx * trips_per_vehicle + trip] = [
+                    node_by_scheduling_id[s.id] for s in roadmap.schedulings
+                ]
+
+        nodes = range(1, len(self.__schedulings) + 1)
+        problem = DayProblem(
+            travel_matrix=np.ascontiguousarray(
+                self.__travel_times_matrix, dtype=np.int64
+            ),
+            time_windows=[self.__get_time_window(node) for node in nodes],
+            return_service_times=[
+                self.__get_scheduling(node).average_duration.hour * 3600
+                + self.__get_scheduling(node).average_duration.minute * 60
+                + 15 * 60
+                for node in nodes
+            ],
+            demands=[0]
+            + [self.__get_scheduling(node).get_passenger_count() for node in nodes],
+            sensitive=[self.__get_scheduling(node).sensitive_patient for node in nodes],
+            vehicle_capacities=[v.capacity for v in vehicles],
+            vehicle_fixed_costs=[
+                self.GLOBAL_VEHICLE_FIXED_COST
+                + (0 if v.default_driver_id else self.GLOBAL_NO_DEFAULT_DRIVER_COST)
+                for v in vehicles
+            ],
+            trips_per_vehicle=trips_per_vehicle,
+            drop_penalty=self.__drop_penalty,
+            initial_routes=initial_routes,
+            time_limit_ms=self.__get_cluster_time_limit_ms(
+                len(self.__schedulings), len(self.__schedulings)
+            ),
+            plateau_ms=int(self.__vrptw_plateau_seconds * 1000),
         )
-        search_parameters.time_limit.seconds = 30
 
-        solution = routing.SolveWithParameters(search_parameters)
-        if not solution:
-            raise ValueError(
-                f"AVISO: Não foi possível resolver VRPTW para cluster com {len(schedulings)} agendamentos"
-            )
+        solution = solve_day(problem, should_stop=self.__cancel_event.is_set)
+        self.__check_cancelled()
+        if solution is None:
+            return cluster_roadmaps
+        self.__record_objective_trajectory(
+            self.GLOBAL_TRAJECTORY_KEY, solution.objective_trajectory
+        )
 
-        roadmaps = []
-        for vehicle_idx in range(num_vehicles):
-            index = routing.Start(vehicle_idx)
-            route_schedulings = []
-
-            while not routing.IsEnd(index):
-                node_index = manager.IndexToNode(index)
-                if node_index > 0:
-                    scheduling_idx = scheduling_indices[node_index - 1] - 1
-                    route_schedulings.append(self.__schedulings[scheduling_idx])
-                index = solution.Value(routing.NextVar(index))
-
-            if route_schedulings:
-                vehicle = available_vehicles[vehicle_idx]
-                roadmap = self.__create_roadmap_from_route(route_schedulings, vehicle)
-                roadmaps.append(roadmap)
+        routes = [
+            (route, vehicles[trip // trips_per_vehicle])
+            for trip, route in enumerate(solution.routes)
+            if route
+        ]
+        routes.sort(
+            key=lambda r: self.__calculate_departure_and_arrival(
+                self.__sort_nodes_by_datetime(r[0])
+            )[0]
+        )
+
+        # o modelo aproxima a duração das viagens; se a solução não couber nos
+        # horários reais dos veículos, mantém a solução por agrupamentos
+        cluster_vehicle_locker = self.__vehicle_locker
+        self.__vehicle_locker = DatetimeLocker()
+        roadmaps = self.__assign_vehicles_to_routes(routes)
+        if roadmaps is None:
+            self.__vehicle_locker = cluster_vehicle_locker
+            return cluster_roadmaps
+
+        dropped_count = len(self.__schedulings) - sum(len(r) for r, _ in routes)
+        if dropped_count:
+            self.__log(
+                f"{dropped_count} agendamento(s) ficaram sem roteiro na otimização global."
+            )
 
         return roadmaps
 
-    def __get_available_vehicles_for_cluster(
-        self, schedulings: List[Scheduling]
-    ) -> List[Vehicle]:
-        max_capacity_needed = max(s.get_passenger_count() for s in schedulings)
+    def __reoptimize_roadmaps(self) -> List[Roadmap]:
+        self.__log("Ajustando os roteiros existentes...")
+        self.__removed_roadmaps = []
+        node_by_scheduling_id = {
+            scheduling.id: node
+            for node, scheduling in enumerate(self.__schedulings, start=1)
+        }
+
+        # os roteiros mantêm os horários gravados, que podem ter sido ajustados
+        # à mão; só são recalculados quando recebem um novo agendamento ou
+        # quando algum agendamento saiu do período (teve o horário alterado).
+        # Um agendamento com roteiro não pode ser excluído e só deixa o
+        # roteiro pela tela de alteração, onde o período é definido junto
+        trips: List[Tuple[Roadmap, List[int]]] = []
+        for roadmap in self.__roadmaps:
+            nodes = self.__sort_nodes_by_datetime(
+                [node_by_scheduling_id[s.id] for s in roadmap.schedulings]
+            )
+            if not nodes:
+                self.__removed_roadmaps.append(roadmap)
+                continue
+
+            departure_time, arrival_time = self.__calculate_departure_and_arrival(nodes)
+            if (
+                self.__normalize_datetime(departure_time) < roadmap.departure
+                or self.__normalize_datetime(arrival_time) > roadmap.arrival
+            ):
+                self.__update_roadmap_period(roadmap, departure_time, arrival_time)
+            self.__lock_roadmap(roadmap)
+            trips.append((roadmap, nodes))
+
+        new_nodes = self.__sort_nodes_by_datetime(
+            [
+                node
+                for node, scheduling in enumerate(self.__schedulings, start=1)
+                if scheduling.roadmap_id is None
+            ]
+        )
+        total = len(new_nodes)
+        for count, node in enumerate(new_nodes, start=1):
+            progress = NumberUtils.float_to_str(int(count / total * 10000) / 100)
+            self.__log(f"Encaixando novos agendamentos ({progress}%)...")
+
+            if not self.__insert_into_existing_trip(trips, node):
+                roadmap = self.__create_single_scheduling_roadmap(node)
+                trips.append((roadmap, [node]))
+
+        return [roadmap for roadmap, _ in trips]
+
+    def __insert_into_existing_trip(
+        self, trips: List[Tuple[Roadmap, List[int]]], node: int
+    ) -> bool:
+        scheduling = self.__get_scheduling(node)
+        vehicles_by_id = {v.id: v for v in self.__vehicles_relation}
+
+        # as viagens candidatas são ordenadas pelo custo de inserção mais barata
+        candidates = []
+        for trip_idx, (roadmap, nodes) in enumerate(trips):
+            vehicle = vehicles_by_id.get(roadmap.vehicle_id)
+            if vehicle is None or scheduling.sensitive_patient:
+                continue
+            if any(self.__get_scheduling(n).sensitive_patient for n in nodes):
+                continue
+            passenger_count = sum(
+                self.__get_scheduling(n).get_passenger_count() for n in nodes + [node]
+            )
+            if passenger_count > vehicle.capacity:
+                continue
+
+            route = [0] + nodes + [0]
+            insertion_cost, position = min(
+                (
+                    self.__travel_times_matrix[route[i], node]
+                    + self.__travel_times_matrix[node, route[i + 1]]
+                    - self.__travel_times_matrix[route[i], route[i + 1]],
+                    i,
+                )
+                for i in range(len(route) - 1)
+            )
+            candidates.append((insertion_cost, position, trip_idx, vehicle))
+
+        candidates.sort(key=lambda c: (c[0], c[2]))
+        for _, position, trip_idx, vehicle in candidates[
+            : self.INCREMENTAL_CANDIDATE_TRIPS
+        ]:
+            roadmap, nodes = trips[trip_idx]
+
+            initial_route = list(range(1, len(nodes) + 1))
+            initial_route.insert(position, len(nodes) + 1)
+            problem = self.__build_cluster_problem(
+                nodes + [node],
+                [vehicle],
+                self.INCREMENTAL_TIME_LIMIT_MS,
+                initial_routes=[initial_route],
+            )
+            solution = solve_cluster(problem, should_stop=self.__cancel_event.is_set)
+            self.__check_cancelled()
+            if solution is None or len(solution.routes[0]) != len(nodes) + 1:
+                continue
+
+            new_nodes = self.__sort_nodes_by_datetime(nodes + [node])
+            departure_time, arrival_time = self.__calculate_departure_and_arrival(
+                new_nodes
+            )
+            departure = self.__normalize_datetime(departure_time)
+            arrival = self.__normalize_datetime(arrival_time)
+
+            # o período atual do roteiro é liberado enquanto o novo é verificado
+            self.__unlock_roadmap(roadmap)
+            if self.__vehicle_locker.is_free_for_period(
+                vehicle.id, departure, arrival
+            ) and (
+                roadmap.driver_id is None
+                or self.__driver_locker.is_free_for_period(
+                    roadmap.driver_id, departure, arrival
+                )
+            ):
+                roadmap.schedulings.append(scheduling)
+                self.__update_roadmap_period(roadmap, departure_time, arrival_time)
+                self.__lock_roadmap(roadmap)
+                trips[trip_idx] = (roadmap, new_nodes)
+                return True
+
+            self.__lock_roadmap(roadmap)
 
-        departure_time, arrival_time = self.__calculate_departure_and_arrival(schedulings)
+        return False
+
+    def __lock_roadmap(self, roadmap: Roadmap) -> None:
+        self.__vehicle_locker.lock(
+            roadmap.vehicle_id, roadmap.departure, roadmap.arrival
+        )
+        if roadmap.driver_id is not None:
+            self.__driver_locker.lock(
+                roadmap.driver_id, roadmap.departure, roadmap.arrival
+            )
+
+    def __unlock_roadmap(self, roadmap: Roadmap) -> None:
+        self.__vehicle_locker.unlock_period(
+            roadmap.vehicle_id, roadmap.departure, roadmap.arrival
+        )
+        if roadmap.driver_id is not None:
+            self.__driver_locker.unlock_period(
+                roadmap.driver_id, roadmap.departure, roadmap.arrival
+            )
+
+    def __update_roadmap_period(
+        self, roadmap: Roadmap, departure_time: datetime, arrival_time: datetime
+    ) -> None:
+        departure = self.__normalize_datetime(departure_time)
+        arrival = self.__normalize_datetime(arrival_time)
+        if roadmap.departure != departure:
+            roadmap.departure = departure
+        if roadmap.arrival != arrival:
+            roadmap.arrival = arrival
+
+    def __get_available_vehicles_for_cluster(self, nodes: List[int]) -> List[Vehicle]:
+        max_capacity_needed = max(
+            self.__get_scheduling(n).get_passenger_count() for n in nodes
+        )
+
+        departure_time, arrival_time = self.__calculate_departure_and_arrival(nodes)
 
         available_vehicles = [
             v
@@ -397,11 +966,11 @@ class RoadmapOptimizer(QObject):
         return sorted(available_vehicles, key=vehicle_priority, reverse=True)
 
     def __create_roadmap_from_route(
-        self, schedulings: List[Scheduling], vehicle: Vehicle
+        self, nodes: List[int], vehicle: Vehicle
     ) -> Roadmap:
-        schedulings.sort(key=lambda s: s.datetime)
+        nodes = self.__sort_nodes_by_datetime(nodes)
 
-        departure_time, arrival_time = self.__calculate_departure_and_arrival(schedulings)
+        departure_time, arrival_time = self.__calculate_departure_and_arrival(nodes)
 
         self.__vehicle_locker.lock(vehicle.id, departure_time, arrival_time)
 
@@ -411,21 +980,28 @@ class RoadmapOptimizer(QObject):
             departure=self.__normalize_datetime(departure_time),
             arrival=self.__normalize_datetime(arrival_time),
         )
-        roadmap.schedulings = schedulings
+        roadmap.schedulings = [self.__get_scheduling(n) for n in nodes]
 
         return roadmap
 
-    def __calculate_departure_and_arrival(self, schedulings):
-        first_scheduling = schedulings[0]
-        last_scheduling = schedulings[-1]
+    def __get_scheduling(self, node: int) -> Scheduling:
+        return self.__schedulings[node - 1]
+
+    def __sort_nodes_by_datetime(self, nodes: List[int]) -> List[int]:
+        return sorted(nodes, key=lambda n: self.__get_scheduling(n).datetime)
+
+    def __calculate_departure_and_arrival(self, nodes: List[int]):
+        first_node = nodes[0]
+        last_node = nodes[-1]
+        first_scheduling = self.__get_scheduling(first_node)
+        last_scheduling = self.__get_scheduling(last_node)
 
         first_arrival = first_scheduling.datetime - relativedelta(minutes=15)
-        first_scheduling_idx = self.__schedulings.index(first_scheduling)
-        travel_time_to_first = self.__travel_times_matrix[0, first_scheduling_idx + 1]
+        travel_time_to_first = self.__travel_times_matrix[0, first_node]
 
-        if len(schedulings) > 1:
+        if len(nodes) > 1:
             travel_time_to_first += (
-                (len(schedulings) - 1) * 10 * 60
+                (len(nodes) - 1) * 10 * 60
             )
 
         departure_time = first_arrival - relativedelta(
@@ -436,19 +1012,18 @@ class RoadmapOptimizer(QObject):
             hours=last_scheduling.average_duration.hour,
             minutes=last_scheduling.average_duration.minute,
         )
-        last_scheduling_idx = self.__schedulings.index(last_scheduling)
-        travel_time_from_last = self.__travel_times_matrix[last_scheduling_idx + 1, 0]
+        travel_time_from_last = self.__travel_times_matrix[last_node, 0]
         arrival_time = last_end + relativedelta(seconds=int(travel_time_from_last))
         return departure_time,arrival_time
 
     def __assign_drivers_to_roadmaps(self, roadmaps: List[Roadmap]) -> List[Roadmap]:
         self.__log("Atribuindo motoristas aos roteiros que não possuem um...")
-        self.__driver_schedules = {driver.id: [] for driver in self.__drivers_relation}
+        self.__driver_locker = DatetimeLocker()
 
         for roadmap in roadmaps:
             if roadmap.driver_id:
-                self.__driver_schedules[roadmap.driver_id].append(
-                    {"start": roadmap.departure, "end": roadmap.arrival}
+                self.__driver_locker.lock(
+                    roadmap.driver_id, roadmap.departure, roadmap.arrival
                 )
 
         regular_drivers = [
@@ -475,8 +1050,8 @@ class RoadmapOptimizer(QObject):
 
             if assigned_driver:
                 roadmap.driver_id = assigned_driver.id
-                self.__driver_schedules[assigned_driver.id].append(
-                    {"start": roadmap.departure, "end": roadmap.arrival}
+                self.__driver_locker.lock(
+                    assigned_driver.id, roadmap.departure, roadmap.arrival
                 )
 
         return roadmaps
@@ -493,19 +1068,12 @@ class RoadmapOptimizer(QObject):
         if not available_drivers:
             return None
 
-        return min(available_drivers, key=lambda d: len(self.__driver_schedules[d.id]))
+        return min(available_drivers, key=lambda d: self.__driver_locker.count(d.id))
 
     def __is_driver_available(self, roadmap: Roadmap, driver_id: int) -> bool:
-        driver_occupied_times = self.__driver_schedules.get(driver_id, [])
-
-        for occupied_time in driver_occupied_times:
-            if not (
-                roadmap.arrival <= occupied_time["start"]
-                or roadmap.departure >= occupied_time["end"]
-            ):
-                return False
-
-        return True
+        return self.__driver_locker.is_free_for_period(
+            driver_id, roadmap.departure, roadmap.arrival
+        )
 
     def __normalize_datetime(self, dt: datetime) -> datetime:
         return datetime(
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from client.travel_time_provider import TravelTimeProvider
+from common.model.column_types.point import Coordinate
+from common.utils.number import NumberUtils
+from domain.travel_time_cache.model import TravelTimeCache
+
+
+class TravelTimeMatrixLoader:
+    def __init__(
+        self,
+        travel_time_provider: TravelTimeProvider,
+        cache_max_age: Optional[timedelta],
+        log: Callable[[str], None],
+    ) -> None:
+        self.__travel_time_provider = travel_time_provider
+        self.__cache_max_age = cache_max_age
+        self.__log = log
+
+    @staticmethod
+    def get_time_bucket(first_departure: datetime, time_bucket_hours: int) -> int:
+        if not time_bucket_hours:
+            return TravelTimeCache.ALL_DAY_TIME_BUCKET
+        return first_departure.hour // time_bucket_hours
+
+    def load(self, locations: List[Coordinate], time_bucket: int) -> np.ndarray:
+        if not self.__travel_time_provider.cacheable:
+            self.__log("Calculando matriz de distâncias (0%)...")
+            matrix = self.__travel_time_provider.get_travel_time_matrix(
+                locations, locations, on_progress=self.__on_progress
+            )
+            np.fill_diagonal(matrix, 0)
+            return matrix
+
+        rounded_locations = [
+            TravelTimeCache.round_coordinate(location) for location in locations
+        ]
+
+        self.__log("Consultando tempos de viagem já conhecidos...")
+        if self.__cache_max_age:
+            TravelTimeCache.delete_stale(self.__cache_max_age)
+        cached_travel_times = TravelTimeCache.get_travel_times(
+            rounded_locations, time_bucket, self.__cache_max_age
+        )
+
+        matrix = np.zeros((len(locations), len(locations)), dtype=np.int64)
+        missing_origins: Dict[Coordinate, None] = {}
+        missing_destinations: Dict[Coordinate, None] = {}
+        for i, origin in enumerate(rounded_locations):
+            for j, destination in enumerate(rounded_locations):
+                if origin == destination:
+                    continue
+                travel_time = cached_travel_times.get((origin, destination))
+                if travel_time is None:
+                    missing_origins[origin] = None
+                    missing_destinations[destination] = None
+                else:
+                    matrix[i, j] = travel_time
+
+        if not missing_origins:
+            return matrix
+
+        fetched_travel_times = self.__fetch_travel_times(
+            list(missing_origins), list(missing_destinations)
+        )
+        TravelTimeCache.put_travel_times(fetched_travel_times, time_bucket)
+
+        for i, origin in enumerate(rounded_locations):
+            for j, destination in enumerate(rounded_locations):
+                if (origin, destination) in fetched_travel_times:
+                    matrix[i, j] = fetched_travel_times[(origin, destination)]
+
+        return matrix
+
+    def __fetch_travel_times(
+        self, origins: List[Coordinate], destinations: List[Coordinate]
+    ) -> Dict[Tuple[Coordinate, Coordinate], int]:
+        self.__log("Calculando matriz de distâncias (0%)...")
+        matrix = self.__travel_time_provider.get_travel_time_matrix(
+            origins, destinations, on_progress=self.__on_progress
+        )
+        return {
+            (origin, destination): int(matrix[i, j])
+            for i, origin in enumerate(origins)
+            for j, destination in enumerate(destinations)
+            if origin != destination
+        }
+
+    def __on_progress(self, count: int, total: int) -> None:
+        progress = NumberUtils.float_to_str(int(count / total * 10000) / 100)
+        self.__log(f"Calculando matriz de distâncias ({progress}%)...")
@@ -0,0 +1,277 @@
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from ortools.constraint_solver import pywrapcp
+from ortools.constraint_solver.routing_enums_pb2 import (
+    FirstSolutionStrategy,
+    LocalSearchMetaheuristic,
+)
+
+
+@dataclass(frozen=True)
+class ClusterProblem:
+    # o nó 0 é o ponto de partida; os nós 1..n são os agendamentos do agrupamento
+    travel_matrix: np.ndarray
+    time_windows: List[Tuple[int, int]]
+    demands: List[int]
+    vehicle_capacities: List[int]
+    time_limit_ms: int = 30000
+    # interrompe a busca quando o custo não melhora por esse período (0 desativa)
+    plateau_ms: int = 0
+    # rotas de partida por veículo, quando já existe uma solução conhecida
+    initial_routes: Optional[List[List[int]]] = None
+
+
+@dataclass(frozen=True)
+class DayProblem:
+    # o nó 0 é o ponto de partida; os nós 1..n são todos os agendamentos do dia
+    travel_matrix: np.ndarray
+    time_windows: List[Tuple[int, int]]
+    # tempo em que o veículo fica preso ao agendamento antes de poder voltar
+    return_service_times: List[int]
+    demands: List[int]
+    sensitive: List[bool]
+    vehicle_capacities: List[int]
+    vehicle_fixed_costs: List[int]
+    trips_per_vehicle: int
+    # custo de deixar um agendamento de fora (0 obriga a atender todos)
+    drop_penalty: int = 0
+    # rotas de partida por viagem (veículo * trips_per_vehicle + viagem)
+    initial_routes: Optional[List[List[int]]] = None
+    time_limit_ms: int = 30000
+    plateau_ms: int = 0
+
+
+# rotas por veículo, com os nós (1..n) dos agendamentos na ordem de visita
+ClusterRoutes = List[List[int]]
+
+
+@dataclass
+class ClusterSolution:
+    routes: ClusterRoutes
+    # (segundos desde o início da busca, custo) a cada melhora da solução
+    objective_trajectory: List[Tuple[float, int]] = field(default_factory=list)
+
+
+_stop_event = None
+
+
+def initialize_worker(stop_event) -> None:
+    global _stop_event
+    _stop_event = stop_event
+
+
+def solve_cluster_in_worker(problem: ClusterProblem) -> Optional[ClusterSolution]:
+    return solve_cluster(
+        problem, should_stop=_stop_event.is_set if _stop_event is not None else None
+    )
+
+
+def solve_cluster(
+    problem: ClusterProblem, should_stop: Optional[Callable[[], bool]] = None
+) -> Optional[ClusterSolution]:
+    travel_matrix = problem.travel_matrix
+    num_locations = len(travel_matrix)
+    num_vehicles = len(problem.vehicle_capacities)
+
+    manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, 0)
+    routing = pywrapcp.RoutingModel(manager)
+
+    # matrizes registradas diretamente evitam chamar Python a cada arco avaliado
+    transit_callback_index = routing.RegisterTransitMatrix(
+        np.asarray(travel_matrix, dtype=np.int64).tolist()
+    )
+    routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
+
+    demand_callback_index = routing.RegisterUnaryTransitVector(
+        [int(demand) for demand in problem.demands]
+    )
+
+    routing.AddDimensionWithVehicleCapacity(
+        demand_callback_index,
+        0,
+        problem.vehicle_capacities,
+        True,
+        "Capacity",
+    )
+
+    _add_time_dimension(routing, manager, transit_callback_index, problem.time_windows)
+
+    return _solve(
+        routing,
+        manager,
+        num_vehicles,
+        problem.time_limit_ms,
+        problem.plateau_ms,
+        should_stop,
+        problem.initial_routes,
+    )
+
+
+def solve_day(
+    problem: DayProblem, should_stop: Optional[Callable[[], bool]] = None
+) -> Optional[ClusterSolution]:
+    """
+    Modelo único para o dia todo. Cada veículo vira trips_per_vehicle veículos
+    virtuais (viagens) que saem e voltam ao ponto de partida, e cada viagem só
+    começa depois que a anterior do mesmo veículo terminou.
+    """
+    travel_matrix = np.asarray(problem.travel_matrix, dtype=np.int64)
+    num_locations = len(travel_matrix)
+    num_trips = len(problem.vehicle_capacities) * problem.trips_per_vehicle
+
+    manager = pywrapcp.RoutingIndexManager(num_locations, num_trips, 0)
+    routing = pywrapcp.RoutingModel(manager)
+    solver = routing.solver()
+
+    cost_callback_index = routing.RegisterTransitMatrix(travel_matrix.tolist())
+    routing.SetArcCostEvaluatorOfAllVehicles(cost_callback_index)
+
+    # a volta ao ponto de partida inclui a espera pelo fim do agendamento
+    time_matrix = travel_matrix.copy()
+    time_matrix[1:, 0] += np.asarray(problem.return_service_times, dtype=np.int64)
+    time_callback_index = routing.RegisterTransitMatrix(time_matrix.tolist())
+
+    trip_capacities = [
+        capacity
+        for capacity in problem.vehicle_capacities
+        for _ in range(problem.trips_per_vehicle)
+    ]
+    demand_callback_index = routing.RegisterUnaryTransitVector(
+        [int(demand) for demand in problem.demands]
+    )
+    routing.AddDimensionWithVehicleCapacity(
+        demand_callback_index, 0, trip_capacities, True, "Capacity"
+    )
+
+    # um paciente sensitivo ocupa sozinho toda a capacidade desta dimensão
+    solo_capacity = num_locations
+    solo_callback_index = routing.RegisterUnaryTransitVector(
+        [0] + [solo_capacity if sensitive else 1 for sensitive in problem.sensitive]
+    )
+    routing.AddDimension(solo_callback_index, 0, solo_capacity, True, "SoloTrip")
+
+    time_dimension = _add_time_dimension(
+        routing, manager, time_callback_index, problem.time_windows
+    )
+
+    for vehicle_idx, fixed_cost in enumerate(problem.vehicle_fixed_costs):
+        first_trip = vehicle_idx * problem.trips_per_vehicle
+        routing.SetFixedCostOfVehicle(fixed_cost, first_trip)
+
+        for trip in range(first_trip, first_trip + problem.trips_per_vehicle - 1):
+            solver.Add(
+                time_dimension.CumulVar(routing.End(trip))
+                <= time_dimension.CumulVar(routing.Start(trip + 1))
+            )
+            # as viagens de um veículo são usadas em ordem, então o custo fixo
+            # da primeira viagem é o custo de usar o veículo
+            solver.Add(
+                routing.ActiveVehicleVar(trip + 1) <= routing.ActiveVehicleVar(trip)
+            )
+
+    if problem.drop_penalty:
+        for node in range(1, num_locations):
+            routing.AddDisjunction([manager.NodeToIndex(node)], problem.drop_penalty)
+
+    return _solve(
+        routing,
+        manager,
+        num_trips,
+        problem.time_limit_ms,
+        problem.plateau_ms,
+        should_stop,
+        problem.initial_routes,
+    )
+
+
+def _add_time_dimension(
+    routing: pywrapcp.RoutingModel,
+    manager: pywrapcp.RoutingIndexManager,
+    transit_callback_index: int,
+    time_windows: List[Tuple[int, int]],
+) -> pywrapcp.RoutingDimension:
+    routing.AddDimension(
+        transit_callback_index,
+        3600,
+        86400,
+        False,
+        "Time",
+    )
+    time_dimension = routing.GetDimensionOrDie("Time")
+
+    for node, (earliest_arrival, latest_arrival) in enumerate(time_windows, start=1):
+        index = manager.NodeToIndex(node)
+        time_dimension.CumulVar(index).SetRange(earliest_arrival, latest_arrival)
+
+    return time_dimension
+
+
+def _solve(
+    routing: pywrapcp.RoutingModel,
+    manager: pywrapcp.RoutingIndexManager,
+    num_vehicles: int,
+    time_limit_ms: int,
+    plateau_ms: int,
+    should_stop: Optional[Callable[[], bool]],
+    initial_routes: Optional[List[List[int]]] = None,
+) -> Optional[ClusterSolution]:
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.first_solution_strategy = FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    search_parameters.local_search_metaheuristic = (
+        LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    )
+    search_parameters.time_limit.FromMilliseconds(time_limit_ms)
+
+    started_at = time.monotonic()
+    trajectory: List[Tuple[float, int]] = []
+
+    # a parada por estagnação e o cancelamento são conferidos só a cada
+    # solução encontrada: um CustomLimit chamaria Python a cada nó da busca.
+    # O limite de tempo nativo continua valendo quando nenhuma solução nova
+    # aparece
+    def on_solution():
+        objective = routing.CostVar().Value()
+        now = time.monotonic()
+        if not trajectory or objective < trajectory[-1][1]:
+            trajectory.append((now - started_at, objective))
+        if (should_stop and should_stop()) or (
+            plateau_ms and (now - started_at - trajectory[-1][0]) * 1000 >= plateau_ms
+        ):
+            routing.solver().FinishCurrentSearch()
+
+    routing.AddAtSolutionCallback(on_solution)
+
+    initial_assignment = None
+    if initial_routes is not None:
+        routing.CloseModelWithParameters(search_parameters)
+        initial_assignment = routing.ReadAssignmentFromRoutes(
+            [[manager.NodeToIndex(node) for node in route] for route in initial_routes],
+            True,
+        )
+
+    if initial_assignment:
+        solution = routing.SolveFromAssignmentWithParameters(
+            initial_assignment, search_parameters
+        )
+    else:
+        solution = routing.SolveWithParameters(search_parameters)
+    if not solution:
+        return None
+
+    routes = []
+    for vehicle_idx in range(num_vehicles):
+        index = routing.Start(vehicle_idx)
+        route = []
+
+        while not routing.IsEnd(index):
+            node_index = manager.IndexToNode(index)
+            if node_index > 0:
+                route.append(node_index)
+            index = solution.Value(routing.NextVar(index))
+
+        routes.append(route)
+
+    return ClusterSolution(routes=routes, objective_trajectory=trajectory)
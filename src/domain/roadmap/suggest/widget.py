@@ -1,10 +1,14 @@
-from PySide6.QtCore import QDate, QEvent, Qt
+from typing import List
+
+from PySide6.QtCore import QDate, QEvent, Qt, Signal
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
     QDateEdit,
     QFormLayout,
     QHBoxLayout,
     QLayout,
+    QPushButton,
     QVBoxLayout,
     QWidget,
     QLabel,
@@ -21,6 +25,8 @@ from domain.roadmap.suggest.drivers_vehicles_relation.vehicles_group_widget impo
 
 
 class LoadingOverlay(QWidget):
+    cancel_requested = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("loadingOverlay")
@@ -28,11 +34,13 @@ class LoadingOverlay(QWidget):
         if parent:
             self.setGeometry(parent.rect())
 
-        self.setStyleSheet(
-            """
+        self.setStyleSheet("""
             #loadingOverlay {
                 background-color: rgba(0, 0, 0, 180);
             }
+            QPushButton {
+                padding: 6px 20px;
+            }
             QLabel {
                 color: white;
                 font-size: 16px;
@@ -42,8 +50,7 @@ class LoadingOverlay(QWidget):
                 border-radius: 10px;
                 border: 2px solid #ffffff;
             }
-        """
-        )
+        """)
 
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -54,12 +61,19 @@ class LoadingOverlay(QWidget):
         self.status_label.setWordWrap(True)
 
         layout.addWidget(self.status_label)
+
+        self.cancel_button = QPushButton("Cancelar")
+        self.cancel_button.clicked.connect(self._on_cancel_button_clicked)
+        layout.addWidget(self.cancel_button, alignment=Qt.AlignmentFlag.AlignCenter)
+
         self.setLayout(layout)
 
         self.hide()
 
-    def show_with_message(self, message: str):
+    def show_with_message(self, message: str, cancellable: bool = False):
         self.status_label.setText(message)
+        self.cancel_button.setEnabled(True)
+        self.cancel_button.setVisible(cancellable)
         if self.parent():
             self.setGeometry(0, 0, self.parent().width(), self.parent().height())
         self.show()
@@ -70,6 +84,11 @@ class LoadingOverlay(QWidget):
         self.status_label.setText(message)
         QApplication.processEvents()
 
+    def _on_cancel_button_clicked(self):
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelando...")
+        self.cancel_requested.emit()
+
     def hide_overlay(self):
         self.hide()
 
@@ -85,6 +104,11 @@ class LoadingOverlay(QWidget):
 
 
 class SuggestRoadmapsWidget(BaseCRUDWidget[Roadmap]):
+    optimization_finished = Signal(list)
+    optimization_failed = Signal(str)
+    optimization_cancelled = Signal()
+    cancel_requested = Signal()
+
     def __init__(self, parent=None):
         super().__init__(
             model_class=Roadmap,
@@ -98,19 +122,34 @@ class SuggestRoadmapsWidget(BaseCRUDWidget[Roadmap]):
         qApp.installEventFilter(self)
 
         self.loading_overlay = None
+        self._disabled_while_loading: List[QWidget] = []
 
     def showEvent(self, event):
         super().showEvent(event)
         if self.loading_overlay is None:
-            self.loading_overlay = LoadingOverlay(self)
+            self.loading_overlay = self._create_loading_overlay()
             self.loading_overlay.resize(self.size())
 
-    def show_loading(self, message: str = "Processando..."):
+    def _create_loading_overlay(self) -> LoadingOverlay:
+        loading_overlay = LoadingOverlay(self)
+        loading_overlay.cancel_requested.connect(self.cancel_requested)
+        return loading_overlay
+
+    def show_loading(self, message: str = "Processando...", cancellable: bool = False):
         if self.loading_overlay is None:
-            self.loading_overlay = LoadingOverlay(self)
+            self.loading_overlay = self._create_loading_overlay()
 
-        self.setEnabled(False)
-        self.loading_overlay.show_with_message(message)
+        # o overlay é filho desta janela, então apenas os demais filhos são desabilitados
+        self._disabled_while_loading = [
+            child
+            for child in self.findChildren(
+                QWidget, options=Qt.FindChildOption.FindDirectChildrenOnly
+            )
+            if child is not self.loading_overlay and child.isEnabled()
+        ]
+        for child in self._disabled_while_loading:
+            child.setEnabled(False)
+        self.loading_overlay.show_with_message(message, cancellable)
 
     def update_loading_message(self, message: str):
         if self.loading_overlay:
@@ -119,7 +158,19 @@ class SuggestRoadmapsWidget(BaseCRUDWidget[Roadmap]):
     def hide_loading(self):
         if self.loading_overlay:
             self.loading_overlay.hide_overlay()
-        self.setEnabled(True)
+        for child in self._disabled_while_loading:
+            child.setEnabled(True)
+        self._disabled_while_loading = []
+
+    def is_loading(self) -> bool:
+        return self.loading_overlay is not None and self.loading_overlay.isVisible()
+
+    def closeEvent(self, event):
+        if self.is_loading():
+            self.cancel_requested.emit()
+            event.ignore()
+            return
+        super().closeEvent(event)
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
@@ -154,9 +205,24 @@ class SuggestRoadmapsWidget(BaseCRUDWidget[Roadmap]):
             )
         )
         self.date_field.setFixedWidth(100)
+        self.date_field.dateChanged.connect(self._on_date_changed)
         date_layout.addRow("Sugerir roteiros para o dia:", self.date_field)
+        self.end_date_field = QDateEdit()
+        self.end_date_field.setCalendarPopup(True)
+        self.end_date_field.setDisplayFormat("dd/MM/yyyy")
+        self.end_date_field.setDate(self.date_field.date())
+        self.end_date_field.setFixedWidth(100)
+        date_layout.addRow("Até o dia:", self.end_date_field)
+        self.incremental_field = QCheckBox(
+            "Encaixar apenas as alterações nos roteiros existentes"
+        )
+        date_layout.addRow("", self.incremental_field)
         return date_layout
 
+    def _on_date_changed(self, date: QDate) -> None:
+        if self.end_date_field.date() < date:
+            self.end_date_field.setDate(date)
+
     def __create_drivers_vehicles_relation_layout(self) -> QHBoxLayout:
         layout = QHBoxLayout()
         self.drivers_relation_group_widget = DriversRelationGroupWidget()
@@ -0,0 +1,50 @@
+from PySide6.QtCore import QObject, QThread, Signal
+
+from domain.roadmap.suggest.batch_optimizer import RoadmapBatchOptimizer
+from domain.roadmap.suggest.optimizer import (
+    OptimizationCancelledError,
+    RoadmapOptimizer,
+)
+
+
+class RoadmapOptimizerWorker(QObject):
+    finished = Signal(list)
+    failed = Signal(str)
+    cancelled = Signal()
+
+    def __init__(self, optimizer: RoadmapOptimizer | RoadmapBatchOptimizer) -> None:
+        super().__init__()
+        self.__optimizer = optimizer
+        self.__thread = QThread()
+        self.__thread.setObjectName("roadmap-optimizer")
+
+        self.__optimizer.moveToThread(self.__thread)
+        self.moveToThread(self.__thread)
+        self.__thread.started.connect(self.__run)
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def cancel(self) -> None:
+        self.__optimizer.cancel()
+
+    def is_running(self) -> bool:
+        return self.__thread.isRunning()
+
+    def wait(self) -> None:
+        self.__thread.wait()
+
+    def __run(self) -> None:
+        try:
+            roadmaps = self.__optimizer.generate_roadmaps()
+        except OptimizationCancelledError:
+            self.cancelled.emit()
+        except Exception as e:
+            if self.__optimizer.is_cancelled():
+                self.cancelled.emit()
+            else:
+                self.failed.emit(str(e))
+        else:
+            self.finished.emit(roadmaps)
+        finally:
+            self.__thread.quit()
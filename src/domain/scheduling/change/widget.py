@@ -82,7 +82,9 @@ class SchedulingChangeWidget(BaseChangeWidget):
         time_layout.addWidget(self.average_duration_field)
         self.form_layout.addRow(QLabel("Data e Hora:"), time_layout)
 
-        self.location_field = SearchLineEdit(model_class=Location)
+        self.location_field = SearchLineEdit(
+            model_class=Location, use_search_index=True
+        )
         self.add_location_button = QPushButton("Adicionar Localização")
         self.add_location_button.setFixedWidth(150)
         location_layout = QHBoxLayout()
@@ -90,10 +92,12 @@ class SchedulingChangeWidget(BaseChangeWidget):
         location_layout.addWidget(self.add_location_button)
         self.form_layout.addRow(QLabel("Localização:"), location_layout)
 
-        self.purpose_field = ComboBox(model_class=Purpose, default_none=False)
+        self.purpose_field = ComboBox(
+            model_class=Purpose, default_none=False, projection=True
+        )
         self.form_layout.addRow(QLabel("Finalidade:"), self.purpose_field)
 
-        self.patient_field = SearchLineEdit(model_class=Patient)
+        self.patient_field = SearchLineEdit(model_class=Patient, use_search_index=True)
         self.patient_field.model_changed.connect(self._on_patient_changed)
         self.add_patient_button = QPushButton("Adicionar Paciente")
         self.add_patient_button.setFixedWidth(150)
@@ -3,11 +3,15 @@ from typing import Any, List, Tuple, Type
 
 from dateutil.relativedelta import relativedelta
 from PySide6.QtCore import QItemSelection
-from sqlalchemy import Select
 
 from common.controller.base_controller import BaseController
 from common.controller.base_entity_controller import ModelType
-from common.controller.base_list_controller import BaseListController
+from common.controller.base_list_controller import (
+    BaseListController,
+    CountModeEnum,
+    PaginationModeEnum,
+    SortKey,
+)
 from domain.scheduling.add.controller import SchedulingAddController
 from domain.scheduling.change.controller import SchedulingChangeController
 from domain.scheduling.list.widget import (
@@ -23,7 +27,12 @@ class SchedulingListController(BaseListController[Scheduling]):
     _widget: SchedulingListWidget
 
     def __init__(self, caller: BaseController | None = None):
-        super().__init__(rows_per_page=25, caller=caller)
+        super().__init__(
+            rows_per_page=100,
+            caller=caller,
+            pagination_mode=PaginationModeEnum.INFINITE_SCROLL,
+            count_mode=CountModeEnum.LAZY,
+        )
 
     def _get_widget_instance(self) -> SchedulingListWidget:
         return SchedulingListWidget()
@@ -31,8 +40,8 @@ class SchedulingListController(BaseListController[Scheduling]):
     def _get_model_class(self) -> Type[ModelType]:
         return Scheduling
 
-    def _apply_sorting(self, query: Select) -> Select:
-        return query.order_by(Scheduling.datetime.asc())
+    def _get_sort_keys(self) -> List[SortKey]:
+        return [(Scheduling.datetime, False), (Scheduling.id, False)]
 
     def _build_list_filters(self) -> List[Any]:
         filters = []
@@ -43,7 +52,8 @@ class SchedulingListController(BaseListController[Scheduling]):
         start_date, end_date = self._build_start_end_date_filters(
             type_filter, year, month, day
         )
-        filters.append(Scheduling.datetime.between(start_date, end_date))
+        filters.append(Scheduling.datetime >= start_date)
+        filters.append(Scheduling.datetime < end_date)
         print(start_date.strftime("%Y-%m-%d %H:%M:%S"))
         print(end_date.strftime("%Y-%m-%d %H:%M:%S"))
         roadman_exists_filter = self._widget.roadmap_exists_filter.get_current_data()
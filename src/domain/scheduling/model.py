@@ -4,8 +4,20 @@ from datetime import datetime, time  # noqa: F401
 from typing import TYPE_CHECKING, Any, List, Optional
 
 from dateutil.relativedelta import relativedelta
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Time, or_
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Select,
+    String,
+    Time,
+    or_,
+    text,
+)
+from sqlalchemy.orm import Mapped, joinedload, relationship, selectinload
 
 from common.model.base_model import BaseModel
 from domain.location.model import Location
@@ -18,6 +30,17 @@ if TYPE_CHECKING:
 
 
 class Scheduling(BaseModel):
+    __table_args__ = (
+        Index("ix_scheduling_datetime_roadmap_id", "datetime", "roadmap_id"),
+        # só os agendamentos sem roteiro entram na sugestão de roteiros
+        Index(
+            "ix_scheduling_datetime_unassigned",
+            "datetime",
+            postgresql_where=text("roadmap_id IS NULL"),
+        ),
+        Index("ix_scheduling_roadmap_id", "roadmap_id"),
+    )
+
     datetime = Column(  # noqa: F811
         DateTime, nullable=False, info={"title": "Data e Hora"}
     )
@@ -88,13 +111,13 @@ class Scheduling(BaseModel):
         return self.roadmap is not None
 
     @classmethod
-    def list_for_combo_box(
+    def query_for_combo_box(
         cls,
         roadmap_id: int = None,
         date: datetime = None,
         ids_ignore: List[int] = None,
         **kwargs: Any,
-    ) -> List[Scheduling]:
+    ) -> Select:
         if roadmap_id:
             query = cls.query().filter(
                 or_(cls.roadmap_id.is_(None), cls.roadmap_id == roadmap_id)
@@ -114,13 +137,13 @@ class Scheduling(BaseModel):
             end_datetime = start_datetime + relativedelta(days=1)
             query = (
                 query.filter(cls.datetime >= start_datetime)
-                .filter(cls.datetime <= end_datetime)
+                .filter(cls.datetime < end_datetime)
                 .order_by(cls.id)
             )
             if ids_ignore:
                 query = query.filter(cls.id.notin_(ids_ignore))
 
-        return [record for record in query.order_by(cls.datetime)]
+        return query.order_by(cls.datetime)
 
     def format_for_table(self) -> List[Any]:
         result = super().format_for_table()
@@ -130,6 +153,13 @@ class Scheduling(BaseModel):
 
         return result
 
+    @classmethod
+    def get_list_load_options(cls) -> List[Any]:
+        return super().get_list_load_options() + [
+            selectinload(cls.companions),
+            joinedload(cls.roadmap),
+        ]
+
     @classmethod
     def _get_model_listable_columns(cls) -> List[Column]:
         return super()._get_model_listable_columns() + [
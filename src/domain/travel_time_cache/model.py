@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Column, Float, Integer, UniqueConstraint, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from common.model.base_model import BaseModel
+from common.model.column_types.point import Coordinate
+from db import Database
+
+CoordinatePair = Tuple[Coordinate, Coordinate]
+
+
+class TravelTimeCache(BaseModel):
+    __tablename__ = "travel_time_cache"
+    __table_args__ = (
+        UniqueConstraint(
+            "origin_latitude",
+            "origin_longitude",
+            "destination_latitude",
+            "destination_longitude",
+            "time_bucket",
+        ),
+    )
+
+    COORDINATE_PRECISION = 5
+    ALL_DAY_TIME_BUCKET = -1
+
+    origin_latitude = Column(Float, nullable=False)
+    origin_longitude = Column(Float, nullable=False)
+    destination_latitude = Column(Float, nullable=False)
+    destination_longitude = Column(Float, nullable=False)
+    time_bucket = Column(Integer, nullable=False, default=ALL_DAY_TIME_BUCKET)
+    travel_time = Column(Integer, nullable=False)
+
+    def __init__(
+        self,
+        origin: Coordinate = None,
+        destination: Coordinate = None,
+        time_bucket: int = ALL_DAY_TIME_BUCKET,
+        travel_time: int = None,
+    ):
+        super().__init__()
+        if origin:
+            origin = self.round_coordinate(origin)
+            self.origin_latitude = origin.latitude
+            self.origin_longitude = origin.longitude
+        if destination:
+            destination = self.round_coordinate(destination)
+            self.destination_latitude = destination.latitude
+            self.destination_longitude = destination.longitude
+        self.time_bucket = time_bucket
+        self.travel_time = travel_time
+
+    def get_description(self) -> str:
+        return (
+            f"({self.origin_latitude}, {self.origin_longitude}) -> "
+            f"({self.destination_latitude}, {self.destination_longitude})"
+        )
+
+    @classmethod
+    def get_static_description(cls) -> str:
+        return "Cache de Tempo de Viagem"
+
+    @classmethod
+    def round_coordinate(cls, coordinate: Coordinate) -> Coordinate:
+        return Coordinate(
+            latitude=round(coordinate.latitude, cls.COORDINATE_PRECISION),
+            longitude=round(coordinate.longitude, cls.COORDINATE_PRECISION),
+        )
+
+    @classmethod
+    def get_travel_times(
+        cls,
+        coordinates: Iterable[Coordinate],
+        time_bucket: int = ALL_DAY_TIME_BUCKET,
+        max_age: Optional[timedelta] = None,
+    ) -> Dict[CoordinatePair, int]:
+        rounded_coordinates = list(
+            {
+                (coordinate.latitude, coordinate.longitude)
+                for coordinate in map(cls.round_coordinate, coordinates)
+            }
+        )
+        if not rounded_coordinates:
+            return {}
+
+        with Database.session_scope(end_with_commit=False) as session:
+            query = (
+                session.query(cls)
+                .filter(
+                    tuple_(cls.origin_latitude, cls.origin_longitude).in_(
+                        rounded_coordinates
+                    )
+                )
+                .filter(
+                    tuple_(cls.destination_latitude, cls.destination_longitude).in_(
+                        rounded_coordinates
+                    )
+                )
+                .filter(cls.time_bucket == time_bucket)
+            )
+            if max_age:
+                query = query.filter(cls.updated_at >= datetime.now() - max_age)
+
+            return {
+                (
+                    Coordinate(item.origin_latitude, item.origin_longitude),
+                    Coordinate(item.destination_latitude, item.destination_longitude),
+                ): item.travel_time
+                for item in query.all()
+            }
+
+    @classmethod
+    def put_travel_times(
+        cls,
+        travel_times: Dict[CoordinatePair, int],
+        time_bucket: int = ALL_DAY_TIME_BUCKET,
+    ) -> None:
+        if not travel_times:
+            return
+
+        now = datetime.now()
+        rows: List[Dict] = []
+        for (origin, destination), travel_time in travel_times.items():
+            origin = cls.round_coordinate(origin)
+            destination = cls.round_coordinate(destination)
+            rows.append(
+                {
+                    "origin_latitude": origin.latitude,
+                    "origin_longitude": origin.longitude,
+                    "destination_latitude": destination.latitude,
+                    "destination_longitude": destination.longitude,
+                    "time_bucket": time_bucket,
+                    "travel_time": int(travel_time),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+
+        statement = insert(cls).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                cls.origin_latitude,
+                cls.origin_longitude,
+                cls.destination_latitude,
+                cls.destination_longitude,
+                cls.time_bucket,
+            ],
+            set_={
+                "travel_time": statement.excluded.travel_time,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+
+        with Database.session_scope() as session:
+            session.execute(statement)
+
+    @classmethod
+    def delete_stale(cls, max_age: timedelta) -> None:
+        with Database.session_scope() as session:
+            session.execute(
+                delete(cls).where(cls.updated_at < datetime.now() - max_age)
+            )
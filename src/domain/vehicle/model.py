@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from sqlalchemy import Boolean, Column, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, relationship
@@ -56,6 +56,12 @@ class Vehicle(BaseModel):
 
         return result
 
+    @classmethod
+    def get_combo_box_relationships(cls) -> Dict[str, List[Column]]:
+        from domain.driver.model import Driver
+
+        return {"default_driver": [Driver.name]}
+
     def get_combo_box_description(self) -> str:
         return f"{self.get_description()}{f' ({self.default_driver.name})' if self.default_driver else ''}"
 
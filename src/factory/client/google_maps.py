@@ -2,10 +2,19 @@ from googlemaps import Client
 
 from client.google_maps import GoogleMapsClient
 from domain.config.model import Config
+from settings import Settings
 
 
 class GoogleMapsClientFactory:
     @staticmethod
     def create() -> GoogleMapsClient:
         config = Config.get_config()
-        return GoogleMapsClient(client=Client(config.distance_matrix_api_key))
+        return GoogleMapsClient(
+            client=Client(
+                config.distance_matrix_api_key,
+                queries_per_second=max(int(Settings.GOOGLE_MAPS_QUERIES_PER_SECOND), 1),
+                retry_over_query_limit=False,
+            ),
+            max_workers=Settings.GOOGLE_MAPS_MAX_WORKERS,
+            queries_per_second=Settings.GOOGLE_MAPS_QUERIES_PER_SECOND,
+        )
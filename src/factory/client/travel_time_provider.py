@@ -0,0 +1,31 @@
+from client.file_matrix import FileTravelTimeProvider
+from client.haversine import HaversineTravelTimeEstimator
+from client.osrm import OsrmClient
+from client.travel_time_provider import TravelTimeProvider
+from domain.config.model import Config, TravelTimeProviderEnum
+from factory.client.google_maps import GoogleMapsClientFactory
+
+
+class TravelTimeProviderFactory:
+    @staticmethod
+    def create() -> TravelTimeProvider:
+        config = Config.get_config()
+        provider = (
+            config.travel_time_provider or TravelTimeProviderEnum.GOOGLE_MAPS.name
+        )
+
+        if provider == TravelTimeProviderEnum.OSRM.name:
+            if not config.osrm_url:
+                raise ValueError("O endereço do servidor OSRM não foi configurado")
+            return OsrmClient(config.osrm_url)
+        if provider == TravelTimeProviderEnum.HAVERSINE.name:
+            return HaversineTravelTimeEstimator(
+                road_factor=config.travel_time_road_factor or 1.3,
+                average_speed_kmh=config.travel_time_average_speed or 40,
+            )
+        if provider == TravelTimeProviderEnum.FILE.name:
+            if not config.travel_time_matrix_file_path:
+                raise ValueError("O arquivo da matriz de tempos não foi configurado")
+            return FileTravelTimeProvider(config.travel_time_matrix_file_path)
+
+        return GoogleMapsClientFactory.create()
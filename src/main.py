@@ -4,34 +4,50 @@ from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication
 
 from common.gui.widget.base_widget import BaseWidget
+from common.model.change_notifier import ChangeNotifier
+from common.model.reference_cache import ReferenceCache
 from db import Database
 from domain.menu.controller import MenuController
 from domain.user.login.controller import LoginController
 from settings import Settings
 
-app = QApplication(sys.argv)
-app.setWindowIcon(QIcon(Settings.FAV_ICON_FILE_NAME))
-
-Database.initialize(
-    db_user=Settings.DB_USER,
-    db_password=Settings.DB_PASSWORD,
-    db_host=Settings.DB_HOST,
-    db_port=Settings.DB_PORT,
-    db_name=Settings.DB_NAME,
-)
-
-connection_success, _ = Database.check_connection()
-if not connection_success:
-    BaseWidget.show_error_pop_up(
-        "Erro de Conexão",
-        "Não foi possível conectar ao banco de dados.",
-        "Por favor, entre em contato com o administrador do sistema.",
+# os processos do otimizador são iniciados com "spawn" e reimportam este módulo
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    app.setWindowIcon(QIcon(Settings.FAV_ICON_FILE_NAME))
+
+    Database.initialize(
+        db_user=Settings.DB_USER,
+        db_password=Settings.DB_PASSWORD,
+        db_host=Settings.DB_HOST,
+        db_port=Settings.DB_PORT,
+        db_name=Settings.DB_NAME,
+        echo=Settings.DB_ECHO,
+        pool_size=Settings.DB_POOL_SIZE,
+        max_overflow=Settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=Settings.DB_POOL_PRE_PING,
+        pool_recycle=Settings.DB_POOL_RECYCLE,
+        executemany_mode=Settings.DB_EXECUTEMANY_MODE,
+        statement_timeout_ms=Settings.DB_STATEMENT_TIMEOUT_MS,
+        slow_query_threshold_ms=Settings.DB_SLOW_QUERY_THRESHOLD_MS,
     )
-    sys.exit(1)
 
-menu_controller = MenuController()
-login_controller = LoginController(menu_controller)
+    connection_success, _ = Database.check_connection()
+    if not connection_success:
+        BaseWidget.show_error_pop_up(
+            "Erro de Conexão",
+            "Não foi possível conectar ao banco de dados.",
+            "Por favor, entre em contato com o administrador do sistema.",
+        )
+        sys.exit(1)
 
-login_controller.show()
+    ReferenceCache.configure(ttl_seconds=Settings.REFERENCE_CACHE_TTL_SECONDS)
+    if Settings.DB_CHANGE_NOTIFICATIONS:
+        ChangeNotifier.start()
 
-sys.exit(app.exec())
+    menu_controller = MenuController()
+    login_controller = LoginController(menu_controller)
+
+    login_controller.show()
+
+    sys.exit(app.exec())
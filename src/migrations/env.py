@@ -18,6 +18,7 @@ from domain.patient.model import Patient
 from domain.purpose.model import Purpose
 from domain.roadmap.model import Roadmap
 from domain.scheduling.model import Scheduling
+from domain.travel_time_cache.model import TravelTimeCache
 from domain.user.model import User
 from domain.vehicle.model import Vehicle
 from settings import Settings
@@ -0,0 +1,60 @@
+"""
+Revision: 6f0a2d8e41b7 - trigram text search (2026-10-18 18:41:09.517362)
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "6f0a2d8e41b7"
+down_revision: Union[str, None] = "3b7e91c4d2a8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tabela -> coluna de onde sai o texto normalizado da busca
+SEARCH_TEXT_SOURCES = {
+    "patient": "name",
+    "location": "description",
+    "driver": "name",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+
+    for table, source_column in SEARCH_TEXT_SOURCES.items():
+        op.add_column(
+            table,
+            sa.Column("search_text", sa.String(), server_default="", nullable=False),
+        )
+        # mesma normalização de StringUtils.normalize_for_search
+        op.execute(
+            f"UPDATE {table} SET search_text = "
+            f"trim(regexp_replace(lower(unaccent({source_column})), '\\s+', ' ', 'g'))"
+        )
+        op.create_index(
+            f"ix_{table}_search_text_trgm",
+            table,
+            ["search_text"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+
+    op.create_index(
+        "ix_patient_cpf_trgm",
+        "patient",
+        ["cpf"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"cpf": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_patient_cpf_trgm", table_name="patient")
+    for table in reversed(list(SEARCH_TEXT_SOURCES)):
+        op.drop_index(f"ix_{table}_search_text_trgm", table_name=table)
+        op.drop_column(table, "search_text")
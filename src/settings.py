@@ -14,7 +14,30 @@ class Settings:
     DB_HOST = os.getenv("DB_HOST")
     DB_PORT = os.getenv("DB_PORT")
     DB_NAME = os.getenv("DB_NAME")
+    # "true" registra os comandos SQL, "debug" também os resultados
+    DB_ECHO = {"true": True, "1": True, "debug": "debug"}.get(
+        os.getenv("DB_ECHO", "false").lower(), False
+    )
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true")
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_EXECUTEMANY_MODE = os.getenv("DB_EXECUTEMANY_MODE", "values_plus_batch")
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    DB_SLOW_QUERY_THRESHOLD_MS = int(os.getenv("DB_SLOW_QUERY_THRESHOLD_MS", "500"))
+    DB_CHANGE_NOTIFICATIONS = os.getenv("DB_CHANGE_NOTIFICATIONS", "false").lower() in (
+        "1",
+        "true",
+    )
+    REFERENCE_CACHE_TTL_SECONDS = float(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
     FAV_ICON_FILE_NAME = "src/fav.ico"
+    GOOGLE_MAPS_MAX_WORKERS = int(os.getenv("GOOGLE_MAPS_MAX_WORKERS", "4"))
+    GOOGLE_MAPS_QUERIES_PER_SECOND = float(
+        os.getenv("GOOGLE_MAPS_QUERIES_PER_SECOND", "10")
+    )
+    OPTIMIZER_PARALLEL_CLUSTERS = os.getenv(
+        "OPTIMIZER_PARALLEL_CLUSTERS", "false"
+    ).lower() in ("1", "true")
 
     __logged_user: Optional[User] = None
 